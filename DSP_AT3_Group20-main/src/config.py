@@ -1,6 +1,8 @@
 import os
 import streamlit as st
 
+from src.database.logics import get_pools_stats, query_cache
+
 def set_app_config():
     """
     --------------------
@@ -56,6 +58,7 @@ def set_session_state(key, value):
     --------------------
     -> Only if the key does not exist in the session state, do we set default value for it. 
     -> If the key is "db_user", "db_pass", "db_host", "db_name", or "db_port", its default value is taken from docker-compose.yml's env configuration.
+    -> If the key is "db_loader", its default value is taken from the POSTGRES_LOADER env variable ("stream" if not set).
     -> Otherwise, the default value of the key is None. 
 
     --------------------
@@ -75,6 +78,8 @@ def set_session_state(key, value):
             st.session_state[key] = os.environ['POSTGRES_DB']
         elif key == 'db_port':
             st.session_state[key] = os.environ['POSTGRES_PORT']
+        elif key == 'db_loader':
+            st.session_state[key] = os.environ.get('POSTGRES_LOADER', 'stream')
         else:
             st.session_state[key] = value
 
@@ -120,6 +125,7 @@ def display_session_state():
     Pseudo-Code
     --------------------
     -> Display the session state object.
+    -> Display the statistics of the connection pools and of the query cache shared by all sessions.
 
     --------------------
     Returns
@@ -128,6 +134,8 @@ def display_session_state():
 
     """
     st.write(st.session_state)
+    st.write('Connection Pools:', get_pools_stats())
+    st.write('Query Cache:', query_cache.get_stats())
     
 
 
@@ -1,7 +1,9 @@
 import streamlit as st
 
-from src.database.logics import PostgresConnector
+from src.database.logics import PostgresConnector, LOADERS, QUERY_CACHE_ENABLED
 from src.dataframe.display import read_data
+from src.dataframe.logics import SAMPLING_METHODS
+from src.profiling.logics import DISTINCT_EXACT
 
 def display_db_connection_menu():
     """
@@ -20,6 +22,7 @@ def display_db_connection_menu():
     --------------------
     -> Display a header for the database connection menu "Database Connection Details".
     -> Display text inputs for users to insert required database connection information (host, database, port, username and password). \n
+    -> Display a selectbox for users to choose how tables are loaded (streamed through a server-side cursor, exported with COPY or fetched with a plain query). \n
     -> Everytime the "Connect" button is clicked, the following events happen: 
     - Connect to database.
     - Refresh the page in order to re-render session_state container with updated values. 
@@ -57,6 +60,12 @@ def display_db_connection_menu():
         'Database Port:',
         key='db_port',
     )
+
+    st.selectbox(
+        'Loading Method:',
+        LOADERS,
+        key='db_loader',
+    )
     if st.button("Connect"):
         connect_db()
         st.experimental_rerun()
@@ -82,8 +91,8 @@ def connect_db():
     --------------------
     Pseudo-Code
     --------------------
-    -> Instantiate an instance of PostgresConnector class.
-    -> Open the database connection.
+    -> Instantiate an instance of PostgresConnector class, going through the shared query cache unless it is disabled with the POSTGRES_QUERY_CACHE environment variable.
+    -> Attach it to the connection pool shared by all sessions, which is only opened if no other session uses the same database.
     -> Set a value for msg of session_state.
     -> Set a value for db_status of session_state.
     -> Set a value for db of session_state.
@@ -99,7 +108,9 @@ def connect_db():
         st.session_state.db_user, 
         st.session_state.db_pass,
         st.session_state.db_host,  
-        st.session_state.db_port
+        st.session_state.db_port,
+        st.session_state.db_loader,
+        QUERY_CACHE_ENABLED
     )
     result = postgresConnector.open_connection()
     st.session_state.msg = result['msg']
@@ -122,9 +133,12 @@ def display_table_selection():
     --------------------
     Pseudo-Code
     --------------------
-    -> Get all schemas and their tables.
-    -> Create a list of options which include all schema and their tables. 
-    -> Display a selectbox. Whenever a table is selected, it trigger read_data() to get the table content. 
+    -> Get the searchable index of all schemas and their tables, kept by the connection across reruns (get_table_catalog()).
+    -> Display a text input for searching tables by prefix or fuzzy name, and the search filters (display_table_filters()).
+    -> Search the index. The currently selected table is kept among the options, so that the selection does not change while searching.
+    -> Display a checkbox for profiling the table from the catalog statistics only, without loading it.
+    -> Display the sampling options (display_sampling_options()).
+    -> Display a selectbox with the matching tables. Whenever a table is selected, it trigger read_data() to get the table content. 
 
     --------------------
     Returns
@@ -132,10 +146,144 @@ def display_table_selection():
     -> (None)
 
     """
-    all_schemas_tables = st.session_state.db.list_tables()
-    options = all_schemas_tables.apply(lambda row: str(row["table_schema"]) + "." + str(row["table_name"]), axis = 1)
+    catalog = st.session_state.db.get_table_catalog()
+    st.text_input('Search tables', key='table_search', placeholder='schema.table, prefix or fuzzy match')
+    display_table_filters(catalog)
+    results = catalog.search(
+        st.session_state.table_search,
+        st.session_state.table_schemas,
+        st.session_state.table_min_rows,
+        st.session_state.table_max_rows
+    )
+    options = results['name'].tolist()
+    if st.session_state.schema_table_selected is not None and st.session_state.schema_table_selected not in options:
+        options.insert(0, st.session_state.schema_table_selected)
+    st.caption(f'{results.shape[0]} of {catalog.tables.shape[0]} tables shown')
+    st.checkbox('Instant profile (catalog statistics only)', key='instant_profile', on_change=reload_data)
+    display_sampling_options()
     st.selectbox('Select a table name', options, key='schema_table_selected', on_change=select_schema_table)
 
+def display_table_filters(catalog):
+    """
+    --------------------
+    Description
+    --------------------
+    -> display_table_filters (function): Function that displays the filters of the table search
+
+    --------------------
+    Parameters
+    --------------------
+    -> catalog (TableCatalog): The index of the tables.
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Display an expander "Table filters" containing:
+    - A multiselect for keeping only the tables of some schemas.
+    - Number inputs for the minimum and maximum estimated number of rows (0 for no limit).
+    - A button for reading the list of tables again from the database (refresh_table_catalog()).
+
+    --------------------
+    Returns
+    --------------------
+    -> (None)
+
+    """
+    with st.expander("Table filters", expanded=False):
+        st.multiselect('Schemas', catalog.schemas, key='table_schemas')
+        st.number_input('Minimum estimated number of rows', min_value=0, value=0, step=1000, key='table_min_rows')
+        st.number_input('Maximum estimated number of rows (0 for no limit)', min_value=0, value=0, step=1000, key='table_max_rows')
+        st.button('Refresh table list', key='refresh_tables', on_click=refresh_table_catalog)
+
+def refresh_table_catalog():
+    """
+    --------------------
+    Description
+    --------------------
+    -> refresh_table_catalog (function): Function that reads the list of tables again from the database, e.g. after tables were created
+
+    --------------------
+    Parameters
+    --------------------
+    No parameter
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Rebuild the index of the tables of the connection (get_table_catalog()).
+    -> Forget the selected schemas that no longer exist, as they are not valid options anymore.
+
+    --------------------
+    Returns
+    --------------------
+    -> (None)
+
+    """
+    catalog = st.session_state.db.get_table_catalog(refresh=True)
+    st.session_state.table_schemas = [schema for schema in st.session_state.table_schemas if schema in catalog.schemas]
+
+def display_sampling_options():
+    """
+    --------------------
+    Description
+    --------------------
+    -> display_sampling_options (function): Function that displays the options for loading only a sample of the selected table
+
+    --------------------
+    Parameters
+    --------------------
+    No parameter
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Display an expander "Sampling" containing:
+    - A radio for choosing between the full table and the SYSTEM (random pages) or BERNOULLI (random rows) TABLESAMPLE methods.
+    - A number input for the percentage of the table to be sampled.
+    - A number input for the seed making the sample repeatable.
+    - A number input for the maximum number of rows to be loaded (0 for no cap).
+    - A checkbox for counting the distinct values exactly with count(distinct), instead of estimating them with a HyperLogLog sketch (DISTINCT_EXACT by default).
+    -> Whenever an option changes, reload the selected table (reload_data()).
+
+    --------------------
+    Returns
+    --------------------
+    -> (None)
+
+    """
+    with st.expander("Sampling", expanded=False):
+        st.radio('Rows to load', ('Full table',) + SAMPLING_METHODS, key='sample_method', horizontal=True, on_change=reload_data)
+        st.number_input('Percentage of the table to sample', min_value=0.01, max_value=100.0, value=10.0, key='sample_percent', on_change=reload_data)
+        st.number_input('Seed', min_value=0, value=42, step=1, key='sample_seed', on_change=reload_data)
+        st.number_input('Maximum number of rows (0 for no cap)', min_value=0, value=0, step=1000, key='sample_limit', on_change=reload_data)
+        st.checkbox('Count distinct values exactly', value=DISTINCT_EXACT, key='exact_distinct', on_change=reload_data)
+
+def reload_data():
+    """
+    --------------------
+    Description
+    --------------------
+    -> reload_data (function): Function that reloads the selected table, if any, after the profiling or sampling options changed
+
+    --------------------
+    Parameters
+    --------------------
+    No parameter
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> If a table is selected, load it again using read_data().
+
+    --------------------
+    Returns
+    --------------------
+    -> (None)
+
+    """
+    if st.session_state.table_selected is not None:
+        read_data()
+
 def select_schema_table():
     split_schema_table = st.session_state.schema_table_selected.split('.')
     st.session_state.schema_selected = split_schema_table[0]
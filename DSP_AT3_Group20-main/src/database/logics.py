@@ -1,14 +1,2439 @@
+import os
+import re
+import time
+import datetime
+import asyncio
+import uuid
+import tempfile
+import threading
+import weakref
+from bisect import bisect_left
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from contextlib import contextmanager
+
 import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
 import pandas as pd
 
-from src.database.queries import get_tables_list_query, get_table_data_query, get_table_schema_query
-from src.dataframe.queries import get_primary_key
-class PostgresConnector:
+from src.database.queries import get_table_data_query, get_copy_query, get_result_types_query, get_table_stats_query, get_column_stats_query, get_analyze_query, get_tables_fingerprint_query, get_catalog_metadata_query
+
+POOL_MIN_SIZE = int(os.environ.get('POSTGRES_POOL_MIN_SIZE', 1))
+POOL_MAX_SIZE = int(os.environ.get('POSTGRES_POOL_MAX_SIZE', 10))
+POOL_IDLE_TIMEOUT = float(os.environ.get('POSTGRES_POOL_IDLE_TIMEOUT', 300))
+POOL_CHECK_INTERVAL = float(os.environ.get('POSTGRES_POOL_CHECK_INTERVAL', 30))
+POOL_WAIT_TIMEOUT = float(os.environ.get('POSTGRES_POOL_WAIT_TIMEOUT', 30))
+LOAD_CHUNKSIZE = int(os.environ.get('POSTGRES_LOAD_CHUNKSIZE', 50000))
+COPY_SPOOL_SIZE = int(os.environ.get('POSTGRES_COPY_SPOOL_SIZE', 64 * 1024 * 1024))
+LOADERS = ('stream', 'copy', 'query')
+STATS_STALE_FRACTION = float(os.environ.get('POSTGRES_STATS_STALE_FRACTION', 0.1))
+QUERY_CACHE_ENABLED = os.environ.get('POSTGRES_QUERY_CACHE', '1') != '0'
+QUERY_CACHE_SIZE = int(os.environ.get('POSTGRES_QUERY_CACHE_SIZE', 512))
+QUERY_CACHE_MAX_BYTES = int(os.environ.get('POSTGRES_QUERY_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+QUERY_CACHE_TTL = float(os.environ.get('POSTGRES_QUERY_CACHE_TTL', 600))
+FINGERPRINT_TTL = float(os.environ.get('POSTGRES_FINGERPRINT_TTL', 2))
+ASYNC_MAX_CONNECTIONS = int(os.environ.get('POSTGRES_ASYNC_MAX_CONNECTIONS', 4))
+# Number of seconds an asynchronous connection waits before asking the connection pool for a free slot again
+ASYNC_SLOT_RETRY_INTERVAL = 0.05
+CATALOG_TTL = float(os.environ.get('POSTGRES_CATALOG_TTL', 300))
+CATALOG_SEARCH_LIMIT = int(os.environ.get('POSTGRES_CATALOG_SEARCH_LIMIT', 1000))
+
+# Tables read by a query, as schema.table after FROM or JOIN, each part being a plain or a double-quoted identifier (the queries of the application always qualify tables with their schema)
+QUERY_IDENTIFIER = r'(?:"(?:[^"]|"")+"|[A-Za-z_][\w$]*)'
+QUERY_TABLES_PATTERN = re.compile(rf'\b(?:from|join)\s+({QUERY_IDENTIFIER})\s*\.\s*({QUERY_IDENTIFIER})', re.IGNORECASE)
+
+# Type categories (pg_type.typcategory) of the columns profiled as numeric, text or datetime
+COLUMN_CATEGORIES = {
+    'numeric': ('N',),
+    'text': ('S',),
+    'date': ('D',),
+}
+
+# Types (as returned by format_type()) of the datetime category without a date part, which are not profiled as dates
+COLUMN_EXCLUDED_TYPES = ('time without time zone', 'time with time zone')
+
+# Postgres type OIDs parsed by the COPY loader, the other types are kept as strings
+INTEGER_OIDS = (20, 21, 23, 26)
+FLOAT_OIDS = (700, 701, 1700)
+BOOLEAN_OIDS = (16,)
+DATE_OIDS = (1082,)
+TIMESTAMP_OIDS = (1114,)
+TIMESTAMPTZ_OIDS = (1184,)
+
+# Special values of the date and timestamp types, converted to the same values as psycopg2 does for the other loaders
+COPY_INFINITE_DATES = {
+    'date': {'infinity': datetime.date.max, '-infinity': datetime.date.min},
+    'datetime': {'infinity': datetime.datetime.max, '-infinity': datetime.datetime.min},
+}
+
+class ConnectionPool:
+    """
+    --------------------
+    Description
+    --------------------
+    -> ConnectionPool (class): Class that manages a thread-safe pool of connections to a Postgres database shared by every Streamlit session
+
+    --------------------
+    Attributes
+    --------------------
+    -> database (str): Name of Postgres database (mandatory)
+    -> user (str): Username used for connecting to Postgres database (mandatory)
+    -> password (str): Password used for connecting to Postgres database (mandatory)
+    -> host (str): URL of Postgres database (mandatory)
+    -> port (str): Port number of Postgres database (mandatory)
+    -> minconn (int): Number of connections kept open even when they are idle (optional)
+    -> maxconn (int): Maximum number of connections opened at the same time (optional)
+    -> idle_timeout (float): Number of seconds after which an idle connection above minconn is closed (optional)
+    -> check_interval (float): Number of seconds a connection can stay idle before it is checked with 'SELECT 1' when borrowed (optional)
+    -> wait_timeout (float): Number of seconds to wait for a free connection when the pool is exhausted (optional)
+    -> idle (list): List of [connection, last_used] pairs available for borrowing, the oldest first
+    -> in_use (dict): Borrowed connections indexed by their id
+    -> lock (threading.Condition): Condition protecting the pool and used for waiting on a free connection
+    -> closed (bool): Whether the pool has been closed
+    -> retired (bool): Whether the pool has been replaced in connection_pools, in which case it is closed as soon as no session uses it
+    -> n_sessions (int): Number of sessions (PostgresConnector) using the pool
+    -> n_pending (int): Number of slots reserved by borrowers which are opening or health-checking a connection outside the lock
+    -> n_external (int): Number of slots taken by connections opened outside the pool (AsyncPostgresConnector), counted against maxconn
+    -> n_created (int): Number of connections opened by the pool
+    -> n_borrowed (int): Number of times a connection has been borrowed
+    -> n_reaped (int): Number of idle connections closed by idle reaping
+    -> n_discarded (int): Number of broken connections thrown away by health checks
+    -> n_timeouts (int): Number of times a borrower gave up waiting for a free connection
+    """
+    def __init__(self, database, user, password, host, port, minconn=POOL_MIN_SIZE, maxconn=POOL_MAX_SIZE, idle_timeout=POOL_IDLE_TIMEOUT, check_interval=POOL_CHECK_INTERVAL, wait_timeout=POOL_WAIT_TIMEOUT):
+        self.database = database
+        self.user = user
+        self.password = password
+        self.host = host
+        self.port = port
+        self.minconn = minconn
+        self.maxconn = max(maxconn, minconn, 1)
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        self.wait_timeout = wait_timeout
+        self.idle = []
+        self.in_use = {}
+        self.lock = threading.Condition()
+        self.closed = False
+        self.retired = False
+        self.n_sessions = 0
+        self.n_pending = 0
+        self.n_external = 0
+        self.n_created = 0
+        self.n_borrowed = 0
+        self.n_reaped = 0
+        self.n_discarded = 0
+        self.n_timeouts = 0
+        for _ in range(self.minconn):
+            self.idle.append([self.new_connection(), time.monotonic()])
+            self.n_created += 1
+
+    def new_connection(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> new_connection (method): Class method that opens a new connection to the Postgres database
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Create a connection to database using the pool's username, password, host, port and database.
+        -> Switch the connection to autocommit so that read-only queries do not leave it idle in transaction.
+
+        --------------------
+        Returns
+        --------------------
+        -> (psycopg2._psycopg.connection): The new Postgres connection object.
+
+        """
+        conn = psycopg2.connect(
+            user=self.user,
+            password=self.password,
+            host=self.host,
+            port=self.port,
+            database=self.database
+        )
+        conn.autocommit = True
+        return conn
+
+    def size(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> size (method): Class method that computes the number of connections currently opened by the pool
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Add the number of idle connections, borrowed connections, reserved slots and slots taken by external connections.
+
+        --------------------
+        Returns
+        --------------------
+        -> (int): Number of opened connections.
+
+        """
+        return len(self.idle) + len(self.in_use) + self.n_pending + self.n_external
+
+    def is_healthy(self, conn, idle_for):
+        """
+        --------------------
+        Description
+        --------------------
+        -> is_healthy (method): Class method that checks whether an idle connection can still be used
+
+        --------------------
+        Parameters
+        --------------------
+        -> conn (psycopg2._psycopg.connection): The connection to be checked.
+        -> idle_for (float): Number of seconds the connection has been idle.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> A closed connection is not healthy.
+        -> A connection used less than check_interval seconds ago is trusted without a round-trip.
+        -> Otherwise, execute 'SELECT 1' and consider the connection broken if it raises an error.
+
+        --------------------
+        Returns
+        --------------------
+        -> (bool): Whether the connection is healthy.
+
+        """
+        if conn.closed:
+            return False
+        if idle_for < self.check_interval:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1')
+            cursor.close()
+        except psycopg2.Error:
+            return False
+        return True
+
+    def discard(self, conn):
+        """
+        --------------------
+        Description
+        --------------------
+        -> discard (method): Class method that closes a connection which will not be reused
+
+        --------------------
+        Parameters
+        --------------------
+        -> conn (psycopg2._psycopg.connection): The connection to be thrown away.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Close the connection, ignoring errors raised by an already broken connection.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def reap_idle(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> reap_idle (method): Class method that closes the connections which have been idle for longer than idle_timeout (the lock must be held)
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> While the oldest idle connection has been idle for too long and the pool holds more than minconn connections:
+        - Close the oldest idle connection.
+        - Increment the number of reaped connections.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        now = time.monotonic()
+        while self.idle and self.size() > self.minconn and now - self.idle[0][1] > self.idle_timeout:
+            conn, _ = self.idle.pop(0)
+            self.discard(conn)
+            self.n_reaped += 1
+
+    def getconn(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> getconn (method): Class method that borrows a healthy connection from the pool
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Holding the lock:
+        - Reap the connections that have been idle for too long.
+        - If there is an idle connection, take the most recently used one.
+        - Otherwise, if the pool has not reached maxconn, reserve a slot for a new connection.
+        - Otherwise, wait until a connection is returned. If nothing is returned within wait_timeout seconds, raise a PoolError.
+        - Count the taken connection or the reserved slot as pending so that no other borrower can exceed maxconn.
+        -> Without the lock, check the health of the idle connection or open the new connection, so that slow network round-trips do not block the other borrowers.
+        -> Holding the lock again, release the pending slot and wake up a waiting borrower if the attempt failed:
+        - Broken idle connections are discarded and the borrower tries again.
+        - Errors raised while connecting are raised to the caller.
+        - Otherwise, register the connection as borrowed.
+
+        --------------------
+        Returns
+        --------------------
+        -> (psycopg2._psycopg.connection): The borrowed connection.
+
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            with self.lock:
+                while True:
+                    if self.closed:
+                        raise psycopg2.pool.PoolError('connection pool is closed')
+                    self.reap_idle()
+                    if self.idle:
+                        conn, last_used = self.idle.pop()
+                        break
+                    if self.size() < self.maxconn:
+                        conn, last_used = None, None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.n_timeouts += 1
+                        raise psycopg2.pool.PoolError('connection pool exhausted')
+                    self.lock.wait(remaining)
+                self.n_pending += 1
+
+            try:
+                if conn is None:
+                    conn = self.new_connection()
+                    created = True
+                else:
+                    created = False
+                    if not self.is_healthy(conn, time.monotonic() - last_used):
+                        self.discard(conn)
+                        conn = None
+            except BaseException:
+                with self.lock:
+                    self.n_pending -= 1
+                    self.lock.notify()
+                raise
+
+            with self.lock:
+                self.n_pending -= 1
+                if conn is None:
+                    self.n_discarded += 1
+                    self.lock.notify()
+                    continue
+                if created:
+                    self.n_created += 1
+                if self.closed:
+                    self.discard(conn)
+                    raise psycopg2.pool.PoolError('connection pool is closed')
+                self.in_use[id(conn)] = conn
+                self.n_borrowed += 1
+                return conn
+
+    def reserve_slot(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> reserve_slot (method): Class method that takes a slot of the pool for a connection opened outside of it, without waiting
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Holding the lock:
+        - Raise a PoolError if the pool is closed.
+        - Reap the connections that have been idle for too long.
+        - If the pool has reached maxconn but has an idle connection, close the oldest one to free its slot.
+        - If the pool has not reached maxconn, count the slot as taken by an external connection.
+        -> The caller must not block (e.g. an event loop), so it is left to retry when no slot is free.
+
+        --------------------
+        Returns
+        --------------------
+        -> (bool): Whether a slot was taken.
+
+        """
+        with self.lock:
+            if self.closed:
+                raise psycopg2.pool.PoolError('connection pool is closed')
+            self.reap_idle()
+            if self.size() >= self.maxconn and self.idle:
+                conn, _ = self.idle.pop(0)
+                self.discard(conn)
+            if self.size() >= self.maxconn:
+                return False
+            self.n_external += 1
+            return True
+
+    def release_slot(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> release_slot (method): Class method that gives back a slot taken with reserve_slot() once its connection is closed
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Holding the lock, stop counting the slot and wake up one borrower waiting for a connection.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        with self.lock:
+            self.n_external -= 1
+            self.lock.notify()
+
+    def putconn(self, conn, close=False):
+        """
+        --------------------
+        Description
+        --------------------
+        -> putconn (method): Class method that returns a borrowed connection to the pool
+
+        --------------------
+        Parameters
+        --------------------
+        -> conn (psycopg2._psycopg.connection): The borrowed connection.
+        -> close (bool): Whether the connection must be closed instead of being reused.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Unregister the connection as borrowed.
+        -> If the pool is closed, close was requested or the server connection is lost, close the connection.
+        -> Otherwise, roll back any pending transaction and put the connection back on the idle list.
+        -> Wake up one borrower waiting for a connection.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        with self.lock:
+            self.in_use.pop(id(conn), None)
+            if self.closed or close or conn.closed or conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                self.discard(conn)
+            else:
+                try:
+                    if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                        conn.rollback()
+                except psycopg2.Error:
+                    self.discard(conn)
+                else:
+                    self.idle.append([conn, time.monotonic()])
+            self.lock.notify()
+
+    @contextmanager
+    def connection(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> connection (method): Class method that borrows a connection for the duration of a with block
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Borrow a connection using getconn().
+        -> Yield it to the with block.
+        -> Return it using putconn(), closing it if the with block raised a connection-level error.
+
+        --------------------
+        Returns
+        --------------------
+        -> (psycopg2._psycopg.connection): The borrowed connection.
+
+        """
+        conn = self.getconn()
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.putconn(conn, close=broken)
+
+    def closeall(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> closeall (method): Class method that closes the pool and all its idle connections
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Mark the pool as closed so that borrowed connections are closed when they are returned.
+        -> Close every idle connection.
+        -> Wake up every borrower waiting for a connection.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        with self.lock:
+            self.closed = True
+            for conn, _ in self.idle:
+                self.discard(conn)
+            self.idle = []
+            self.lock.notify_all()
+
+    def get_stats(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_stats (method): Class method that reports the current state and counters of the pool
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Gather the sizes and counters of the pool in a dictionary.
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): Statistics of the pool.
+
+        """
+        with self.lock:
+            return {
+                'size': self.size(),
+                'idle': len(self.idle),
+                'in_use': len(self.in_use),
+                'pending': self.n_pending,
+                'external': self.n_external,
+                'minconn': self.minconn,
+                'maxconn': self.maxconn,
+                'created': self.n_created,
+                'borrowed': self.n_borrowed,
+                'reaped': self.n_reaped,
+                'discarded': self.n_discarded,
+                'timeouts': self.n_timeouts,
+                'sessions': self.n_sessions,
+                'retired': self.retired,
+                'closed': self.closed
+            }
+
+    def attach(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> attach (method): Class method that registers a session using the pool
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Holding the lock, raise a PoolError if the pool is closed, otherwise count one more session.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        with self.lock:
+            if self.closed:
+                raise psycopg2.pool.PoolError('connection pool is closed')
+            self.n_sessions += 1
+
+    def detach(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> detach (method): Class method that unregisters a session which does not use the pool anymore
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Holding the lock, count one less session.
+        -> If the pool is retired and no session uses it anymore, close it (closeall()).
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        with self.lock:
+            self.n_sessions = max(self.n_sessions - 1, 0)
+            if self.retired and self.n_sessions == 0:
+                self.closeall()
+
+    def retire(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> retire (method): Class method that marks a pool replaced in connection_pools, so that it is closed once its last session detaches
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Holding the lock, mark the pool as retired.
+        -> If no session uses it, close it now (closeall()). Otherwise the sessions keep using it until they detach().
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        with self.lock:
+            self.retired = True
+            if self.n_sessions == 0:
+                self.closeall()
+
+connection_pools = {}
+connection_pools_pending = set()
+connection_pools_lock = threading.Condition()
+
+def get_connection_pool(database, user, password, host, port):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_connection_pool (function): Function that returns the process-wide connection pool of a database, creating it if needed, and registers the calling session on it
+
+    --------------------
+    Parameters
+    --------------------
+    -> database (str): Name of Postgres database.
+    -> user (str): Username used for connecting to Postgres database.
+    -> password (str): Password used for connecting to Postgres database.
+    -> host (str): URL of Postgres database.
+    -> port (str): Port number of Postgres database.
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Pools are shared across sessions and keyed by (host, port, database, user).
+    -> Holding the lock, wait while another session is creating a pool for the same key.
+    -> If an open pool exists for the key and was created with the same password, attach the session to it and return it.
+    -> Otherwise, reserve the key as pending and release the lock, so that opening the minconn connections of the new pool does not block the sessions of other databases.
+    Creating the pool raises psycopg2.OperationalError if the credentials are wrong, in which case the pending key is released and the existing pool is kept.
+    -> Holding the lock again, release the pending key, attach the session to the new pool and register it, so that the waiting sessions find it.
+    -> Retire the pool being replaced, if any: the sessions still using it keep it until they detach, and it is closed when the last one does (ConnectionPool.retire()).
+
+    --------------------
+    Returns
+    --------------------
+    -> (ConnectionPool): The shared connection pool, to be detached by the session when it stops using it (ConnectionPool.detach()).
+
+    """
+    key = (host, port, database, user)
+    with connection_pools_lock:
+        while key in connection_pools_pending:
+            connection_pools_lock.wait()
+        pool = connection_pools.get(key)
+        if pool is not None and not pool.closed and pool.password == password:
+            pool.attach()
+            return pool
+        connection_pools_pending.add(key)
+    try:
+        new_pool = ConnectionPool(database, user, password, host, port)
+    except BaseException:
+        with connection_pools_lock:
+            connection_pools_pending.discard(key)
+            connection_pools_lock.notify_all()
+        raise
+    with connection_pools_lock:
+        connection_pools_pending.discard(key)
+        connection_pools_lock.notify_all()
+        new_pool.attach()
+        pool = connection_pools.get(key)
+        connection_pools[key] = new_pool
+    if pool is not None:
+        pool.retire()
+    return new_pool
+
+def get_pools_stats():
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_pools_stats (function): Function that reports the statistics of every process-wide connection pool
+
+    --------------------
+    Parameters
+    --------------------
+    No parameter
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Iterate over the registered pools and collect their statistics, labelled as user@host:port/database.
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Statistics of each pool.
+
+    """
+    with connection_pools_lock:
+        pools = list(connection_pools.items())
+    return {f'{user}@{host}:{port}/{database}': pool.get_stats() for (host, port, database, user), pool in pools}
+
+def parse_copy_dates(serie, type_code):
+    """
+    --------------------
+    Description
+    --------------------
+    -> parse_copy_dates (function): Function that converts a date or timestamp column read as strings by run_copy_query() to the types returned by the other loaders
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pandas.Series): The values exported by COPY, as ISO strings, missing values being NaN.
+    -> type_code (int): The type OID of the column (DATE_OIDS, TIMESTAMP_OIDS or TIMESTAMPTZ_OIDS).
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Dates are converted to datetime.date objects, like psycopg2 does.
+    -> Timestamps are converted to datetime64 with the vectorised pandas.to_datetime(), in UTC for timestamps with time zone.
+    -> If a timestamp does not fit in datetime64 (e.g. infinity or year 3000), convert each value to a datetime.datetime object instead, like psycopg2 does.
+    -> Infinite values are converted to the minimum and maximum dates (COPY_INFINITE_DATES).
+    -> Raise a ValueError naming the column if a value cannot be parsed, instead of returning the strings.
+
+    --------------------
+    Returns
+    --------------------
+    -> (pandas.Series): The converted values.
+
+    """
+    kind = 'date' if type_code in DATE_OIDS else 'datetime'
+    def parse(value):
+        if value in COPY_INFINITE_DATES[kind]:
+            return COPY_INFINITE_DATES[kind][value]
+        return getattr(datetime, kind).fromisoformat(value)
+    try:
+        if kind == 'datetime':
+            try:
+                return pd.to_datetime(serie, utc=type_code in TIMESTAMPTZ_OIDS)
+            except (ValueError, OverflowError):
+                pass
+        return serie.map(parse, na_action='ignore')
+    except ValueError as e:
+        raise ValueError(f'Cannot parse the {kind} values of column {serie.name} exported by COPY: {e}') from e
+
+def normalize_query(sql_query):
+    """
+    --------------------
+    Description
+    --------------------
+    -> normalize_query (function): Function that normalises a SQL query so that the same query written differently shares a cache entry
+
+    --------------------
+    Parameters
+    --------------------
+    -> sql_query (str): The sql command to be normalised.
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Collapse every run of whitespace into a single space, then strip the surrounding whitespace and the trailing semicolon.
+    The case is kept as it matters inside string literals.
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): The normalised query.
+
+    """
+    return ' '.join(sql_query.split()).rstrip(';').strip()
+
+def unquote_identifier(identifier):
+    """
+    --------------------
+    Description
+    --------------------
+    -> unquote_identifier (function): Function that returns the name stored in the catalogs for an identifier written in a SQL query
+
+    --------------------
+    Parameters
+    --------------------
+    -> identifier (str): A plain or a double-quoted identifier.
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Strip the double quotes of a quoted identifier and undouble the double quotes it contains.
+    -> Otherwise, fold the identifier to lower case as Postgres does.
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): The name of the object.
+
+    """
+    if identifier.startswith('"'):
+        return identifier[1:-1].replace('""', '"')
+    return identifier.lower()
+
+def get_query_tables(sql_query, excluded_schemas=('information_schema', 'pg_catalog')):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_query_tables (function): Function that lists the user tables read by a SQL query
+
+    --------------------
+    Parameters
+    --------------------
+    -> sql_query (str): The sql command to be inspected.
+    -> excluded_schemas (tuple): Names of the internal Postgres schemas which are not user tables.
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Find every schema.table following FROM or JOIN, with plain or quoted identifiers (unquote_identifier()).
+    -> If there is none, return None: the tables read by the query are unknown.
+    -> Otherwise, leave out the internal schemas and return the tables sorted and without duplicates.
+
+    --------------------
+    Returns
+    --------------------
+    -> (list): The (schema name, table name) pairs read by the query, or None.
+
+    """
+    tables = {(unquote_identifier(schema_name), unquote_identifier(table_name)) for schema_name, table_name in QUERY_TABLES_PATTERN.findall(sql_query)}
+    if not tables:
+        return None
+    return sorted((schema_name, table_name) for schema_name, table_name in tables if schema_name not in excluded_schemas)
+
+class QueryCache:
+    """
+    --------------------
+    Description
+    --------------------
+    -> QueryCache (class): Class that keeps the results of queries in memory, shared by every Streamlit session, with least-recently-used eviction and expiry
+
+    --------------------
+    Attributes
+    --------------------
+    -> max_entries (int): Maximum number of results kept (optional)
+    -> max_bytes (int): Maximum memory used by the results kept, larger results are not cached (optional)
+    -> ttl (float): Number of seconds after which a result expires, even if its tables did not change (optional)
+    -> entries (OrderedDict): [result, size in bytes, expiry time] of each key, the least recently used first
+    -> n_bytes (int): Memory used by the results kept
+    -> lock (threading.Lock): Lock protecting the cache
+    -> n_hits (int): Number of lookups answered from the cache
+    -> n_misses (int): Number of lookups not found in the cache
+    -> n_evictions (int): Number of results evicted to respect max_entries and max_bytes
+    -> n_expired (int): Number of results dropped because they were older than ttl
+    """
+    def __init__(self, max_entries=QUERY_CACHE_SIZE, max_bytes=QUERY_CACHE_MAX_BYTES, ttl=QUERY_CACHE_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.n_bytes = 0
+        self.lock = threading.Lock()
+        self.n_hits = 0
+        self.n_misses = 0
+        self.n_evictions = 0
+        self.n_expired = 0
+
+    def get(self, key):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get (method): Class method that looks up the result cached for a key
+
+        --------------------
+        Parameters
+        --------------------
+        -> key (tuple): The cache key.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> If the key is unknown, count a miss and return None.
+        -> If the result expired, drop it, count a miss and return None.
+        -> Otherwise mark the key as the most recently used, count a hit and return a copy of the result, so that callers can modify it freely.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pandas.DataFrame): The cached result, or None.
+
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[2] <= time.monotonic():
+                self.drop(key)
+                self.n_expired += 1
+                entry = None
+            if entry is None:
+                self.n_misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.n_hits += 1
+            return entry[0].copy()
+
+    def put(self, key, result):
+        """
+        --------------------
+        Description
+        --------------------
+        -> put (method): Class method that caches the result of a query
+
+        --------------------
+        Parameters
+        --------------------
+        -> key (tuple): The cache key.
+        -> result (pandas.DataFrame): The result of the query.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Measure the memory used by the result. If it is larger than max_bytes, do not cache it.
+        -> Store a copy of the result with its expiry time as the most recently used entry, replacing any previous result of the key.
+        -> Evict the least recently used entries until max_entries and max_bytes are respected.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        n_bytes = int(result.memory_usage(index=True, deep=True).sum())
+        if n_bytes > self.max_bytes or self.max_entries <= 0:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.drop(key)
+            self.entries[key] = [result.copy(), n_bytes, time.monotonic() + self.ttl]
+            self.n_bytes += n_bytes
+            while len(self.entries) > self.max_entries or self.n_bytes > self.max_bytes:
+                self.drop(next(iter(self.entries)))
+                self.n_evictions += 1
+
+    def drop(self, key):
+        """
+        --------------------
+        Description
+        --------------------
+        -> drop (method): Class method that removes an entry from the cache, the caller holding the lock
+
+        --------------------
+        Parameters
+        --------------------
+        -> key (tuple): The cache key.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Remove the entry and release the memory it used from n_bytes.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        self.n_bytes -= self.entries.pop(key)[1]
+
+    def clear(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> clear (method): Class method that empties the cache
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Remove every entry.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        with self.lock:
+            self.entries.clear()
+            self.n_bytes = 0
+
+    def get_stats(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_stats (method): Class method that reports the usage of the cache
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Return the number of entries, the memory used and the counters of the cache.
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): Statistics of the cache.
+
+        """
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.n_bytes,
+                'hits': self.n_hits,
+                'misses': self.n_misses,
+                'evictions': self.n_evictions,
+                'expired': self.n_expired
+            }
+
+query_cache = QueryCache()
+
+class TableCatalog:
+    """
+    --------------------
+    Description
+    --------------------
+    -> TableCatalog (class): Class that indexes the tables of a database in memory for searching them by prefix or fuzzy name and filtering them by schema and estimated size
+
+    --------------------
+    Attributes
+    --------------------
+    -> tables (pd.Dataframe): Schema, name, estimated number of rows and size of each table, with its full name (schema.table) and the lowercase version used for searching, sorted by full name
+    -> names (list): Lowercase full names of the tables, sorted, for searching by prefix with bisect
+    -> table_names (list): Lowercase table names (without schema), sorted, for searching by prefix with bisect
+    -> table_positions (list): Position in tables of each entry of table_names
+    -> schemas (list): Names of the schemas that have tables
+    -> expires_at (float): Time (time.monotonic()) after which the catalog must be read again
+    """
+    def __init__(self, tables_df, ttl=CATALOG_TTL):
+        tables = tables_df[['table_schema', 'table_name', 'n_rows_estimate', 'size_estimate']].copy()
+        tables['name'] = tables['table_schema'].astype(str) + '.' + tables['table_name'].astype(str)
+        tables['search_name'] = tables['name'].str.lower()
+        self.tables = tables.sort_values('search_name', ignore_index=True)
+        self.names = self.tables['search_name'].tolist()
+        table_names = self.tables['table_name'].astype(str).str.lower().sort_values()
+        self.table_names = table_names.tolist()
+        self.table_positions = table_names.index.tolist()
+        self.schemas = sorted(self.tables['table_schema'].unique().tolist())
+        self.expires_at = time.monotonic() + ttl
+
+    def is_expired(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> is_expired (method): Class method that checks whether the catalog is older than its time to live
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Compare the current time with the expiry time of the catalog.
+
+        --------------------
+        Returns
+        --------------------
+        -> (bool): Whether the catalog expired.
+
+        """
+        return time.monotonic() >= self.expires_at
+
+    def get_prefix_positions(self, text):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_prefix_positions (method): Class method that finds the tables whose full name (schema.table) or table name starts with a text
+
+        --------------------
+        Parameters
+        --------------------
+        -> text (str): Lowercase text searched.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> As the names are sorted, the names starting with the text are contiguous: find their range with bisect, for the full names and for the table names.
+        -> Return the positions of the matching tables.
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): The positions of the matching tables in the tables attribute.
+
+        """
+        upper = text + '￿'
+        positions = list(range(bisect_left(self.names, text), bisect_left(self.names, upper)))
+        positions += self.table_positions[bisect_left(self.table_names, text):bisect_left(self.table_names, upper)]
+        return positions
+
+    def search(self, text='', schemas=None, min_rows=None, max_rows=None, limit=CATALOG_SEARCH_LIMIT):
+        """
+        --------------------
+        Description
+        --------------------
+        -> search (method): Class method that searches the tables by name, schema and estimated number of rows
+
+        --------------------
+        Parameters
+        --------------------
+        -> text (str): Text searched in the names of the tables, case insensitive. If empty, every table matches (default: '').
+        -> schemas (list): If provided, only the tables of these schemas are kept (default: None).
+        -> min_rows (int): If provided, only the tables with at least this estimated number of rows are kept (default: None).
+        -> max_rows (int): If provided, only the tables with at most this estimated number of rows are kept (default: None).
+        -> limit (int): Maximum number of tables returned (default: CATALOG_SEARCH_LIMIT).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Keep the tables of the selected schemas and within the range of estimated rows. Tables never analysed count as 0 rows.
+        -> If a text is given, rank the tables:
+        - 0 when the full name or the table name starts with the text (get_prefix_positions()),
+        - 1 when the full name contains the text,
+        - 2 when the full name contains the characters of the text in the same order (fuzzy match, e.g. 'pbord' matches 'public.orders'),
+        and drop the other tables.
+        -> Return the first tables by rank then name, up to limit.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pd.DataFrame): The matching tables with their schema, name, estimated number of rows and size, and full name (schema.table).
+
+        """
+        mask = pd.Series(True, index=self.tables.index)
+        if schemas:
+            mask &= self.tables['table_schema'].isin(schemas)
+        n_rows = self.tables['n_rows_estimate'].fillna(0)
+        if min_rows:
+            mask &= n_rows >= min_rows
+        if max_rows:
+            mask &= n_rows <= max_rows
+        text = (text or '').strip().lower()
+        if text:
+            pattern = '.*'.join(re.escape(char) for char in text)
+            rank = pd.Series(3, index=self.tables.index)
+            rank[self.tables['search_name'].str.contains(pattern, regex=True)] = 2
+            rank[self.tables['search_name'].str.contains(text, regex=False)] = 1
+            rank[self.get_prefix_positions(text)] = 0
+            mask &= rank < 3
+            order = rank[mask].sort_values(kind='stable').index
+        else:
+            order = mask[mask].index
+        return self.tables.loc[order[:limit], ['table_schema', 'table_name', 'n_rows_estimate', 'size_estimate', 'name']].reset_index(drop=True)
+
+class CatalogMetadata:
+    """
+    --------------------
+    Description
+    --------------------
+    -> CatalogMetadata (class): Class that reads the tables of a database and the information of their columns from pg_catalog, with a single query per schema,
+    and keeps them for the lifetime of the connection
+
+    --------------------
+    Attributes
+    --------------------
+    -> db (PostgresConnector): Instantation of PostgresConnector class for handling Postgres connection (mandatory)
+    -> schemas (dict): Tables and columns of each schema already read, as Pandas dataframes (get_catalog_metadata_query())
+    -> is_complete (bool): Whether every schema has been read
+    -> catalog (TableCatalog): Searchable index of the tables, built by get_catalog()
+    """
+    def __init__(self, db):
+        self.db = db
+        self.schemas = {}
+        self.is_complete = False
+        self.catalog = None
+
+    def load(self, schema_name=None):
+        """
+        --------------------
+        Description
+        --------------------
+        -> load (method): Class method that reads the tables and columns of a schema, or of all schemas, from pg_catalog (get_catalog_metadata_query())
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the schema. If None, all schemas are read with a single query (default: None).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Execute the query, bypassing the query cache as the result is kept here.
+        -> Split the result by schema and store each part in the schemas attribute. A schema without tables is stored as an empty dataframe.
+        -> When all schemas are read, drop the ones that no longer exist and mark the metadata as complete.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        df = self.db.run_query(get_catalog_metadata_query(schema_name), use_cache=False)
+        if schema_name is None:
+            self.schemas = {}
+            self.is_complete = True
+        else:
+            self.schemas[schema_name] = df.iloc[0:0]
+        if 'table_schema' in df.columns:
+            for name, schema_df in df.groupby('table_schema', sort=False):
+                self.schemas[name] = schema_df.reset_index(drop=True)
+
+    def get_schema(self, schema_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_schema (method): Class method that returns the tables and columns of a schema, reading them only if they are not kept yet
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the schema.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> If the schema has not been read yet, read it (load()).
+        -> Return its tables and columns.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pandas.DataFrame): The tables of the schema and the information of their columns.
+
+        """
+        if schema_name not in self.schemas:
+            self.load(schema_name)
+        return self.schemas[schema_name]
+
+    def list_tables(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> list_tables (method): Class method that returns the list of available tables, reading all schemas at once if needed
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> If not every schema has been read, read them all with a single query (load()).
+        -> Return the schema and name of every table, once per table, with its estimated number of rows and size.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pandas.DataFrame): The list of schemas and their tables as a Pandas dataframe.
+
+        """
+        if not self.is_complete:
+            self.load()
+        columns = ['table_schema', 'table_name', 'n_rows_estimate', 'size_estimate']
+        frames = [df[columns] for df in self.schemas.values() if df.shape[0] > 0]
+        if not frames:
+            return pd.DataFrame([], columns=columns)
+        return pd.concat(frames).drop_duplicates(['table_schema', 'table_name'], ignore_index=True)
+
+    def get_catalog(self, refresh=False):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_catalog (method): Class method that returns the searchable index of the tables, building it only when needed
+
+        --------------------
+        Parameters
+        --------------------
+        -> refresh (bool): Whether the tables must be read again from pg_catalog (default: False).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> If a refresh is requested or the index expired (older than CATALOG_TTL seconds), read all schemas again with a single query (load()).
+        -> If there is no index (first use, refresh, expiry or clear()), build it from the list of tables (list_tables()).
+        -> Return the index. It is reused by every rerun until it expires.
+
+        --------------------
+        Returns
+        --------------------
+        -> (TableCatalog): The index of the tables.
+
+        """
+        if refresh or (self.catalog is not None and self.catalog.is_expired()):
+            self.load()
+            self.catalog = None
+        if self.catalog is None:
+            self.catalog = TableCatalog(self.list_tables())
+        return self.catalog
+
+    def get_table(self, schema_name, table_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_table (method): Class method that returns the information of the columns of a table
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the selected schema.
+        -> table_name  (str): Name of the selected table.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Get the tables and columns of the schema (get_schema()).
+        -> Keep the columns of the selected table, in the order of the table.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pandas.DataFrame): The information of the columns of the table.
+
+        """
+        df = self.get_schema(schema_name)
+        if df.shape[0] == 0:
+            return df
+        return df[(df['table_name'] == table_name) & df['column_name'].notna()].reset_index(drop=True)
+
+    def get_rows_estimate(self, schema_name, table_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_rows_estimate (method): Class method that returns the number of rows of a table estimated by Postgres (pg_class.reltuples), without scanning it
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the selected schema.
+        -> table_name  (str): Name of the selected table.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Get the columns of the table (get_table()), which carry the estimated number of rows read with the schema.
+        -> Return it, or None if the table is unknown or has never been analysed (reltuples is -1 or 0).
+
+        --------------------
+        Returns
+        --------------------
+        -> (int): The estimated number of rows, or None if there is no estimate.
+
+        """
+        df = self.get_table(schema_name, table_name)
+        if df.shape[0] == 0 or pd.isnull(df['n_rows_estimate'].iloc[0]) or df['n_rows_estimate'].iloc[0] <= 0:
+            return None
+        return int(df['n_rows_estimate'].iloc[0])
+
+    def get_page_keys(self, schema_name, table_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_page_keys (method): Class method that returns the columns identifying the rows of a table in a stable order, used for paginating it with keyset cursors
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the selected schema.
+        -> table_name  (str): Name of the selected table.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Get the information of the columns of the table (get_table()).
+        -> If the table has a primary key, return its columns in the order of the primary key index.
+        -> Otherwise, if it is a plain table, return ctid (the physical location of the rows, unique within a table).
+        -> Otherwise (views, foreign and partitioned tables without primary key), there is no such column: return an empty list.
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): The names of the columns.
+
+        """
+        df = self.get_table(schema_name, table_name)
+        if df.shape[0] == 0:
+            return []
+        primary_key = df[df['primary_key'] == True].sort_values('primary_key_position')
+        if primary_key.shape[0] > 0:
+            return primary_key['column_name'].tolist()
+        if df['table_kind'].iloc[0] == 'r':
+            return ['ctid']
+        return []
+
+    def get_columns(self, schema_name, table_name, kind=None):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_columns (method): Class method that returns the names of the columns of a table, optionally only the ones of a kind
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the selected schema.
+        -> table_name  (str): Name of the selected table.
+        -> kind (str): 'numeric', 'text' or 'date' to keep only the columns whose type category is listed in COLUMN_CATEGORIES for this kind (default: None).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Get the information of the columns of the table (get_table()).
+        -> If a kind is given, keep the columns whose type category belongs to it, leaving out the types of COLUMN_EXCLUDED_TYPES.
+        -> Return their names.
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): The names of the columns.
+
+        """
+        df = self.get_table(schema_name, table_name)
+        if df.shape[0] == 0:
+            return []
+        if kind is not None:
+            df = df[df['type_category'].isin(COLUMN_CATEGORIES[kind]) & ~df['data_type'].isin(COLUMN_EXCLUDED_TYPES)]
+        return df['column_name'].tolist()
+
+    def clear(self, schema_name=None):
+        """
+        --------------------
+        Description
+        --------------------
+        -> clear (method): Class method that forgets the tables and columns read, so that they are read again on next use
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the schema to forget. If None, every schema is forgotten (default: None).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Drop the schema, or all schemas, from the schemas attribute. The metadata is no longer complete.
+        -> Drop the index of the tables, so that it is built again on next use.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        if schema_name is None:
+            self.schemas = {}
+        else:
+            self.schemas.pop(schema_name, None)
+        self.is_complete = False
+        self.catalog = None
+
+class PostgresConnector:
+    """
+    --------------------
+    Description
+    --------------------
+    -> PostgresConnector (class): Class that manages the connection to a Postgres database
+
+    --------------------
+    Attributes
+    --------------------
+    -> database (str): Name of Postgres database (mandatory)
+    -> user (str): Username used for connecting to Postgres database (mandatory)
+    -> password (str): Password used for connecting to Postgres database (mandatory)
+    -> host (str): URL of Postgres database (mandatory)
+    -> port (str): Port number of Postgres database (mandatory)
+    -> loader (str): Method used by load_table(): 'query' (run_query()), 'stream' (run_query_chunks()) or 'copy' (run_copy_query()) (optional)
+    -> conn (psycopg2._psycopg.connection): Postgres connection object used when no pool is attached (optional)
+    -> cursor (psycopg2._psycopg.connection.cursor): Postgres cursor for executing query (optional)
+    -> cursor_conn (psycopg2._psycopg.connection): Connection borrowed from the pool by open_cursor() and returned by close_cursor() (optional)
+    -> pool (ConnectionPool): Process-wide connection pool that queries borrow connections from (optional)
+    -> pool_finalizer (weakref.finalize): Detaches the session from its pool when it connects again or is garbage collected (optional)
+    -> excluded_schemas (list): List containing the names of internal Postgres schemas to be excluded from selection (information_schema, pg_catalog)
+    -> use_cache (bool): Whether run_query() goes through the process-wide query cache (optional)
+    -> async_connector (AsyncPostgresConnector): Asynchronous connector to the same database, opened by get_async_connector() (optional)
+    -> metadata (CatalogMetadata): Tables and columns of the database read from pg_catalog, kept for the lifetime of the connection
+    -> fingerprints (dict): Fingerprints of the tables read by get_tables_fingerprint(), with the time they were read, reused for FINGERPRINT_TTL seconds
+    """
+    def __init__(self, database="postgres", user='postgres', password='password', host='127.0.0.1', port='5432', loader='query', use_cache=False):
+        self.database = database
+        self.user = user
+        self.password = password
+        self.host = host
+        self.port = port
+        self.loader = loader
+        self.conn = None
+        self.cursor = None
+        self.cursor_conn = None
+        self.pool = None
+        self.pool_finalizer = None
+        self.excluded_schemas = ['information_schema', 'pg_catalog']
+        self.use_cache = use_cache
+        self.async_connector = None
+        self.metadata = CatalogMetadata(self)
+        self.fingerprints = {}
+
+    
+    def open_connection(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> open_connection (method): Class method that attaches the connector to the shared connection pool of a Postgres database
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> If there is any existing connection, close it. The self.conn is not None when it has been set directly instead of using the pool.
+        -> Close the asynchronous connector, if any, and forget the tables and columns read, as they may belong to another database.
+        -> Get the process-wide pool for the menu's information such as username, password, host, port, database (get_connection_pool()). 
+        The pool is created, and its first connections opened, only if no other session uses the same database already.
+        -> Detach the session from its previous pool, if any, so that a pool replaced after a password change is closed once no session uses it.
+        -> Store the pool in the pool attribute and detach from it when the session is garbage collected (weakref.finalize).
+        -> If connection failed, a dictionary including status False and error message is returned.
+        -> Otherwise, a dictionary including status True and success message is returned.
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): A dictionary including status and message of the connection. 
+
+        """
+        if self.conn != None:
+            self.close_connection()
+            self.conn = None
+        if self.async_connector is not None:
+            self.async_connector.close_connection()
+            self.async_connector = None
+        self.metadata.clear()
+        try:
+            pool = get_connection_pool(self.database, self.user, self.password, self.host, self.port)
+
+        except psycopg2.OperationalError as e:
+            return { 'status': False, 'msg': f'Connection to server at {self.host}, port {self.port} failed: {e}' }
+        else:
+            if self.pool_finalizer is not None:
+                self.pool_finalizer()
+            self.pool = pool
+            self.pool_finalizer = weakref.finalize(self, pool.detach)
+            return { 'status': True, 'msg': 'Connection to database established' }
+
+    def close_connection(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> close_connection (method): Class method that closes an active connection to a Postgres database
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Close the existing connection, if any. Pooled connections are owned by the pool and are not closed.
+        -> Close the idle connections of the asynchronous connector, if any.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        if self.conn is not None:
+            self.conn.close()
+        if self.async_connector is not None:
+            self.async_connector.close_connection()
+
+    def open_cursor(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> open_cursor (method): Class method that creates an active cursor to a Postgres database 
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> If no connection is stored in the conn attribute and a pool is attached, borrow a connection from the pool and keep it in cursor_conn until close_cursor() is called.
+        -> Create a cursor from the connection object to execute a Postgres command. 
+        -> Store the cursor in cursor attribute. 
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        conn = self.conn
+        if conn is None and self.pool is not None:
+            if self.cursor_conn is None:
+                self.cursor_conn = self.pool.getconn()
+            conn = self.cursor_conn
+        self.cursor = conn.cursor()
+        
+    def close_cursor(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> close_cursor (method): Class method that closes an active cursor to a Postgres database 
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Close the existing cursor. 
+        -> Return the connection borrowed by open_cursor() to the pool, if any.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        self.cursor.close()
+        if self.cursor_conn is not None:
+            self.pool.putconn(self.cursor_conn)
+            self.cursor_conn = None
+
+    @contextmanager
+    def get_connection(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_connection (method): Class method that provides a connection for the duration of a with block
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> If a pool is attached, borrow a connection from it and return it to the pool at the end of the with block.
+        -> Otherwise, yield the connection stored in the conn attribute.
+
+        --------------------
+        Returns
+        --------------------
+        -> (psycopg2._psycopg.connection): The connection to be used.
+
+        """
+        if self.pool is not None:
+            with self.pool.connection() as conn:
+                yield conn
+        else:
+            yield self.conn
+
+    def get_async_connector(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_async_connector (method): Class method that returns an asynchronous connector to the same database, for running many queries at the same time
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Create the AsyncPostgresConnector on first use, with the same credentials, cache setting and connection pool, and store it in the async_connector attribute.
+        -> Return it. Its connections are opened lazily, each taking a slot of the connection pool, if any.
+
+        --------------------
+        Returns
+        --------------------
+        -> (AsyncPostgresConnector): The asynchronous connector.
+
+        """
+        if self.async_connector is None:
+            self.async_connector = AsyncPostgresConnector(self.database, self.user, self.password, self.host, self.port, use_cache=self.use_cache, pool=self.pool)
+        return self.async_connector
+
+    def get_pool_stats(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_pool_stats (method): Class method that reports the statistics of the attached connection pool
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> If no pool is attached, return None.
+        -> Otherwise, return the pool statistics.
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): Statistics of the pool.
+
+        """
+        if self.pool is None:
+            return None
+        return self.pool.get_stats()
+
+    def get_tables_fingerprint(self, tables):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_tables_fingerprint (method): Class method that reads a value which changes whenever the content of the given tables changes (get_tables_fingerprint_query())
+
+        --------------------
+        Parameters
+        --------------------
+        -> tables (list): List of (schema name, table name) pairs.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> If the tables are unknown, return None. If there is no table, return an empty fingerprint.
+        -> If the fingerprint of the same tables was read less than FINGERPRINT_TTL seconds ago, return it, so that the queries of a rerun do not each pay a round-trip to pg_stat_user_tables.
+        -> Otherwise, read the activity counters of the tables, bypassing the cache.
+        -> If some tables have no counters (e.g. views), the fingerprint is None as it cannot tell when they change.
+        -> Otherwise, the fingerprint is the counters as a tuple.
+        -> Remember the fingerprint with the time it was read and return it.
+
+        --------------------
+        Returns
+        --------------------
+        -> (tuple): The fingerprint of the tables, or None.
+
+        """
+        if tables is None:
+            return None
+        if not tables:
+            return ()
+        key = tuple(tables)
+        now = time.monotonic()
+        cached = self.fingerprints.get(key)
+        if cached is not None and now - cached[0] < FINGERPRINT_TTL:
+            return cached[1]
+        df = self.run_query(get_tables_fingerprint_query(tables), use_cache=False)
+        fingerprint = None
+        if df.shape[0] >= len(tables):
+            fingerprint = tuple(tuple(row) for row in df.astype(str).values.tolist())
+        self.fingerprints[key] = (now, fingerprint)
+        return fingerprint
+
+    def get_cache_key(self, sql_query):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_cache_key (method): Class method that builds the key identifying the result of a query in the query cache
+
+        --------------------
+        Parameters
+        --------------------
+        -> sql_query (str): The sql command that will be executed.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Find the user tables read by the query (get_query_tables()) and their fingerprint (get_tables_fingerprint()).
+        -> If the tables or their fingerprint are unknown, return None: the result must not be cached.
+        -> Otherwise, combine the database, the user, the normalised query and the fingerprint, so that any change to the tables leads to a new key.
+        Queries reading only the catalogs have an empty fingerprint and rely on the expiry of the cache.
+
+        --------------------
+        Returns
+        --------------------
+        -> (tuple): The cache key, or None.
+
+        """
+        fingerprint = self.get_tables_fingerprint(get_query_tables(sql_query, self.excluded_schemas))
+        if fingerprint is None:
+            return None
+        return (self.host, self.port, self.database, self.user, normalize_query(sql_query), fingerprint)
+
+    def run_query(self, sql_query, use_cache=True, params=None):
+        """
+        --------------------
+        Description
+        --------------------
+        -> run_query (method): Class method that executes a SQL query and returns the result as a Pandas dataframe
+
+        --------------------
+        Parameters
+        --------------------
+        -> sql_query (str): The sql command that will be executed.
+        -> use_cache (bool): Whether the result may be read from and stored in the query cache, when the connector uses it (default: True).
+        -> params (tuple): Values of the %s placeholders of sql_query, passed to Postgres by psycopg2 (default: None).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> If the connector and the call use the cache, build the cache key (get_cache_key()), including the values of the placeholders, and return the cached result if there is one.
+        -> Borrow a connection using get_connection() and create a cursor from it.
+        -> Execute the sql_query with its params.
+        -> There are two scenarios after running the query:
+        If query is executed successfully:
+        -> Fetch all the rows returned by the execution using fetchall().
+        -> Get the list of column names.
+        -> Close the cursor. 
+        -> Return the result as a Pandas dataframe. 
+        Otherwise:
+        -> Close the cursor.
+        -> Return an empty Pandas dataframe.
+        -> In both cases, the connection is returned to the pool at the end.
+        -> A successful result is stored in the cache under its key, if any.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pandas.DataFrame): The result of sql query as a Pandas dataframe.
+
+        """
+        cache_key = None
+        if self.use_cache and use_cache:
+            cache_key = self.get_cache_key(sql_query)
+            if cache_key is not None and params is not None:
+                cache_key += (tuple(params),)
+            if cache_key is not None:
+                result = query_cache.get(cache_key)
+                if result is not None:
+                    return result
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                if params is None:
+                    cursor.execute(sql_query)
+                else:
+                    cursor.execute(sql_query, params)
+            except psycopg2.OperationalError as e:
+                cursor.close()
+                return pd.DataFrame([], columns=[])
+            else:
+                raw_results = cursor.fetchall()
+                col_names = [desc[0] for desc in cursor.description]
+                cursor.close()
+                result = pd.DataFrame(raw_results, columns=col_names)
+        if cache_key is not None:
+            query_cache.put(cache_key, result)
+        return result
+
+    def run_query_chunks(self, sql_query, chunksize=LOAD_CHUNKSIZE, itersize=None):
+        """
+        --------------------
+        Description
+        --------------------
+        -> run_query_chunks (method): Class method that executes a SQL query with a server-side cursor and yields the result as Pandas dataframes of at most chunksize rows
+
+        --------------------
+        Parameters
+        --------------------
+        -> sql_query (str): The sql command that will be executed.
+        -> chunksize (int): Maximum number of rows of each yielded dataframe.
+        -> itersize (int): Number of rows fetched from the server at each network round-trip (default: chunksize).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Borrow a connection using get_connection() and open a transaction on it, as named cursors only live inside a transaction.
+        -> Create a named (server-side) cursor so that Postgres keeps the result and sends it itersize rows at a time.
+        -> Execute the sql_query. If it fails, yield an empty Pandas dataframe.
+        -> Otherwise, read the rows chunksize at a time and yield each chunk as a Pandas dataframe, so that the whole result is never held as Python tuples.
+        At least one (possibly empty) dataframe is yielded so that the column names are always known.
+        -> Close the cursor, end the transaction and restore the autocommit mode of the connection.
+
+        --------------------
+        Returns
+        --------------------
+        -> (generator): Generator of Pandas dataframes.
+
+        """
+        with self.get_connection() as conn:
+            autocommit = conn.autocommit
+            conn.autocommit = False
+            cursor = conn.cursor(name=f'stream_{uuid.uuid4().hex}')
+            cursor.itersize = itersize or chunksize
+            try:
+                try:
+                    cursor.execute(sql_query)
+                except psycopg2.OperationalError as e:
+                    yield pd.DataFrame([], columns=[])
+                    return
+                n_chunks = 0
+                while True:
+                    raw_results = list(islice(cursor, chunksize))
+                    if not raw_results and n_chunks > 0:
+                        break
+                    col_names = [desc[0] for desc in cursor.description]
+                    yield pd.DataFrame(raw_results, columns=col_names)
+                    n_chunks += 1
+                    if len(raw_results) < chunksize:
+                        break
+            finally:
+                cursor.close()
+                conn.rollback()
+                conn.autocommit = autocommit
+
+    def run_copy_query(self, sql_query):
+        """
+        --------------------
+        Description
+        --------------------
+        -> run_copy_query (method): Class method that exports the result of a SQL query with COPY and parses it with the vectorised Pandas CSV reader
+
+        --------------------
+        Parameters
+        --------------------
+        -> sql_query (str): The sql command whose result will be loaded.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Borrow a connection using get_connection() and create a cursor from it.
+        -> Execute the query returned by get_result_types_query() to get the column names and type OIDs without reading any row.
+        -> Execute the COPY command returned by get_copy_query() into a spooled buffer, kept in memory up to COPY_SPOOL_SIZE bytes and on disk above.
+        -> If any of these fails, close the cursor and return an empty Pandas dataframe.
+        -> Read the buffer with pandas.read_csv(): integer columns are left to the C parser (int64, or float64 when they contain NULL like with run_query()), 
+        float and numeric columns are parsed as float64 and the other ones are kept as strings.
+        -> Convert boolean columns with vectorised operations, and date/timestamp columns to the types returned by the other loaders (parse_copy_dates()),
+        raising a ValueError if they cannot be parsed.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pandas.DataFrame): The result of sql query as a Pandas dataframe.
+
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            with tempfile.SpooledTemporaryFile(max_size=COPY_SPOOL_SIZE, mode='w+b') as buffer:
+                try:
+                    cursor.execute(get_result_types_query(sql_query))
+                    col_types = [(desc[0], desc[1]) for desc in cursor.description]
+                    cursor.copy_expert(get_copy_query(sql_query), buffer)
+                except psycopg2.OperationalError as e:
+                    cursor.close()
+                    return pd.DataFrame([], columns=[])
+                cursor.close()
+                buffer.seek(0)
+                dtypes = {}
+                na_values = {}
+                for col_name, type_code in col_types:
+                    if type_code in INTEGER_OIDS:
+                        na_values[col_name] = ['\\N']
+                    elif type_code in FLOAT_OIDS:
+                        dtypes[col_name] = 'float64'
+                        na_values[col_name] = ['\\N', 'NaN']
+                    else:
+                        dtypes[col_name] = object
+                        na_values[col_name] = ['\\N']
+                df = pd.read_csv(buffer, dtype=dtypes, na_values=na_values, keep_default_na=False)
+        for col_name, type_code in col_types:
+            if type_code in BOOLEAN_OIDS:
+                df[col_name] = df[col_name].map({'t': True, 'f': False}).astype('boolean')
+            elif type_code in DATE_OIDS + TIMESTAMP_OIDS + TIMESTAMPTZ_OIDS:
+                df[col_name] = parse_copy_dates(df[col_name], type_code)
+        return df
+
+    def list_tables(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> list_tables (method): Class method that extracts the list of available tables from pg_catalog (CatalogMetadata.list_tables())
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Get all schemas and their tables from the metadata of the connection. They are read with a single query the first time only.
+        -> Return the result, with the estimated number of rows and size of each table.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pandas.DataFrame): The list of schemas and their tables as a Pandas dataframe. 
+
+        """
+        return self.metadata.list_tables()
+
+    def get_table_catalog(self, refresh=False):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_table_catalog (method): Class method that returns the searchable index of the available tables (CatalogMetadata.get_catalog())
+
+        --------------------
+        Parameters
+        --------------------
+        -> refresh (bool): Whether the tables must be read again from pg_catalog (default: False).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Get the index from the metadata of the connection. It is built the first time only, and again after a refresh or once it expired.
+
+        --------------------
+        Returns
+        --------------------
+        -> (TableCatalog): The index of the tables.
+
+        """
+        return self.metadata.get_catalog(refresh)
+
+    def get_page_keys(self, schema_name, table_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_page_keys (method): Class method that returns the columns used for paginating a table with keyset cursors: its primary key, or ctid for plain tables without one (CatalogMetadata.get_page_keys())
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the selected schema.
+        -> table_name  (str): Name of the selected table.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Get the columns from the metadata of the connection, reading the schema from pg_catalog the first time only.
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): The names of the columns, empty if the rows of the table cannot be identified.
+
+        """
+        return self.metadata.get_page_keys(schema_name, table_name)
+
+    def get_table_columns(self, schema_name, table_name, kind=None):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_table_columns (method): Class method that returns the names of the columns of a table, optionally only the numeric, text or datetime ones (CatalogMetadata.get_columns())
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the selected schema.
+        -> table_name  (str): Name of the selected table.
+        -> kind (str): 'numeric', 'text' or 'date' to keep only the columns of this kind (default: None).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Get the columns from the metadata of the connection, reading the schema from pg_catalog the first time only.
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): The names of the columns.
+
+        """
+        return self.metadata.get_columns(schema_name, table_name, kind)
+
+    def get_table_rows_estimate(self, schema_name, table_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_table_rows_estimate (method): Class method that returns the number of rows of a table estimated by Postgres (CatalogMetadata.get_rows_estimate())
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the selected schema.
+        -> table_name  (str): Name of the selected table.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Get the estimate from the metadata of the connection, reading the schema from pg_catalog the first time only.
+
+        --------------------
+        Returns
+        --------------------
+        -> (int): The estimated number of rows, or None if the table has never been analysed.
+
+        """
+        return self.metadata.get_rows_estimate(schema_name, table_name)
+
+    def load_table(self, schema_name, table_name, chunksize=None, sampling=None, columns=None, order_by=None):
+        """
+        --------------------
+        Description
+        --------------------
+        -> load_table (method): Class method that load the content of a table using a SQL query (get_table_data_query())
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the selected schema.
+        -> table_name  (str): Name of the selected table.
+        -> chunksize (int): If provided, the table is streamed as Pandas dataframes of at most chunksize rows (default: None).
+        -> sampling (dict): If provided, only a sample of the rows is loaded, see get_table_data_query() (default: None).
+        -> columns (list): If provided, only these columns are loaded (default: None).
+        -> order_by (list): If provided, the rows are sorted by these columns (default: None).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Call get_table_data_query() to get the query that extracts content (or a sample of the content, or some of the columns) of the Postgres table.
+        -> If chunksize is provided, execute the query with run_query_chunks() and return the generator of chunks.
+        -> Otherwise, execute the query with the loader of the connector:
+        - 'copy': run_copy_query().
+        - 'stream': run_query_chunks() with LOAD_CHUNKSIZE rows per chunk, the chunks being concatenated.
+        - 'query': run_query(). 
+        -> Return the result.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pandas.DataFrame or generator): The content of the selected table, or a generator of its chunks. 
+
+        """
+        sql_query = get_table_data_query(schema_name, table_name, sampling, columns, order_by)
+        if chunksize is not None:
+            return self.run_query_chunks(sql_query, chunksize)
+        if self.loader == 'copy':
+            return self.run_copy_query(sql_query)
+        if self.loader == 'stream':
+            return pd.concat(self.run_query_chunks(sql_query, LOAD_CHUNKSIZE), ignore_index=True)
+        return self.run_query(sql_query)
+
+    def benchmark_loaders(self, schema_name, table_name, loaders=LOADERS, repeat=3):
+        """
+        --------------------
+        Description
+        --------------------
+        -> benchmark_loaders (method): Class method that measures how long each loader takes to load a table
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the selected schema.
+        -> table_name  (str): Name of the selected table.
+        -> loaders (tuple): Names of the loaders to compare (default: all of them).
+        -> repeat (int): Number of times each loader loads the table (default: 3).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> For each loader, load the table repeat times with load_table() and record the elapsed times.
+        -> Restore the loader of the connector.
+        -> Return the dimensions of the loaded table and the best and average elapsed times of each loader, the fastest first.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pandas.DataFrame): The timings of each loader.
+
+        """
+        current_loader = self.loader
+        timings = []
+        try:
+            for loader in loaders:
+                self.loader = loader
+                elapsed = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    df = self.load_table(schema_name, table_name)
+                    elapsed.append(time.perf_counter() - start)
+                timings.append([loader, df.shape[0], df.shape[1], min(elapsed), sum(elapsed) / len(elapsed)])
+        finally:
+            self.loader = current_loader
+        df = pd.DataFrame(timings, columns=['loader', 'n_rows', 'n_cols', 'best_seconds', 'mean_seconds'])
+        return df.sort_values('best_seconds', ignore_index=True)
+
+    def get_table_schema(self, schema_name, table_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_table_schema (method): Class method that extracts the schema information of a table from pg_catalog (CatalogMetadata.get_table())
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the selected schema.
+        -> table_name  (str): Name of the selected table.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Get the information of the columns of the selected table from the metadata of the connection, reading the schema the first time only.
+        -> Keep the columns describing the schema. Nullability and primary key membership are already booleans.
+        -> Return the result.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pandas.DataFrame): Schema information of the selected table.
+
+        """
+        df = self.metadata.get_table(schema_name, table_name)
+        return df.reindex(columns=['table_name', 'column_name', 'data_type', 'is_nullable', 'character_maximum_length', 'numeric_precision', 'datetime_precision', 'primary_key'])
+
+    def get_table_stats(self, schema_name, table_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_table_stats (method): Class method that reads the statistics Postgres keeps about a table without scanning it (get_table_stats_query())
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the selected schema.
+        -> table_name  (str): Name of the selected table.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Execute the query reading pg_class and pg_stat_user_tables, bypassing the query cache.
+        -> Take the estimated number of rows from reltuples, or from the live rows counted by the statistics collector when the table has never been analysed (reltuples is -1 or 0).
+        -> Flag the statistics as stale when the table has never been analysed or when more than STATS_STALE_FRACTION of its rows changed since the last ANALYZE.
+        -> Return these values as a dictionary.
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): The estimated number of rows ('n_rows'), the date of the last ANALYZE ('last_analyze'), the number of rows modified since ('n_mod_since_analyze') and whether the statistics are stale ('is_stale').
+
+        """
+        df = self.run_query(get_table_stats_query(schema_name, table_name), use_cache=False)
+        if df.empty:
+            return { 'n_rows': None, 'last_analyze': None, 'n_mod_since_analyze': None, 'is_stale': True }
+        stats = df.to_dict('records')[0]
+        n_live = stats['n_live_tup'] if pd.notnull(stats['n_live_tup']) else 0
+        n_rows = int(stats['reltuples']) if stats['reltuples'] > 0 else int(n_live)
+        n_mod = int(stats['n_mod_since_analyze']) if pd.notnull(stats['n_mod_since_analyze']) else None
+        last_analyze = stats['last_analyze'] if pd.notnull(stats['last_analyze']) else None
+        is_stale = last_analyze is None or (n_mod or 0) > STATS_STALE_FRACTION * max(n_rows, 1)
+        return { 'n_rows': n_rows, 'last_analyze': last_analyze, 'n_mod_since_analyze': n_mod, 'is_stale': is_stale }
+
+    def get_column_stats(self, schema_name, table_name, n_rows=None):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_column_stats (method): Class method that reads the statistics gathered by ANALYZE on each column of a table without scanning it (get_column_stats_query())
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the selected schema.
+        -> table_name  (str): Name of the selected table.
+        -> n_rows (int): Estimated number of rows of the table, used for converting relative distinct counts (default: read with get_table_stats()).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Execute the query reading pg_stats for every column of the table, bypassing the query cache.
+        -> Convert n_distinct into a number of unique values: Postgres stores it as a negative fraction of the rows when it scales with the table.
+        -> Replace the missing arrays (columns without statistics) by empty lists.
+        -> Return one row per column.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pandas.DataFrame): The column name, missing ratio, estimated number of unique values, most common values with their frequencies and histogram bounds of each column.
+
+        """
+        if n_rows is None:
+            n_rows = self.get_table_stats(schema_name, table_name)['n_rows'] or 0
+        df = self.run_query(get_column_stats_query(schema_name, table_name), use_cache=False)
+        if df.empty:
+            return pd.DataFrame([], columns=['column_name', 'missing_ratio', 'n_unique', 'top_values', 'top_freqs', 'histogram_bounds'])
+        df = df.rename(columns={'null_frac': 'missing_ratio', 'n_distinct': 'n_unique'})
+        df['n_unique'] = df['n_unique'].apply(lambda n_distinct: None if pd.isnull(n_distinct) else round(n_distinct if n_distinct >= 0 else -n_distinct * n_rows))
+        for col_name in ('top_values', 'top_freqs', 'histogram_bounds'):
+            df[col_name] = df[col_name].apply(lambda values: values if isinstance(values, list) else [])
+        return df
+
+    def analyze_table(self, schema_name, table_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> analyze_table (method): Class method that refreshes the statistics Postgres keeps about a table (get_analyze_query())
+
+        --------------------
+        Parameters
+        --------------------
+        -> schema_name (str): Name of the selected schema.
+        -> table_name  (str): Name of the selected table.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Borrow a connection using get_connection() and execute the ANALYZE command, which samples the table instead of scanning it.
+        -> If the command failed (e.g. the user does not own the table), a dictionary including status False and error message is returned.
+        -> Otherwise, forget the metadata of the schema, whose estimated numbers of rows changed, and a dictionary including status True and success message is returned.
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): A dictionary including status and message of the command.
+
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(get_analyze_query(schema_name, table_name))
+            except psycopg2.Error as e:
+                return { 'status': False, 'msg': f'Statistics of {schema_name}.{table_name} could not be refreshed: {e}' }
+            else:
+                self.metadata.clear(schema_name)
+                return { 'status': True, 'msg': f'Statistics of {schema_name}.{table_name} refreshed' }
+            finally:
+                cursor.close()
+
+
+class AsyncPostgresConnector:
     """
     --------------------
     Description
     --------------------
-    -> PostgresConnector (class): Class that manages the connection to a Postgres database
+    -> AsyncPostgresConnector (class): Class that runs queries on a Postgres database from an asyncio event loop, using the asynchronous mode of psycopg2,
+    so that many independent queries are in flight at the same time on a few connections
 
     --------------------
     Attributes
@@ -18,27 +2443,87 @@ class PostgresConnector:
     -> password (str): Password used for connecting to Postgres database (mandatory)
     -> host (str): URL of Postgres database (mandatory)
     -> port (str): Port number of Postgres database (mandatory)
-    -> conn (psycopg2._psycopg.connection): Postgres connection object (optional)
-    -> cursor (psycopg2._psycopg.connection.cursor): Postgres cursor for executing query (optional)
-    -> excluded_schemas (list): List containing the names of internal Postgres schemas to be excluded from selection (information_schema, pg_catalog)
+    -> max_connections (int): Maximum number of queries in flight, each on its own connection (optional)
+    -> use_cache (bool): Whether run_query() goes through the process-wide query cache (optional)
+    -> pool (ConnectionPool): Connection pool whose maxconn also bounds the asynchronous connections, each one taking a slot of the pool while it is open (optional)
+    -> idle (list): Open connections waiting for a query
+    -> n_open (int): Number of connections opened and not closed
+    -> loop (asyncio.AbstractEventLoop): Event loop the semaphore belongs to
+    -> semaphore (asyncio.Semaphore): Semaphore limiting the number of queries in flight to max_connections
+    -> excluded_schemas (list): List containing the names of internal Postgres schemas (information_schema, pg_catalog)
+    -> fingerprints (dict): Fingerprints of the tables read by get_cache_key(), with the time they were read, reused for FINGERPRINT_TTL seconds
     """
-    def __init__(self, database="postgres", user='postgres', password='password', host='127.0.0.1', port='5432'):
+    def __init__(self, database="postgres", user='postgres', password='password', host='127.0.0.1', port='5432', max_connections=ASYNC_MAX_CONNECTIONS, use_cache=False, pool=None):
         self.database = database
         self.user = user
         self.password = password
         self.host = host
         self.port = port
-        self.conn = None
-        self.cursor = None
+        self.max_connections = max(max_connections, 1)
+        self.use_cache = use_cache
+        self.pool = pool
+        self.idle = []
+        self.n_open = 0
+        self.loop = None
+        self.semaphore = None
         self.excluded_schemas = ['information_schema', 'pg_catalog']
+        self.fingerprints = {}
 
-    
-    def open_connection(self):
+    async def wait(self, conn):
+        """
+        --------------------
+        Description
+        --------------------
+        -> wait (method): Class method that waits, without blocking the event loop, until the pending operation of an asynchronous connection is completed
+
+        --------------------
+        Parameters
+        --------------------
+        -> conn (psycopg2._psycopg.connection): Asynchronous connection.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Poll the connection. When it is ready, return.
+        -> When it needs to read from (or write to) the server, register its socket with the event loop and wait until the socket is ready, then poll again.
+        -> Errors of the operation (e.g. an invalid query) are raised by poll().
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            state = conn.poll()
+            if state == psycopg2.extensions.POLL_OK:
+                return
+            ready = loop.create_future()
+            def set_ready():
+                if not ready.done():
+                    ready.set_result(None)
+            if state == psycopg2.extensions.POLL_READ:
+                loop.add_reader(conn.fileno(), set_ready)
+                try:
+                    await ready
+                finally:
+                    loop.remove_reader(conn.fileno())
+            elif state == psycopg2.extensions.POLL_WRITE:
+                loop.add_writer(conn.fileno(), set_ready)
+                try:
+                    await ready
+                finally:
+                    loop.remove_writer(conn.fileno())
+            else:
+                raise psycopg2.OperationalError(f'Unexpected poll state: {state}')
+
+    async def new_connection(self):
         """
         --------------------
         Description
         --------------------
-        -> open_connection (method): Class method that creates an active connection to a Postgres database
+        -> new_connection (method): Class method that opens a new asynchronous connection to the Postgres database
 
         --------------------
         Parameters
@@ -48,76 +2533,86 @@ class PostgresConnector:
         --------------------
         Pseudo-Code
         --------------------
-        -> If there is any existing connection, close it. The self.conn is not None when the previous attempt to connect is successful.
-        -> Create a connection to database using menu's information such as username, password, host, port, database. 
-        -> Store the connection in the conn attribute.
-        -> If connection failed, a dictionary including status False and error message is returned.
-        -> Otherwise, a dictionary including status True and success message is returned.
+        -> If there is a connection pool, take one of its slots (ConnectionPool.reserve_slot()) so that the connections of the pool and the asynchronous ones never exceed maxconn.
+        Without blocking the event loop, try again every ASYNC_SLOT_RETRY_INTERVAL seconds while no slot is free, and raise a PoolError after the wait_timeout of the pool.
+        -> Open a connection in asynchronous mode and wait until it is established. Asynchronous connections are always in autocommit mode.
+        -> If it cannot be opened, give the slot back. Otherwise count it as open.
 
         --------------------
         Returns
         --------------------
-        -> (dict): A dictionary including status and message of the connection. 
+        -> (psycopg2._psycopg.connection): The new connection.
 
         """
-        if self.conn != None:
-            self.close_connection()
+        if self.pool is not None:
+            deadline = time.monotonic() + self.pool.wait_timeout
+            while not self.pool.reserve_slot():
+                if time.monotonic() >= deadline:
+                    raise psycopg2.pool.PoolError('connection pool exhausted')
+                await asyncio.sleep(ASYNC_SLOT_RETRY_INTERVAL)
         try:
-            self.conn = psycopg2.connect(
+            conn = psycopg2.connect(
+                database=self.database,
                 user=self.user,
                 password=self.password,
                 host=self.host,
                 port=self.port,
-                database=self.database
+                async_=1
             )
+            try:
+                await self.wait(conn)
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            if self.pool is not None:
+                self.pool.release_slot()
+            raise
+        self.n_open += 1
+        return conn
 
-        except psycopg2.OperationalError as e:
-            return { 'status': False, 'msg': f'Connection to server at {self.host}, port {self.port} failed: {e}' }
-        else:
-            return { 'status': True, 'msg': 'Connection to database established' }
-
-    def close_connection(self):
+    def is_reusable(self, conn):
         """
         --------------------
         Description
         --------------------
-        -> close_connection (method): Class method that closes an active connection to a Postgres database
+        -> is_reusable (method): Class method that checks whether a connection can run the next query
 
         --------------------
         Parameters
         --------------------
-        No parameter
+        -> conn (psycopg2._psycopg.connection): Asynchronous connection.
 
         --------------------
         Pseudo-Code
         --------------------
-        -> Close the existing connection. 
+        -> A connection is reusable if it is open, not executing a query (e.g. one whose wait was cancelled) and ready.
 
         --------------------
         Returns
         --------------------
-        -> (None)
+        -> (bool): Whether the connection is reusable.
 
         """
-        self.conn.close()
+        return not conn.closed and not conn.isexecuting() and conn.status == psycopg2.extensions.STATUS_READY
 
-    def open_cursor(self):
+    def discard(self, conn):
         """
         --------------------
         Description
         --------------------
-        -> open_cursor (method): Class method that creates an active cursor to a Postgres database 
+        -> discard (method): Class method that closes a connection which will not be reused
 
         --------------------
         Parameters
         --------------------
-        No parameter
+        -> conn (psycopg2._psycopg.connection): Asynchronous connection.
 
         --------------------
         Pseudo-Code
         --------------------
-        -> Create a cursor from the existing connection object to execute a Postgres command. 
-        -> Store the cursor in cursor attribute. 
+        -> Close the connection, ignoring errors raised by an already broken connection, and stop counting it as open.
+        -> Give its slot back to the connection pool, if any.
 
         --------------------
         Returns
@@ -125,14 +2620,20 @@ class PostgresConnector:
         -> (None)
 
         """
-        self.cursor = self.conn.cursor()
-        
-    def close_cursor(self):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        self.n_open -= 1
+        if self.pool is not None:
+            self.pool.release_slot()
+
+    def get_semaphore(self):
         """
         --------------------
         Description
         --------------------
-        -> close_cursor (method): Class method that closes an active cursor to a Postgres database 
+        -> get_semaphore (method): Class method that returns the semaphore limiting the queries in flight for the running event loop
 
         --------------------
         Parameters
@@ -142,22 +2643,27 @@ class PostgresConnector:
         --------------------
         Pseudo-Code
         --------------------
-        -> Close the existing cursor. 
+        -> asyncio primitives belong to a single event loop, and every call from synchronous code (run_queries()) runs its own loop.
+        -> If the running loop is not the one of the current semaphore, create a new semaphore for it.
 
         --------------------
         Returns
         --------------------
-        -> (None)
+        -> (asyncio.Semaphore): The semaphore.
 
         """
-        self.cursor.close()
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self.semaphore = asyncio.Semaphore(self.max_connections)
+        return self.semaphore
 
-    def run_query(self, sql_query):
+    async def execute(self, sql_query):
         """
         --------------------
         Description
         --------------------
-        -> run_query (method): Class method that executes a SQL query and returns the result as a Pandas dataframe
+        -> execute (method): Class method that executes a SQL query on a free asynchronous connection and returns the result as a Pandas dataframe
 
         --------------------
         Parameters
@@ -167,17 +2673,15 @@ class PostgresConnector:
         --------------------
         Pseudo-Code
         --------------------
-        -> Create an active cursor to a Postgres using open_cursor()
-        -> Execute the sql_query.
-        -> There are two scenarios after running the query:
+        -> Wait until less than max_connections queries are in flight.
+        -> Take an idle connection, or open a new one.
+        -> Execute the query and wait for its result without blocking the event loop.
         If query is executed successfully:
-        -> Fetch all the rows returned by the execution using fetchall().
-        -> Get the list of column names.
-        -> Close the cursor. 
-        -> Return the result as a Pandas dataframe. 
-        Otherwise:
-        -> Close the cursor.
-        -> Return an empty Pandas dataframe.
+        -> Fetch all the rows, get the list of column names, close the cursor and return them as a Pandas dataframe.
+        Otherwise (psycopg2.OperationalError):
+        -> Return an empty Pandas dataframe, like PostgresConnector.run_query().
+        -> Put the connection back among the idle ones only if the query completed and the connection is still reusable (is_reusable()).
+        If the query failed or was cancelled (asyncio.CancelledError) midway, the connection may still be busy or in an error state, so close it (discard()).
 
         --------------------
         Returns
@@ -185,112 +2689,189 @@ class PostgresConnector:
         -> (pandas.DataFrame): The result of sql query as a Pandas dataframe.
 
         """
-        try:
-            self.open_cursor()
-            self.cursor.execute(sql_query)
-        except psycopg2.OperationalError as e:
-            self.close_cursor()
-            return pd.DataFrame([], columns=[])
-        else:
-            raw_results = self.cursor.fetchall()
-            col_names = [desc[0] for desc in self.cursor.description]
-            self.close_cursor()
-            return pd.DataFrame(raw_results, columns=col_names)
+        async with self.get_semaphore():
+            conn = self.idle.pop() if self.idle else await self.new_connection()
+            completed = False
+            try:
+                cursor = conn.cursor()
+                cursor.execute(sql_query)
+                await self.wait(conn)
+                raw_results = cursor.fetchall()
+                col_names = [desc[0] for desc in cursor.description]
+                cursor.close()
+                completed = True
+                return pd.DataFrame(raw_results, columns=col_names)
+            except psycopg2.OperationalError as e:
+                return pd.DataFrame([], columns=[])
+            finally:
+                if completed and self.is_reusable(conn):
+                    self.idle.append(conn)
+                else:
+                    self.discard(conn)
 
-    def list_tables(self):
+    async def get_cache_key(self, sql_query):
         """
         --------------------
         Description
         --------------------
-        -> list_tables (method): Class method that extracts the list of available tables using a SQL query (get_tables_list_query())
+        -> get_cache_key (method): Class method that builds the key identifying the result of a query in the query cache, like PostgresConnector.get_cache_key()
 
         --------------------
         Parameters
         --------------------
-        No parameter
+        -> sql_query (str): The sql command that will be executed.
 
         --------------------
         Pseudo-Code
         --------------------
-        -> Call get_tables_list_query() to get the query that extracts all schemas and their tables.
-        -> Execute the query. 
-        -> Return the result. 
+        -> Find the user tables read by the query (get_query_tables()). If they are unknown, return None: the result must not be cached.
+        -> If there are any, reuse their fingerprint if it was read less than FINGERPRINT_TTL seconds ago, or read it asynchronously (get_tables_fingerprint_query()). If some tables have no counters, return None: the result must not be cached.
+        -> Otherwise, combine the database, the user, the normalised query and the fingerprint.
 
         --------------------
         Returns
         --------------------
-        -> (pandas.DataFrame): The list of schemas and their tables as a Pandas dataframe. 
+        -> (tuple): The cache key, or None.
 
         """
-        return self.run_query(get_tables_list_query())
+        tables = get_query_tables(sql_query, self.excluded_schemas)
+        if tables is None:
+            return None
+        fingerprint = ()
+        if tables:
+            now = time.monotonic()
+            cached = self.fingerprints.get(tuple(tables))
+            if cached is not None and now - cached[0] < FINGERPRINT_TTL:
+                fingerprint = cached[1]
+            else:
+                df = await self.execute(get_tables_fingerprint_query(tables))
+                fingerprint = None
+                if df.shape[0] >= len(tables):
+                    fingerprint = tuple(tuple(row) for row in df.astype(str).values.tolist())
+                self.fingerprints[tuple(tables)] = (now, fingerprint)
+            if fingerprint is None:
+                return None
+        return (self.host, self.port, self.database, self.user, normalize_query(sql_query), fingerprint)
 
-    def load_table(self, schema_name, table_name):
+    async def run_query(self, sql_query, use_cache=True):
         """
         --------------------
         Description
         --------------------
-        -> load_table (method): Class method that load the content of a table using a SQL query (get_table_data_query())
+        -> run_query (method): Coroutine that executes a SQL query and returns the result as a Pandas dataframe
 
         --------------------
         Parameters
         --------------------
-        -> schema_name (str): Name of the selected schema.
-        -> table_name  (str): Name of the selected table.
+        -> sql_query (str): The sql command that will be executed.
+        -> use_cache (bool): Whether the result may be read from and stored in the query cache, when the connector uses it (default: True).
 
         --------------------
         Pseudo-Code
         --------------------
-        -> Call get_table_data_query() to get the query that extracts content of the Postgres table.
-        -> Execute the query. 
-        -> Return the result.
+        -> If the connector and the call use the cache, build the cache key (get_cache_key()) and return the cached result if there is one.
+        -> Otherwise, execute the query (execute()) and store a non-empty result in the cache under its key, if any.
 
         --------------------
         Returns
         --------------------
-        -> (pandas.DataFrame): The content of the selected table. 
+        -> (pandas.DataFrame): The result of sql query as a Pandas dataframe.
 
         """
-        return self.run_query(get_table_data_query(schema_name, table_name))
+        cache_key = None
+        if self.use_cache and use_cache:
+            cache_key = await self.get_cache_key(sql_query)
+            if cache_key is not None:
+                result = query_cache.get(cache_key)
+                if result is not None:
+                    return result
+        result = await self.execute(sql_query)
+        if cache_key is not None and len(result.columns) > 0:
+            query_cache.put(cache_key, result)
+        return result
 
-    def get_table_schema(self, schema_name, table_name):
+    async def gather_queries(self, sql_queries):
         """
         --------------------
         Description
         --------------------
-        -> get_table_schema (method): Class method that extracts the schema information of a table using a SQL query (get_table_schema_query())
+        -> gather_queries (method): Coroutine that executes several SQL queries at the same time and returns their results in the same order
 
         --------------------
         Parameters
         --------------------
-        -> schema_name (str): Name of the selected schema.
-        -> table_name  (str): Name of the selected table.
+        -> sql_queries (list): The sql commands that will be executed.
 
         --------------------
         Pseudo-Code
         --------------------
-        -> Call get_table_schema_query() to get the query that extracts the schema information of the selected table.
-        -> Execute the query. 
-        -> Return the result.
+        -> Start run_query() for every query and wait for all of them with asyncio.gather(). At most max_connections queries are in flight at any time.
 
         --------------------
         Returns
         --------------------
-        -> (pandas.DataFrame): Schema information of the selected table.
+        -> (list): The result of each query as a Pandas dataframe.
 
         """
-        df = self.run_query(get_table_schema_query(schema_name, table_name))
-        df = df[['table_name', 'column_name', 'data_type', 'is_nullable','character_maximum_length', 'numeric_precision', 'datetime_precision']]
-        df3 = self.run_query(get_primary_key(schema_name, table_name))
-        df3['primary_key'] = 'YES'
-        df = pd.merge(df, df3, on='column_name', how='left')
-        for i in range(df.shape[0]):
-            if df.loc[i,'primary_key'] == 'YES':
-                df.loc[i, 'primary_key'] = True
-            else:
-                df.loc[i, 'primary_key'] = False
-        for i in range(df.shape[0]):
-            if df.loc[i, 'is_nullable'] == 'YES':
-                df.loc[i, 'is_nullable'] = True
-            else:
-                df.loc[i, 'is_nullable'] = False
-        return df 
+        return list(await asyncio.gather(*[self.run_query(sql_query) for sql_query in sql_queries]))
+
+    def run_queries(self, sql_queries):
+        """
+        --------------------
+        Description
+        --------------------
+        -> run_queries (method): Class method that executes several SQL queries at the same time from synchronous code (e.g. a Streamlit script)
+
+        --------------------
+        Parameters
+        --------------------
+        -> sql_queries (list): The sql commands that will be executed.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> If no event loop is running in this thread, run gather_queries() in a new event loop.
+        -> Otherwise, the loop cannot be blocked on, so run the new event loop in a separate thread and wait for it.
+        -> Close the idle connections afterwards (close_connection()), so that their slots go back to the connection pool for the synchronous queries.
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): The result of each query as a Pandas dataframe.
+
+        """
+        try:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.gather_queries(sql_queries))
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return executor.submit(asyncio.run, self.gather_queries(sql_queries)).result()
+        finally:
+            self.close_connection()
+
+    def close_connection(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> close_connection (method): Class method that closes every idle asynchronous connection
+
+        --------------------
+        Parameters
+        --------------------
+        No parameter
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Close the idle connections (discard()) and forget them.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        while self.idle:
+            self.discard(self.idle.pop())
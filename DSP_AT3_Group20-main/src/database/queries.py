@@ -23,7 +23,7 @@ def get_tables_list_query():
     """
 	return "SELECT table_schema, table_name FROM information_schema.tables WHERE table_schema not in ('information_schema', 'pg_catalog')"
 
-def get_table_data_query(schema_name, table_name):
+def get_table_data_query(schema_name, table_name, sampling=None, columns=None, order_by=None):
 	"""
     --------------------
     Description
@@ -35,11 +35,18 @@ def get_table_data_query(schema_name, table_name):
     --------------------
     -> schema_name (str): Name of the selected schema.
     -> table_name  (str): Name of the selected table.
+    -> sampling (dict): Optional sampling of the rows with the keys 'method' ('SYSTEM', 'BERNOULLI' or None), 'percent' (float), 'seed' (int or None) and 'limit' (int or None).
+    -> columns (list): Optional names of the columns to extract, all columns are extracted otherwise.
+    -> order_by (list): Optional names of the columns (or ctid) the rows are sorted by, so that several queries return the rows in the same order.
 
     --------------------
     Pseudo-Code
     --------------------
-    -> Return the query that extracts the content of the selected table.
+    -> Build the query that extracts the content of the selected table, or only the requested columns.
+    -> If a SYSTEM or BERNOULLI sampling method is requested, add a TABLESAMPLE clause with the requested percentage of rows, made repeatable if a seed is provided.
+    -> If an order is requested, add an ORDER BY clause.
+    -> If a row cap is requested, add a LIMIT clause.
+    -> Return the query.
 
     --------------------
     Returns
@@ -47,7 +54,43 @@ def get_table_data_query(schema_name, table_name):
     -> (str): The query that extracts the content of the selected table.
 
     """
-	return f'SELECT * FROM {schema_name}.{table_name}'
+	select = ', '.join(f'"{col}"' for col in columns) if columns is not None else '*'
+	query = f'SELECT {select} FROM {schema_name}.{table_name}'
+	if sampling is not None and sampling.get('method') in ('SYSTEM', 'BERNOULLI'):
+		query += f" TABLESAMPLE {sampling['method']} ({sampling['percent']})"
+		if sampling.get('seed') is not None:
+			query += f" REPEATABLE ({sampling['seed']})"
+	if order_by:
+		query += ' ORDER BY ' + ', '.join(col if col == 'ctid' else f'"{col}"' for col in order_by)
+	if sampling is not None and sampling.get('limit'):
+		query += f" LIMIT {sampling['limit']}"
+	return query
+
+def get_table_count_query(schema_name, table_name):
+	"""
+    --------------------
+    Description
+    --------------------
+    -> get_table_count_query (method): Function that returns the query used for counting the rows of a Postgres table
+
+    --------------------
+    Parameters
+    --------------------
+    -> schema_name (str): Name of the selected schema.
+    -> table_name  (str): Name of the selected table.
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Return the query that counts the rows of the selected table.
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): The query that counts the rows of the selected table.
+
+    """
+	return f'SELECT count(*) FROM {schema_name}.{table_name}'
 
 def get_table_schema_query(schema_name, table_name):
 	"""
@@ -74,3 +117,190 @@ def get_table_schema_query(schema_name, table_name):
 
     """
 	return f"SELECT * FROM information_schema.columns WHERE table_schema = '{schema_name}' and table_name = '{table_name}'"
+
+def get_copy_query(sql_query):
+	"""
+    --------------------
+    Description
+    --------------------
+    -> get_copy_query (method): Function that returns the query used for exporting the result of a query as CSV through COPY
+
+    --------------------
+    Parameters
+    --------------------
+    -> sql_query (str): The query whose result is exported.
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Return the COPY command that writes the result of sql_query to STDOUT as CSV with a header.
+    -> NULL is written as \\N so that it can be told apart from empty strings.
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): The COPY command exporting the result of sql_query.
+
+    """
+	return f"COPY ({sql_query}) TO STDOUT WITH (FORMAT csv, HEADER true, NULL '\\N')"
+
+def get_result_types_query(sql_query):
+	"""
+    --------------------
+    Description
+    --------------------
+    -> get_result_types_query (method): Function that returns the query used for getting the columns and types of the result of a query without reading any row
+
+    --------------------
+    Parameters
+    --------------------
+    -> sql_query (str): The query whose result columns are described.
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Return the query that wraps sql_query in a subquery limited to 0 rows.
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): The query returning no row but the columns of sql_query.
+
+    """
+	return f"SELECT * FROM ({sql_query}) AS result_types LIMIT 0"
+
+def get_table_stats_query(schema_name, table_name):
+	"""
+    --------------------
+    Description
+    --------------------
+    -> get_table_stats_query (method): Function that returns the query used for reading the statistics Postgres keeps about a table (estimated number of rows and activity since the last ANALYZE)
+
+    --------------------
+    Parameters
+    --------------------
+    -> schema_name (str): Name of the selected schema.
+    -> table_name  (str): Name of the selected table.
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Return the query that reads reltuples from pg_class and the live rows, modifications since the last ANALYZE and date of the last (manual or automatic) ANALYZE from pg_stat_user_tables.
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): The query that reads the catalog statistics of the selected table.
+
+    """
+	return f"SELECT c.reltuples, s.n_live_tup, s.n_mod_since_analyze, greatest(s.last_analyze, s.last_autoanalyze) AS last_analyze FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid WHERE n.nspname = '{schema_name}' AND c.relname = '{table_name}'"
+
+def get_column_stats_query(schema_name, table_name):
+	"""
+    --------------------
+    Description
+    --------------------
+    -> get_column_stats_query (method): Function that returns the query used for reading the statistics gathered by ANALYZE on each column of a Postgres table
+
+    --------------------
+    Parameters
+    --------------------
+    -> schema_name (str): Name of the selected schema.
+    -> table_name  (str): Name of the selected table.
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Return the query that reads, for every column in table order, the fraction of nulls, the number of distinct values, the most common values with their frequencies and the histogram bounds from pg_stats (the anyarray columns are converted to text arrays).
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): The query that reads the column statistics of the selected table.
+
+    """
+	return f"SELECT a.attname AS column_name, s.null_frac, s.n_distinct, s.most_common_vals::text::text[] AS top_values, s.most_common_freqs AS top_freqs, s.histogram_bounds::text::text[] AS histogram_bounds FROM pg_attribute a JOIN pg_class c ON c.oid = a.attrelid JOIN pg_namespace n ON n.oid = c.relnamespace LEFT JOIN pg_stats s ON s.schemaname = n.nspname AND s.tablename = c.relname AND s.attname = a.attname WHERE n.nspname = '{schema_name}' AND c.relname = '{table_name}' AND a.attnum > 0 AND NOT a.attisdropped ORDER BY a.attnum"
+
+def get_analyze_query(schema_name, table_name):
+	"""
+    --------------------
+    Description
+    --------------------
+    -> get_analyze_query (method): Function that returns the command used for refreshing the statistics of a Postgres table
+
+    --------------------
+    Parameters
+    --------------------
+    -> schema_name (str): Name of the selected schema.
+    -> table_name  (str): Name of the selected table.
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Return the ANALYZE command of the selected table.
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): The ANALYZE command of the selected table.
+
+    """
+	return f'ANALYZE {schema_name}.{table_name}'
+
+def get_tables_fingerprint_query(tables):
+	"""
+    --------------------
+    Description
+    --------------------
+    -> get_tables_fingerprint_query (method): Function that returns the query used for reading the counters that change whenever the content of Postgres tables changes
+
+    --------------------
+    Parameters
+    --------------------
+    -> tables (list): List of (schema name, table name) pairs.
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Return the query that reads, for every table, the number of inserted, updated and deleted rows and the dates of the last vacuum and analyze from pg_stat_user_tables,
+    together with the storage file of the table from pg_class (it changes on TRUNCATE, which does not update the counters). The rows are sorted so the result is stable.
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): The query that reads the fingerprint of the tables.
+
+    """
+	in_list = ', '.join("('{}', '{}')".format(schema_name.replace("'", "''"), table_name.replace("'", "''")) for schema_name, table_name in tables)
+	return f"SELECT s.schemaname, s.relname, c.relfilenode, s.n_tup_ins, s.n_tup_upd, s.n_tup_del, s.last_vacuum, s.last_autovacuum, s.last_analyze, s.last_autoanalyze FROM pg_stat_user_tables s JOIN pg_class c ON c.oid = s.relid WHERE (s.schemaname, s.relname) IN ({in_list}) ORDER BY s.schemaname, s.relname"
+
+def get_catalog_metadata_query(schema_name=None):
+	"""
+    --------------------
+    Description
+    --------------------
+    -> get_catalog_metadata_query (method): Function that returns the query used for extracting, from pg_catalog, the tables of a schema (or of all schemas) and the information of their columns
+
+    --------------------
+    Parameters
+    --------------------
+    -> schema_name (str): Name of the selected schema. If None, the tables of all schemas are extracted (default: None).
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Return the query that reads, for every table and view the user can select from, outside the internal Postgres schemas:
+    - the estimated number of rows (reltuples, NULL if the table has never been analysed) and size (relpages) from pg_class,
+    - the kind of relation (r for tables, p for partitioned tables, v for views, f for foreign tables),
+    - every column with its type and type category (pg_type), nullability and membership of (and position in) the primary key (pg_index),
+    - the length and precision of the columns, computed with the same functions as the information_schema views.
+    -> Tables without columns are kept with NULL column information. The rows are sorted by schema, table and column position.
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): The query that extracts the tables and the information of their columns.
+
+    """
+	schema_filter = f" AND n.nspname = '{schema_name}'" if schema_name is not None else ''
+	return f"SELECT n.nspname AS table_schema, c.relname AS table_name, c.relkind AS table_kind, CASE WHEN c.reltuples < 0 THEN NULL ELSE c.reltuples::bigint END AS n_rows_estimate, c.relpages::bigint * current_setting('block_size')::bigint AS size_estimate, a.attnum AS ordinal_position, a.attname AS column_name, format_type(a.atttypid, NULL) AS data_type, t.typcategory AS type_category, NOT a.attnotnull AS is_nullable, information_schema._pg_char_max_length(a.atttypid, a.atttypmod) AS character_maximum_length, information_schema._pg_numeric_precision(a.atttypid, a.atttypmod) AS numeric_precision, information_schema._pg_datetime_precision(a.atttypid, a.atttypmod) AS datetime_precision, coalesce(a.attnum = ANY(i.indkey), false) AS primary_key, array_position(i.indkey::int2[], a.attnum) AS primary_key_position FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace LEFT JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped LEFT JOIN pg_type t ON t.oid = a.atttypid LEFT JOIN pg_index i ON i.indrelid = c.oid AND i.indisprimary WHERE c.relkind IN ('r', 'p', 'v', 'f') AND n.nspname NOT IN ('information_schema', 'pg_catalog') AND n.nspname NOT LIKE 'pg_toast%' AND n.nspname NOT LIKE 'pg_temp%' AND has_table_privilege(c.oid, 'SELECT'){schema_filter} ORDER BY n.nspname, c.relname, a.attnum"
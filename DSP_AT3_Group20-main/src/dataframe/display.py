@@ -1,5 +1,7 @@
 import streamlit as st
-from src.dataframe.logics import Dataset
+import altair as alt
+from src.dataframe.logics import Dataset, SAMPLING_METHODS
+from src.profiling.logics import ProfilingExecutor
 
 
 def read_data():
@@ -18,7 +20,10 @@ def read_data():
     Pseudo-Code
     --------------------
     create variables to store session_state value 
-    create dataset class and store in session_state
+    cancel the pages prefetched for the dataset being replaced
+    if the instant profile is selected, create a dataset class profiled from the catalog statistics only (the table is not loaded) and store in session_state
+    otherwise get the sampling options selected by the user
+    create dataset class and store in session_state, its columns are loaded (or a sample of their rows) only when a tab needs them
 
     --------------------
     Returns
@@ -27,13 +32,184 @@ def read_data():
     """
     postgresConnector = st.session_state.db
 
+    if st.session_state.get('data') is not None:
+        st.session_state.data.cancel_prefetch()
+
     schema_name = st.session_state.schema_selected
 
     table_name = st.session_state.table_selected
 
-    table_content = postgresConnector.load_table(schema_name, table_name)
+    if st.session_state.get('instant_profile', False):
+        st.session_state.data = Dataset(schema_name, table_name, postgresConnector, instant=True)
+        return
+
+    sampling = get_sampling()
+
+    st.session_state.data = Dataset(schema_name, table_name, postgresConnector, sampling=sampling)
+
+def get_sampling():
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_sampling (function): Function that builds the sampling configuration from the sampling options of the session_state
+
+    --------------------
+    Parameters
+    --------------------
+    None
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    read the sampling method, percentage, seed and row cap from session_state (the full table is loaded when the options have never been displayed)
+    return None if neither a TABLESAMPLE method nor a row cap is selected
+    otherwise return the sampling configuration
+
+    --------------------
+    Returns
+    --------------------
+    (dict): The sampling configuration expected by get_table_data_query(), or None
+    """
+    method = st.session_state.get('sample_method', 'Full table')
+    limit = st.session_state.get('sample_limit', 0)
+    if method not in SAMPLING_METHODS and not limit:
+        return None
+    return {
+        'method': method if method in SAMPLING_METHODS else None,
+        'percent': st.session_state.get('sample_percent', 10.0),
+        'seed': st.session_state.get('sample_seed', None),
+        'limit': limit
+    }
+
+def display_sample_caption():
+    """
+    --------------------
+    Description
+    --------------------
+    -> display_sample_caption (function): Function that warns the user when the loaded table is only a sample
+
+    --------------------
+    Parameters
+    --------------------
+    None
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    if the dataset is a sample, display a caption explaining the Basis column of the summary tables
+
+    --------------------
+    Returns
+    --------------------
+    None
+    """
+    if st.session_state.data.is_sample:
+        st.caption('Only a sample of the table is loaded: metrics computed in SQL on the whole table are labelled Exact, the others are Estimated from sample.')
+
+def display_column_toggle(kind, col_name):
+    """
+    --------------------
+    Description
+    --------------------
+    -> display_column_toggle (function): Function that displays a checkbox for opening the profile of a column, so that the profile is only computed once the user opens it
+
+    --------------------
+    Parameters
+    --------------------
+    kind(str): 'numeric', 'text' or 'date', the section of the column
+    col_name(str): The name of the column
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    display a checkbox labelled with the column name, with a key specific to the section and the selected table
+
+    --------------------
+    Returns
+    --------------------
+    (bool): Whether the profile of the column is opened
+    """
+    return st.checkbox(col_name, key=f'{kind}_{st.session_state.schema_selected}.{st.session_state.table_selected}.{col_name}')
+
+def get_profiling_executor():
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_profiling_executor (function): Function that returns the ProfilingExecutor of the session, so that it is not instantiated again on every rerun
+
+    --------------------
+    Parameters
+    --------------------
+    None
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    if the session has no executor yet, or if its executor runs the queries of another connection, instantiate a ProfilingExecutor class for the current connection and store it in session_state
+    return the executor of the session
+
+    --------------------
+    Returns
+    --------------------
+    (ProfilingExecutor): The executor of the session
+    """
+    executor = st.session_state.get('profiling_executor')
+    if executor is None or executor.db is not st.session_state.db:
+        executor = ProfilingExecutor(st.session_state.db)
+        st.session_state.profiling_executor = executor
+    return executor
 
-    st.session_state.data = Dataset(schema_name, table_name, postgresConnector, table_content)
+def display_column_toggles(kind, col_names, new_column, get_profiles, dependency):
+    """
+    --------------------
+    Description
+    --------------------
+    -> display_column_toggles (function): Function that displays the checkbox of every column of a section and profiles all the newly opened columns at once
+
+    --------------------
+    Parameters
+    --------------------
+    kind(str): 'numeric', 'text' or 'date', the section of the columns
+    col_names(list): The names of the columns of the section
+    new_column(function): Function instantiating the column class (NumericColumn, TextColumn or DateColumn) of a column name
+    get_profiles(function): Function computing the fused profile of all the columns of the section with an executor
+    dependency(str): The metric of the dataset class listing the columns of the section (e.g. 'set_numeric_columns')
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    display the checkbox of every column in its own container, in the order of the columns, so that the profile of a column is displayed right below its checkbox
+    register every opened column in the dataset class (self.metrics), its profile depending on the columns of the section
+    if some opened columns are not profiled yet, compute the fused profile of the section once (memoised in the dataset class) and profile all of them with a single call to the executor of the session (profile_columns()), run concurrently
+    store each profiled column in the dataset class, so that it is reused on the following reruns
+
+    --------------------
+    Returns
+    --------------------
+    (list): The (column name, container, profiled column class) of every opened column
+    """
+    data = st.session_state.data
+    executor = get_profiling_executor()
+    opened = []
+    for col_name in col_names:
+        container = st.container()
+        with container:
+            if display_column_toggle(kind, col_name):
+                opened.append((col_name, container))
+    if not opened:
+        return []
+    get_section_profiles = lambda: data.get_memoised(('profiles', kind), lambda: get_profiles(executor), (dependency,))
+    for col_name, _ in opened:
+        if (kind, col_name) not in data.metrics.funcs:
+            data.metrics.add((kind, col_name), lambda col_name=col_name: executor.profile_columns([new_column(col_name)], get_section_profiles())[0], (dependency,))
+    pending = [col_name for col_name, _ in opened if data.metrics.is_dirty((kind, col_name))]
+    if pending:
+        columns = executor.profile_columns([new_column(col_name) for col_name in pending], get_section_profiles())
+        for col_name, column in zip(pending, columns):
+            data.metrics.set((kind, col_name), column)
+    return [(col_name, container, data.metrics.get((kind, col_name))) for col_name, container in opened]
       
 
 def display_overall():
@@ -51,7 +227,8 @@ def display_overall():
     --------------------
     Pseudo-Code
     --------------------
-    call set_data method of dataset class
+    call set_data method of dataset class, which only computes the metrics not computed yet for the loaded table
+    display a caption if the dataset is a sample
     create title for overall table 
     call get_summary_df method of dataset class
     create title for overall dataframe
@@ -63,11 +240,66 @@ def display_overall():
 
     """
     st.session_state.data.set_data()
+    display_sample_caption()
     st.text('Overall Information')
     st.table(st.session_state.data.get_summary_df())
     st.text('Table Schema:')
     st.dataframe(st.session_state.db.get_table_schema(st.session_state.schema_selected, st.session_state.table_selected))
 
+def display_instant_profile():
+    """
+    --------------------
+    Description
+    --------------------
+    -> display_instant_profile (function): Function that displays the profile of the selected table computed from the Postgres catalog statistics only
+
+    --------------------
+    Parameters
+    --------------------
+    None
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    call set_instant_profile method of dataset class
+    warn the user if the statistics are stale and display a button for refreshing them with ANALYZE
+    create title for overall table and display the catalog statistics of the table
+    create title for columns table and display the catalog statistics of each column
+    for each column, display its most common values and its histogram in an expander
+
+    --------------------
+    Returns
+    --------------------
+    None
+
+    """
+    data = st.session_state.data
+    if st.button('Run ANALYZE', key='run_analyze'):
+        result = st.session_state.db.analyze_table(data.schema_name, data.table_name)
+        if result['status']:
+            st.success(result['msg'])
+        else:
+            st.error(result['msg'])
+    data.set_instant_profile()
+    if data.is_stale:
+        st.warning('The statistics of this table are missing or outdated, run ANALYZE to refresh them.')
+    st.text('Overall Information (from catalog statistics)')
+    st.table(data.get_instant_summary_df())
+    st.text('Columns (from catalog statistics)')
+    st.dataframe(data.get_instant_columns_df())
+    for col_name in data.column_stats['column_name']:
+        with st.expander(col_name, expanded=False):
+            st.text('Most Common Values')
+            st.dataframe(data.get_top_values(col_name))
+            histogram = data.get_histogram(col_name)
+            if not histogram.empty:
+                st.text('Histogram')
+                histogram['bucket'] = histogram['lower'] + ' - ' + histogram['upper']
+                st.altair_chart(alt.Chart(histogram).mark_bar().encode(
+                    x = alt.X('bucket', title=col_name, sort=None),
+                    y = alt.Y('fraction', title='Share of Rows')
+                ))
+
 def display_dataframes():
     """
     --------------------
@@ -86,7 +318,10 @@ def display_dataframes():
     create title for explore part of the app 
     create slider 
     create radio 
-    if statement to call relevant method in the dataset class
+    for Head and Tail, read the first or last page of rows from Postgres when the method or the number of rows changed, otherwise keep the current page
+    display Previous/Next buttons reading the adjacent pages with keyset cursors, and the page number
+    for Sample, read random rows from Postgres
+    only the displayed rows are read, whatever the size of the table
 
     --------------------
     Returns
@@ -96,17 +331,19 @@ def display_dataframes():
     """
     st.text('Explore Dataframe')
 
+    data = st.session_state.data
     n = st.slider('Select the number of rows to be displayed',5, 50, 5)
     method = st.radio('Exploration Method', ('Head', 'Tail', 'Sample'))
-    if method == 'Head':
-        st.write('Top Rows of Selected Table')
-        st.dataframe(st.session_state.data.get_head(n))
-    elif method == 'Tail':
-        st.write('Bottom Rows of Selected Table')
-        st.dataframe(st.session_state.data.get_tail(n))
-    else:
+    if method == 'Sample':
         st.write('Random Sample Rows of Selected Table')
-        st.dataframe(st.session_state.data.get_sample(n))
-    
-    
-
+        st.dataframe(data.get_sample(n))
+        return
+    if data.page is None or data.page_mode != method or data.page_size != n:
+        data.cancel_prefetch()
+        data.get_head(n) if method == 'Head' else data.get_tail(n)
+    st.write('Top Rows of Selected Table' if method == 'Head' else 'Bottom Rows of Selected Table')
+    previous_col, next_col, number_col = st.columns([1, 1, 4])
+    previous_col.button('Previous page', key='explore_previous', on_click=data.get_previous_page)
+    next_col.button('Next page', key='explore_next', on_click=data.get_next_page)
+    number_col.caption(f'Page {data.page_number}' if method == 'Head' else f'Page {data.page_number} from the end')
+    st.dataframe(data.page)
@@ -1,7 +1,134 @@
-from numpy import shape
+from numpy import shape, where
+import os
+import random
 import pandas as pd
-from itertools import chain
-from src.dataframe.queries import get_numeric_tables_query, get_text_tables_query, get_date_tables_query, get_primary_key
+from concurrent.futures import ThreadPoolExecutor
+from src.dataframe.queries import get_page_query, get_offset_page_query, get_random_rows_query
+from src.database.queries import get_table_count_query
+from src.profiling.logics import MetricGraph
+
+SAMPLING_METHODS = ('SYSTEM', 'BERNOULLI')
+# Rows drawn with TABLESAMPLE for each random row displayed in the Explore tab, so that enough rows are drawn despite the randomness of the sample
+SAMPLE_OVERSAMPLING = 3
+PREFETCH_WORKERS = int(os.environ.get('PREFETCH_WORKERS', 2))
+
+# Background threads reading the pages in advance, shared by the datasets of every session so that replaced datasets do not leave threads behind
+prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='prefetch')
+
+def is_sampling(sampling):
+    """
+    --------------------
+    Description
+    --------------------
+    -> is_sampling (function): Function that checks if a sampling configuration loads only a part of a table
+
+    --------------------
+    Parameters
+    --------------------
+    sampling(dict): Sampling configuration with the keys 'method', 'percent', 'seed' and 'limit' (see get_table_data_query())
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Return True if a TABLESAMPLE method or a row cap is requested, False otherwise
+
+    --------------------
+    Returns
+    --------------------
+    (bool): Whether the loaded rows are a sample of the table
+
+    """
+    if sampling is None:
+        return False
+    return sampling.get('method') in SAMPLING_METHODS or bool(sampling.get('limit'))
+
+def set_metrics_basis(summary_df, exact_metrics):
+    """
+    --------------------
+    Description
+    --------------------
+    -> set_metrics_basis (function): Function that labels each metric of a summary dataframe as exact or estimated from a sample
+
+    --------------------
+    Parameters
+    --------------------
+    summary_df(dataframe): Summary dataframe with the columns Description and Value
+    exact_metrics(list): Descriptions of the metrics computed in SQL on the whole table
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Add a Basis column which is 'Exact' for the metrics in exact_metrics and 'Estimated from sample' for the others
+
+    --------------------
+    Returns
+    --------------------
+    (dataframe): The summary dataframe with the Basis column
+
+    """
+    summary_df['Basis'] = where(summary_df['Description'].isin(exact_metrics), 'Exact', 'Estimated from sample')
+    return summary_df
+
+
+def get_column_profiles(db, sql_query, col_names, metrics):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_column_profiles (function): Function that runs a fused profile query and splits its single row into one profile per column
+
+    --------------------
+    Parameters
+    --------------------
+    db(PostgresConnector): Instantation of PostgresConnector class for handling Postgres connection
+    sql_query(str): Profile query aliasing each aggregate as <metric>_<position of the column>
+    col_names(list): The names of the profiled columns, in the order used by the query
+    metrics(iterable): The names of the metrics computed for each column
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Return an empty dictionary if there is no column
+    Run the query once and split its single row (split_column_profiles())
+
+    --------------------
+    Returns
+    --------------------
+    (dict): Profile of each column, as a dictionary of metric values keyed by metric name
+
+    """
+    if not col_names:
+        return {}
+    return split_column_profiles(db.run_query(sql_query), col_names, metrics)
+
+def split_column_profiles(df, col_names, metrics):
+    """
+    --------------------
+    Description
+    --------------------
+    -> split_column_profiles (function): Function that splits the single row returned by a fused profile query into one profile per column
+
+    --------------------
+    Parameters
+    --------------------
+    df(pd.DataFrame): Result of a profile query aliasing each aggregate as <metric>_<position of the column>
+    col_names(list): The names of the profiled columns, in the order used by the query
+    metrics(iterable): The names of the metrics computed for each column
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Read the single row of the result (keeping the type of each value)
+    Group the values by column, using the position of the column in the aliases
+
+    --------------------
+    Returns
+    --------------------
+    (dict): Profile of each column, as a dictionary of metric values keyed by metric name
+
+    """
+    row = df.to_dict('records')[0]
+    return {col_name: {metric: row[f'{metric}_{i}'] for metric in metrics} for i, col_name in enumerate(col_names)}
 
 
 class Dataset:
@@ -17,7 +144,7 @@ class Dataset:
     -> schema_name (str): Name of the dataset schema (mandatory)
     -> table_name (str): Name of the dataset table (mandatory)
     -> db (PostgresConnector): Instantation of PostgresConnector class for handling Postgres connection (mandatory)
-    -> df (pd.Dataframe): Pandas dataframe where the table content has been loaded (mandatory)
+    -> df (pd.Dataframe): Pandas dataframe where the table content has been loaded, column by column when requested by load_columns() (optional)
     -> n_rows (int): Number of rows of dataset (optional)
     -> n_cols (int): Number of columns of dataset (optional)
     -> n_duplicates (int): Number of duplicated rows of dataset (optional)
@@ -25,12 +152,54 @@ class Dataset:
     -> num_cols (list): List of columns of numerical type (optional)
     -> text_cols (list): List of columns of text type (optional)
     -> date_cols (list): List of columns of datetime type (optional)
+    -> sampling (dict): Sampling configuration used for loading df (optional)
+    -> is_sample (bool): Whether df only contains a sample of the table rows (optional)
+    -> n_sample_rows (int): Number of rows of the sample loaded in df (optional)
+    -> exact_metrics (list): Descriptions of the metrics that are exact even when df is a sample
+    -> is_instant (bool): Whether the dataset is only profiled from the catalog statistics, without loading df (optional)
+    -> column_stats (pd.Dataframe): Statistics of each column read from pg_stats (optional)
+    -> last_analyze (datetime): Date of the last ANALYZE of the table (optional)
+    -> n_mod_since_analyze (int): Number of rows modified since the last ANALYZE of the table (optional)
+    -> is_stale (bool): Whether the catalog statistics are outdated (optional)
+    -> page_keys (list): Columns used for paginating the table with keyset cursors, empty when paginating with OFFSET (optional)
+    -> row_keys (pd.MultiIndex): Values of the page keys of each row of df, used for aligning the columns loaded later with the loaded rows (optional)
+    -> page (pd.Dataframe): Page of rows of the table displayed in the Explore section (optional)
+    -> page_mode (str): 'Head' or 'Tail', the end of the table the pagination started from (optional)
+    -> page_size (int): Number of rows of a page (optional)
+    -> page_number (int): Number of the current page, from the start of the pagination (optional)
+    -> page_first (tuple): Key values of the first row of the page, cursor of the previous page (optional)
+    -> page_last (tuple): Key values of the last row of the page, cursor of the next page (optional)
+    -> page_offset (int): Number of rows before the page, when paginating with OFFSET (optional)
+    -> prefetched (dict): Futures of the pages read in advance by prefetch_executor, by query and parameters
+    -> metrics (MetricGraph): Metrics, dtype conversions and column profiles computed so far, each computed once for the loaded content of the table ('df') and reused on the following reruns
     """
-    def __init__(self, schema_name=None, table_name=None, db=None, df=None):
+    exact_metrics = ['Name of Table', 'Number of Rows', 'Number of Sampled Rows', 'Number of Columns']
+    # Metrics computed through self.metrics, with the metrics (or 'df', the loaded content) they are computed from
+    metric_dependencies = {
+        'load_all_columns': ('df',),
+        'set_numeric_columns': ('df',),
+        'set_text_columns': ('df',),
+        'set_date_columns': ('df',),
+        'set_dimensions': ('load_all_columns',),
+        'set_duplicates': ('load_all_columns', 'set_numeric_columns', 'set_text_columns', 'set_date_columns'),
+        'set_missing': ('load_all_columns', 'set_numeric_columns', 'set_text_columns', 'set_date_columns')
+    }
+
+    def __init__(self, schema_name=None, table_name=None, db=None, df=None, sampling=None, instant=False):
         self.schema_name = schema_name
         self.table_name = table_name
         self.db = db
         self.df = df
+        if sampling is not None and sampling.get('method') in SAMPLING_METHODS and sampling.get('seed') is None:
+            sampling = dict(sampling, seed=random.randint(0, 2**31 - 1))
+        self.sampling = sampling
+        self.is_sample = is_sampling(sampling)
+        self.is_instant = instant
+        self.column_stats = None
+        self.last_analyze = None
+        self.n_mod_since_analyze = None
+        self.is_stale = None
+        self.n_sample_rows = None
         self.n_rows = None 
         self.n_cols = None
         self.n_duplicates = None
@@ -38,6 +207,17 @@ class Dataset:
         self.num_cols = None
         self.text_cols = None
         self.date_cols = None
+        self.page_keys = None
+        self.row_keys = None
+        self.page = None
+        self.page_mode = None
+        self.page_size = None
+        self.page_number = None
+        self.page_first = None
+        self.page_last = None
+        self.page_offset = 0
+        self.prefetched = {}
+        self.metrics = MetricGraph(self, self.metric_dependencies)
 
     def set_data(self):
         """
@@ -54,7 +234,34 @@ class Dataset:
         --------------------
         Pseudo-Code
         --------------------
-        Call relevant method of the class to set the attributes' values 
+        Load all the columns of the table, as the duplicated rows and missing values are computed on whole rows
+        Call relevant method of the class to set the attributes' values through self.metrics, so that each of them is only computed once for the loaded content
+
+        --------------------
+        Returns
+        --------------------
+        None
+
+        """
+        for name in ('load_all_columns', 'set_numeric_columns', 'set_text_columns', 'set_date_columns', 'set_dimensions', 'set_duplicates', 'set_missing'):
+            self.metrics.get(name)
+
+    def load_all_columns(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> load_all_columns (method): Class method that loads all the columns of the table which are not in self.df yet
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Get the names of all the columns of the table from the pg_catalog metadata of the connection and load them (load_columns())
 
         --------------------
         Returns
@@ -62,14 +269,64 @@ class Dataset:
         None
 
         """
-        self.set_numeric_columns()
-        self.set_text_columns()
-        self.set_date_columns()
-        self.set_dimensions()
-        self.set_duplicates()
-        self.set_missing()
-        self.set_text_columns()
-        
+        self.load_columns(self.db.get_table_columns(self.schema_name, self.table_name))
+
+    def get_metric(self, name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_metric (method): Class method that computes a metric of the dataset (one of metric_dependencies, e.g. 'set_numeric_columns') only if it has not been computed for the loaded content yet
+
+        --------------------
+        Parameters
+        --------------------
+        name(str): The name of the metric
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Get the metric from self.metrics, which calls the method with the same name only if the metric is dirty
+
+        --------------------
+        Returns
+        --------------------
+        The result of the metric
+
+        """
+        return self.metrics.get(name)
+
+    def get_memoised(self, key, func, dependencies=('df',)):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_memoised (method): Class method that computes a result the first time it is requested and returns the same result afterwards,
+        so that a section or a column of the Streamlit app is only computed when it is displayed, and only once for the loaded content of the table
+
+        --------------------
+        Parameters
+        --------------------
+        key(hashable): Key identifying the result, e.g. ('profile', 'numeric', col_name)
+        func(function): Function without parameter computing the result
+        dependencies(tuple): Metrics (or 'df', the loaded content) the result is computed from, the result being computed again once one of them changes (default: ('df',))
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Register the function and its dependencies in self.metrics the first time the key is requested
+        Get the result from self.metrics, which calls the function only if the result is dirty
+
+        --------------------
+        Returns
+        --------------------
+        The result of the function
+
+        """
+        if key not in self.metrics.funcs:
+            self.metrics.add(key, func, dependencies)
+        return self.metrics.get(key)
+
     def is_df_none(self):
         """
         --------------------
@@ -123,6 +380,7 @@ class Dataset:
         --------------------
         Use index 0 of dataframe shape to retrieve count of rows of the dataframe 
         Use index 1 of dataframe shape to retrieve count of columns of the dataframe
+        If the dataframe is a sample, keep its count of rows as the sample size and count the rows of the whole table with a SQL query (get_table_count_query())
 
         --------------------
         Returns
@@ -132,6 +390,9 @@ class Dataset:
         """
         self.n_rows = shape(self.df)[0]
         self.n_cols = shape(self.df)[1]
+        if self.is_sample:
+            self.n_sample_rows = self.n_rows
+            self.n_rows = self.db.run_query(get_table_count_query(self.schema_name, self.table_name)).iloc[0]['count']
 
     def set_duplicates(self):
         """
@@ -188,7 +449,7 @@ class Dataset:
         --------------------
         Description
         --------------------
-        -> set_numeric_columns (method): Class method that extract the list of numeric columns from a table using a SQL query (from get_numeric_tables_query()),
+        -> set_numeric_columns (method): Class method that extract the list of numeric columns from a table using the pg_catalog metadata of the connection (from get_table_columns()),
         store it as attribute (self.num_cols) and then convert the relevant columns of self.df accordingly.
 
         --------------------
@@ -199,26 +460,26 @@ class Dataset:
         --------------------
         Pseudo-Code
         --------------------
-        Run query to get the column names of the columns which are in numeric format in the database and set the attribute 
-        Create variable to convert the result dataframe into list
-        Convert the corresponding columns in the dataframe to integer format
+        Get the column names of the columns which are in numeric format in the database and set the attribute 
+        Load these columns only if they are not loaded yet (load_columns())
+        Convert the corresponding columns in the dataframe to numbers (e.g. the Decimal values of numeric columns to float), keeping the missing values as NaN
+        so that the numeric kernel (get_numeric_stats()) gives the same results as the SQL profile
         --------------------
         Returns
         --------------------
         None
 
         """
-        self.num_cols = self.db.run_query(get_numeric_tables_query(self.schema_name, self.table_name))
-        self.num_cols = list(chain.from_iterable(self.num_cols.values.tolist()))
-        self.df[self.num_cols] = self.df[self.num_cols].fillna(0)
-        self.df[self.num_cols] = self.df[self.num_cols].astype('int')
+        self.num_cols = self.db.get_table_columns(self.schema_name, self.table_name, 'numeric')
+        self.load_columns(self.num_cols)
+        self.df[self.num_cols] = self.df[self.num_cols].apply(pd.to_numeric)
 
     def set_text_columns(self):
         """
         --------------------
         Description
         --------------------
-        -> set_text_columns (method): Class method that extract the list of text columns from a table using a SQL query (from get_numeric_tables_query()),
+        -> set_text_columns (method): Class method that extract the list of text columns from a table using the pg_catalog metadata of the connection (from get_table_columns()),
         store it as attribute (self.text_cols) and then convert the relevant columns of self.df accordingly.
 
         --------------------
@@ -229,9 +490,10 @@ class Dataset:
         --------------------
         Pseudo-Code
         --------------------
-        Run query to get the column names of the columns which are in text format in the database and set the attribute
-        Create variable to convert the result dataframe to list 
-        Convert the corresponding columns in the dataframe to string datatype 
+        Get the column names of the columns which are in text format in the database and set the attribute
+        Load these columns only if they are not loaded yet (load_columns())
+        Convert the corresponding columns in the dataframe to string datatype, keeping the missing values as <NA>
+        so that the text kernel (get_text_stats()) does not count them as whitespaces, as the SQL profile does not
 
         --------------------
         Returns
@@ -239,9 +501,8 @@ class Dataset:
         None
 
         """
-        self.text_cols = self.db.run_query(get_text_tables_query(self.schema_name, self.table_name))
-        self.text_cols = list(chain.from_iterable(self.text_cols.values.tolist()))
-        self.df[self.text_cols] = self.df[self.text_cols].fillna(' ')
+        self.text_cols = self.db.get_table_columns(self.schema_name, self.table_name, 'text')
+        self.load_columns(self.text_cols)
         self.df[self.text_cols] = self.df[self.text_cols].astype('string')
 
     def set_date_columns(self):
@@ -249,7 +510,7 @@ class Dataset:
         --------------------
         Description
         --------------------
-        -> set_date_columns (method): Class method that extract the list of datetime columns from a table using a SQL query (from get_numeric_tables_query()),
+        -> set_date_columns (method): Class method that extract the list of datetime columns from a table using the pg_catalog metadata of the connection (from get_table_columns()),
         store it as attribute (self.date_cols) and then convert the relevant columns of self.df accordingly.
 
         --------------------
@@ -260,9 +521,10 @@ class Dataset:
         --------------------
         Pseudo-Code
         --------------------
-        Run query to get the column names of the columns which are in date format in the database and set the attribute 
-        Create variable to store the result dataframe as list
-        Convert the corresponding columns in the dataframe to date datatype
+        Get the column names of the columns which are in date format in the database and set the attribute 
+        Load these columns only if they are not loaded yet (load_columns())
+        Convert the corresponding columns in the dataframe to date datatype, keeping the missing values as NaT
+        so that the date kernel (get_date_stats()) does not count them as 1970-01-01 dates, as the SQL profile does not
 
         --------------------
         Returns
@@ -270,17 +532,332 @@ class Dataset:
         None
 
         """
-        self.date_cols = self.db.run_query(get_date_tables_query(self.schema_name, self.table_name))
-        self.date_cols = list(chain.from_iterable(self.date_cols.values.tolist()))
-        self.df[self.date_cols] = self.df[self.date_cols].fillna(pd.Timestamp(0))
+        self.date_cols = self.db.get_table_columns(self.schema_name, self.table_name, 'date')
+        self.load_columns(self.date_cols)
         self.df[self.date_cols] = self.df[self.date_cols].astype('datetime64[ns]')
 
+    def load_columns(self, col_names):
+        """
+        --------------------
+        Description
+        --------------------
+        -> load_columns (method): Class method that loads from Postgres the requested columns which are not in self.df yet and adds them to self.df,
+        so that each tab only reads the columns it displays and the columns read for a tab are reused by the others
+
+        --------------------
+        Parameters
+        --------------------
+        col_names(list): Names of the columns to load
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Keep only the requested columns which are not loaded yet, and stop if there is none
+        Get the page keys once: they identify the rows (primary key or ctid)
+        If the rows cannot be identified (view), load all the columns of the table at once and mark the metrics computed from the previous content as dirty (self.metrics)
+        Otherwise load the new columns together with the keys of their rows (load_keyed_columns())
+        If the new rows are not the loaded ones (table modified in between, sample drawn differently), load all the columns of the table at once and mark the metrics as dirty
+        Otherwise join the new columns to self.df on the keys of the rows, and keep the columns in the order of the table
+
+        --------------------
+        Returns
+        --------------------
+        None
+
+        """
+        loaded = [] if self.df is None else list(self.df.columns)
+        missing = [col for col in col_names if col not in loaded]
+        if not missing:
+            return
+        if self.page_keys is None:
+            self.set_page_keys()
+        table_cols = self.db.get_table_columns(self.schema_name, self.table_name)
+        if not self.page_keys:
+            self.df = self.db.load_table(self.schema_name, self.table_name, sampling=self.sampling)
+            self.row_keys = None
+            self.metrics.invalidate('df')
+            return
+        df, row_keys = self.load_keyed_columns(missing)
+        if self.df is None or self.df.shape[1] == 0:
+            self.df, self.row_keys = df, row_keys
+        elif self.row_keys is None or not row_keys.is_unique or len(row_keys) != len(self.row_keys) or len(row_keys.difference(self.row_keys)) > 0:
+            self.df, self.row_keys = self.load_keyed_columns(table_cols)
+            self.metrics.invalidate('df')
+            return
+        else:
+            df.index = row_keys
+            df = df.reindex(self.row_keys).set_index(self.df.index)
+            self.df = pd.concat([self.df, df], axis=1)
+        self.df = self.df[[col for col in table_cols if col in self.df.columns]]
+
+    def load_keyed_columns(self, col_names):
+        """
+        --------------------
+        Description
+        --------------------
+        -> load_keyed_columns (method): Class method that loads from Postgres some columns of the table (or of its sample) together with the keys identifying their rows
+
+        --------------------
+        Parameters
+        --------------------
+        col_names(list): Names of the columns to load
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Load the columns and the page keys which are not among them, sorted by the page keys
+        Build the index of the keys of the rows and keep only the requested columns
+
+        --------------------
+        Returns
+        --------------------
+        (tuple): The dataframe of the requested columns and the pd.MultiIndex of the keys of its rows
+
+        """
+        columns = col_names + [key for key in self.page_keys if key not in col_names]
+        df = self.db.load_table(self.schema_name, self.table_name, sampling=self.sampling, columns=columns, order_by=self.page_keys)
+        row_keys = pd.MultiIndex.from_frame(df[self.page_keys])
+        return df[col_names], row_keys
+
+    def set_page_keys(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_page_keys (method): Class method that gets the columns used for paginating the table from Postgres with keyset cursors and store them as attribute (self.page_keys)
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Get the primary key columns of the table, or ctid for a table without primary key, from the pg_catalog metadata of the connection
+        An empty list means that the rows cannot be identified, the pages are then read with OFFSET
+
+        --------------------
+        Returns
+        --------------------
+        None
+
+        """
+        self.page_keys = self.db.get_page_keys(self.schema_name, self.table_name)
+
+    def get_page_query(self, direction):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_page_query (method): Class method that builds the query reading a page of self.page_size rows of the table, relative to the current page
+
+        --------------------
+        Parameters
+        --------------------
+        direction(str): 'first', 'last', 'next' or 'previous'
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        If the rows can be identified (self.page_keys), build a keyset query (get_page_query()):
+        - the first and last pages are read forwards and backwards without cursor
+        - the next page starts after the last key of the current page, the previous page ends before its first key and is read backwards
+        Otherwise build an OFFSET query (get_offset_page_query()) from the offset of the current page, the last page starting n rows before the end of the table
+
+        --------------------
+        Returns
+        --------------------
+        (tuple): The query, its parameters, whether its rows are read backwards, and the offset of the page
+
+        """
+        n = self.page_size
+        descending = direction in ('last', 'previous')
+        if direction == 'first':
+            offset = 0
+        elif direction == 'last':
+            offset = max(self.get_n_rows() - n, 0)
+        elif direction == 'next':
+            offset = self.page_offset + n
+        else:
+            offset = max(self.page_offset - n, 0)
+        if not self.page_keys:
+            return get_offset_page_query(self.schema_name, self.table_name, n, offset), None, False, offset
+        cursor = {'next': self.page_last, 'previous': self.page_first}.get(direction)
+        query = get_page_query(self.schema_name, self.table_name, self.page_keys, n, descending, cursor is not None)
+        return query, cursor, descending, offset
+
+    def run_page_query(self, query, params):
+        """
+        --------------------
+        Description
+        --------------------
+        -> run_page_query (method): Class method that reads a page, from the prefetched pages if it was read in advance
+
+        --------------------
+        Parameters
+        --------------------
+        query(str): The query reading the page
+        params(tuple): The parameters of the query (keyset cursor), or None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        If the page has been prefetched, wait for its result
+        Otherwise run the query
+        Cancel the other prefetched pages, as they are relative to the previous page (cancel_prefetch())
+
+        --------------------
+        Returns
+        --------------------
+        (dataframe): The rows of the page
+
+        """
+        future = self.prefetched.pop((query, params), None)
+        self.cancel_prefetch()
+        if future is not None:
+            return future.result()
+        return self.db.run_query(query, params=params)
+
+    def prefetch_page(self, direction):
+        """
+        --------------------
+        Description
+        --------------------
+        -> prefetch_page (method): Class method that starts reading a page adjacent to the current one in the background, so that it is displayed at once when requested
+
+        --------------------
+        Parameters
+        --------------------
+        direction(str): 'next' or 'previous'
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Build the query of the page (get_page_query())
+        Submit it to the shared background threads (prefetch_executor) and keep the future in self.prefetched
+
+        --------------------
+        Returns
+        --------------------
+        None
+
+        """
+        query, params, _, _ = self.get_page_query(direction)
+        self.prefetched[(query, params)] = prefetch_executor.submit(self.db.run_query, query, params=params)
+
+    def cancel_prefetch(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> cancel_prefetch (method): Class method that drops the pages read in advance, when they will not be displayed
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Cancel the futures of self.prefetched which have not started yet, the running ones complete in the background
+        Forget all of them
+
+        --------------------
+        Returns
+        --------------------
+        None
+
+        """
+        for future in self.prefetched.values():
+            future.cancel()
+        self.prefetched = {}
+
+    def load_page(self, direction):
+        """
+        --------------------
+        Description
+        --------------------
+        -> load_page (method): Class method that reads a page of rows from Postgres and store it as attribute (self.page), without loading the rest of the table
+
+        --------------------
+        Parameters
+        --------------------
+        direction(str): 'first', 'last', 'next' or 'previous'
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Build the query of the page (get_page_query()) and run it (run_page_query())
+        If the next or previous page is empty, the end of the table is reached: keep the current page
+        Put the rows read backwards back in the order of the table
+        Keep the key values of the first and last rows as cursors for the adjacent pages, and drop ctid which is not a column of the table
+        Update the page number, counted from the first page for Head and from the last page for Tail
+        Prefetch the following page in the same direction (prefetch_page())
+
+        --------------------
+        Returns
+        --------------------
+        (bool): Whether a new page has been loaded
+
+        """
+        if direction == 'previous' and not self.page_keys and self.page_offset == 0:
+            return False
+        query, params, descending, offset = self.get_page_query(direction)
+        df = self.run_page_query(query, params)
+        if df.shape[0] == 0 and direction in ('next', 'previous'):
+            return False
+        if descending:
+            df = df.iloc[::-1].reset_index(drop=True)
+        if self.page_keys and df.shape[0] > 0:
+            self.page_first = tuple(df[self.page_keys].iloc[0].tolist())
+            self.page_last = tuple(df[self.page_keys].iloc[-1].tolist())
+        if self.page_keys == ['ctid']:
+            df = df.drop(columns='ctid')
+        self.page = df
+        self.page_offset = offset
+        forward = 'next' if self.page_mode == 'Head' else 'previous'
+        if direction in ('first', 'last'):
+            self.page_number = 1
+        else:
+            self.page_number += 1 if direction == forward else -1
+        self.prefetch_page(direction if direction in ('next', 'previous') else forward)
+        return True
+
+    def get_n_rows(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_n_rows (method): Class method that returns the number of rows of the table, counting them if they are not known yet
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        If self.n_rows is not set yet, run the query counting the rows of the table and set it
+
+        --------------------
+        Returns
+        --------------------
+        (int): The number of rows of the table
+
+        """
+        if self.n_rows is None:
+            self.n_rows = self.db.run_query(get_table_count_query(self.schema_name, self.table_name)).iloc[0]['count']
+        return self.n_rows
+
     def get_head(self, n=5):
         """
         --------------------
         Description
         --------------------
-        -> get_head (method): Class method that computes the first rows of self.df according to the provided number of rows specified as parameter (default: 5)
+        -> get_head (method): Class method that reads the first page of rows of the table from Postgres according to the provided number of rows specified as parameter (default: 5)
 
         --------------------
         Parameters
@@ -290,22 +867,30 @@ class Dataset:
         --------------------
         Pseudo-Code
         --------------------
-        Head function to retrieve the first n rows in the dataframe
+        If the dataset is not attached to a database, head function to retrieve the first n rows in the dataframe
+        Otherwise get the page keys once, start paginating the table with pages of n rows from the first one and read it (load_page())
 
         --------------------
         Returns
         --------------------
-        (dataframe): The first n rows of the dataframe
+        (dataframe): The first n rows of the table
 
         """
-        return self.df.head(n)
+        if self.db is None:
+            return self.df.head(n)
+        if self.page_keys is None:
+            self.set_page_keys()
+        self.page_mode = 'Head'
+        self.page_size = n
+        self.load_page('first')
+        return self.page
 
     def get_tail(self, n=5):
         """
         --------------------
         Description
         --------------------
-        -> get_tail (method): Class method that computes the last rows of self.df according to the provided number of rows specified as parameter (default: 5)
+        -> get_tail (method): Class method that reads the last page of rows of the table from Postgres according to the provided number of rows specified as parameter (default: 5)
 
         --------------------
         Parameters
@@ -315,39 +900,116 @@ class Dataset:
         --------------------
         Pseudo-Code
         --------------------
-        Tail function to retrieve the las n rows in the dataframe
+        If the dataset is not attached to a database, tail function to retrieve the last n rows in the dataframe
+        Otherwise get the page keys once, start paginating the table with pages of n rows from the last one and read it (load_page())
 
         --------------------
         Returns
         --------------------
-        (dataframe): The last n rows of the dataframe
+        (dataframe): The last n rows of the table
 
         """
-        return self.df.tail(n)
+        if self.db is None:
+            return self.df.tail(n)
+        if self.page_keys is None:
+            self.set_page_keys()
+        self.page_mode = 'Tail'
+        self.page_size = n
+        self.load_page('last')
+        return self.page
+
+    def get_next_page(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_next_page (method): Class method that reads the page following the current one
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Read the next page (load_page()), usually already prefetched
+
+        --------------------
+        Returns
+        --------------------
+        (bool): Whether a new page has been loaded, False at the end of the table
+
+        """
+        return self.load_page('next')
+
+    def get_previous_page(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_previous_page (method): Class method that reads the page preceding the current one
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Read the previous page (load_page()), usually already prefetched
+
+        --------------------
+        Returns
+        --------------------
+        (bool): Whether a new page has been loaded, False at the start of the table
+
+        """
+        return self.load_page('previous')
 
     def get_sample(self, n=5):
         """
         --------------------
         Description
         --------------------
-        -> get_sample (method): Class method that computes a random sample of rows of self.df according to the provided number of rows specified as parameter (default: 5)
+        -> get_sample (method): Class method that reads a random sample of rows of the table from Postgres according to the provided number of rows specified as parameter (default: 5)
 
         --------------------
         Parameters
         --------------------
         n(int): The number of rows the user wants to inspect 
+
         --------------------
         Pseudo-Code
         --------------------
-        Sample function to get n rows of sample from the dataframe
+        If the dataset is not attached to a database, sample function to get n rows of sample from the dataframe
+        Otherwise draw SAMPLE_OVERSAMPLING times more rows than requested with TABLESAMPLE BERNOULLI and shuffle them with random()
+        The percentage is computed from the number of rows if already counted, otherwise from the estimate of pg_class (get_table_rows_estimate()),
+        counting the rows (get_n_rows()) only when the table has never been analysed
+        If too few rows were drawn, as the estimate may be outdated, shuffle the whole table instead
+        The result is not cached, so that every call returns a new sample
 
         --------------------
         Returns
         --------------------
-        (dataframe): The n rows sample of the dataframe
+        (dataframe): The n rows sample of the table
 
         """
-        return self.df.sample(n)
+        if self.db is None:
+            return self.df.sample(n)
+        n_rows = self.n_rows
+        if n_rows is None:
+            n_rows = self.db.get_table_rows_estimate(self.schema_name, self.table_name)
+        if n_rows is None:
+            n_rows = self.get_n_rows()
+        percent = 100.0 * SAMPLE_OVERSAMPLING * n / n_rows if n_rows else 100.0
+        df = pd.DataFrame()
+        if percent < 100:
+            df = self.db.run_query(get_random_rows_query(self.schema_name, self.table_name, n, percent), use_cache=False)
+        if df.shape[0] < n:
+            df = self.db.run_query(get_random_rows_query(self.schema_name, self.table_name, n), use_cache=False)
+        return df
 
     def get_summary_df(self):
         """
@@ -365,12 +1027,12 @@ class Dataset:
         Pseudo-Code
         --------------------
         Create a dataframe to display the information which needs to be displayed in the streamlit app overall section
+        If the dataframe is a sample, add the sample size and label each metric as exact or estimated from the sample
 
         --------------------
         Returns
         --------------------
-        => To be filled by student
-        -> (type): description
+        (dataframe): The dataframe shows all the requested information
 
         """
         df1 = pd.DataFrame([
@@ -381,6 +1043,163 @@ class Dataset:
             ['Number of Rows with Missing Values', self.n_missing]],
             columns= ['Description', 'Value'])
 
+        if self.is_sample:
+            df1 = pd.concat([df1.iloc[:2], pd.DataFrame([['Number of Sampled Rows', self.n_sample_rows]], columns=['Description', 'Value']), df1.iloc[2:]], ignore_index=True)
+            df1 = set_metrics_basis(df1, self.exact_metrics)
         return df1
 
+    def set_instant_profile(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_instant_profile (method): Class method that profiles the table from the statistics Postgres already keeps in its catalogs, without scanning it
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Read the estimated number of rows and the date of the last ANALYZE of the table and set the attributes
+        Read the statistics of each column and set the number of columns accordingly
+
+        --------------------
+        Returns
+        --------------------
+        None
+
+        """
+        table_stats = self.db.get_table_stats(self.schema_name, self.table_name)
+        self.n_rows = table_stats['n_rows']
+        self.last_analyze = table_stats['last_analyze']
+        self.n_mod_since_analyze = table_stats['n_mod_since_analyze']
+        self.is_stale = table_stats['is_stale']
+        self.column_stats = self.db.get_column_stats(self.schema_name, self.table_name, self.n_rows or 0)
+        self.n_cols = self.column_stats.shape[0]
+
+    def get_instant_summary_df(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_instant_summary_df (method): Class method that formats the catalog statistics of the table as a Pandas dataframe with 2 columns: Description and Value
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Create a dataframe with the estimated number of rows, the number of columns and the freshness of the statistics
+
+        --------------------
+        Returns
+        --------------------
+        (dataframe): The dataframe shows the catalog statistics of the table
+
+        """
+        return pd.DataFrame([
+            ['Name of Table', self.table_name],
+            ['Estimated Number of Rows', self.n_rows],
+            ['Number of Columns', self.n_cols],
+            ['Last ANALYZE', self.last_analyze if self.last_analyze is not None else 'Never'],
+            ['Rows Modified since last ANALYZE', self.n_mod_since_analyze],
+            ['Statistics', 'Stale' if self.is_stale else 'Up to date']],
+            columns= ['Description', 'Value']).astype(str)
+
+    def get_instant_columns_df(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_instant_columns_df (method): Class method that formats the catalog statistics of every column as a Pandas dataframe
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Keep for each column its missing ratio and estimated number of unique values
+        Add its most common value and the frequency of this value
+
+        --------------------
+        Returns
+        --------------------
+        (dataframe): The dataframe shows the catalog statistics of each column
+
+        """
+        df = self.column_stats[['column_name', 'missing_ratio', 'n_unique']].copy()
+        df['most_common_value'] = self.column_stats['top_values'].apply(lambda values: values[0] if values else None)
+        df['most_common_freq'] = self.column_stats['top_freqs'].apply(lambda freqs: freqs[0] if freqs else None)
+        return df
+
+    def get_top_values(self, col_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_top_values (method): Class method that returns the most common values of a column and their frequencies from the catalog statistics
+
+        --------------------
+        Parameters
+        --------------------
+        col_name(str): The name of the column
 
+        --------------------
+        Pseudo-Code
+        --------------------
+        Find the statistics of the column
+        Create a dataframe with the most common values, their frequency and their estimated number of occurrences
+
+        --------------------
+        Returns
+        --------------------
+        (dataframe): The most common values of the column
+
+        """
+        col_stats = self.column_stats[self.column_stats['column_name'] == col_name].iloc[0]
+        df = pd.DataFrame({'value': col_stats['top_values'], 'frequency': col_stats['top_freqs']})
+        df['occurrence'] = (df['frequency'] * (self.n_rows or 0)).round().astype(int)
+        return df
+
+    def get_histogram(self, col_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_histogram (method): Class method that returns the buckets of the histogram of a column from the catalog statistics
+
+        --------------------
+        Parameters
+        --------------------
+        col_name(str): The name of the column
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Find the statistics of the column
+        Create one bucket between each pair of consecutive histogram bounds
+        Postgres builds equal-frequency buckets over the rows which are neither missing nor among the most common values,
+        so each bucket holds the same share of these rows
+
+        --------------------
+        Returns
+        --------------------
+        (dataframe): The lower bound, upper bound and share of rows of each bucket
+
+        """
+        col_stats = self.column_stats[self.column_stats['column_name'] == col_name].iloc[0]
+        bounds = col_stats['histogram_bounds']
+        if len(bounds) < 2:
+            return pd.DataFrame([], columns=['lower', 'upper', 'fraction'])
+        n_buckets = len(bounds) - 1
+        fraction = (1 - col_stats['missing_ratio'] - sum(col_stats['top_freqs'])) / n_buckets
+        return pd.DataFrame({'lower': bounds[:-1], 'upper': bounds[1:], 'fraction': [fraction] * n_buckets})
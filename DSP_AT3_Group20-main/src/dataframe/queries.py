@@ -105,4 +105,100 @@ def get_primary_key(schema_name, table_name):
     --------------------
     A query string which can extract the primary keys in the selected table
     """
-    return f"select c.column_name from information_schema.table_constraints t left join information_schema.constraint_column_usage c on c.constraint_name = t.constraint_name where t.table_schema = '{schema_name}' and t.constraint_type = 'PRIMARY KEY' and t.table_name = '{table_name}'"
\ No newline at end of file
+    return f"select c.column_name from information_schema.table_constraints t left join information_schema.constraint_column_usage c on c.constraint_name = t.constraint_name where t.table_schema = '{schema_name}' and t.constraint_type = 'PRIMARY KEY' and t.table_name = '{table_name}'"
+
+def get_page_query(schema_name, table_name, key_cols, n, descending=False, has_cursor=False):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_page_query (method): Function that returns the query used for extracting a page of rows from a Postgres table, ordered by key columns (keyset pagination)
+
+    --------------------
+    Parameters
+    --------------------
+    schema_name(str): The schema name of the selected table in the target database
+    table_name(str): The table name of the selected table in the target database
+    key_cols(list): The columns identifying the rows (primary key, or ctid for tables without primary key)
+    n(int): The number of rows of the page
+    descending(bool): Whether the rows are read backwards, for the last page or the previous page (default: False)
+    has_cursor(bool): Whether the page starts after (or before, when descending) the key values given as query parameters (default: False)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    SQL query to select the n rows following the cursor in the order of the key columns
+    The cursor is compared as a row value, so that the index of the primary key is used instead of scanning the skipped rows
+    With ctid, the row location is selected too, as it is not a column of the table
+
+    --------------------
+    Returns
+    --------------------
+    A query string which can extract a page of rows, with one %s placeholder per key column when has_cursor is True
+
+    """
+    keys = ', '.join(col if col == 'ctid' else f'"{col}"' for col in key_cols)
+    select = 'SELECT ctid, *' if key_cols == ['ctid'] else 'SELECT *'
+    where = ''
+    if has_cursor:
+        placeholders = ', '.join('%s::tid' if col == 'ctid' else '%s' for col in key_cols)
+        where = f" WHERE ({keys}) {'<' if descending else '>'} ({placeholders})"
+    order = ', '.join(f"{col} DESC" if descending else col for col in keys.split(', '))
+    return f"{select} FROM {schema_name}.{table_name}{where} ORDER BY {order} LIMIT {n}"
+
+def get_offset_page_query(schema_name, table_name, n, offset):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_offset_page_query (method): Function that returns the query used for extracting a page of rows from a Postgres relation whose rows cannot be identified (e.g. a view without primary key)
+
+    --------------------
+    Parameters
+    --------------------
+    schema_name(str): The schema name of the selected table in the target database
+    table_name(str): The table name of the selected table in the target database
+    n(int): The number of rows of the page
+    offset(int): The number of rows skipped before the page
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    SQL query to select n rows after skipping offset rows, in the order Postgres reads them
+
+    --------------------
+    Returns
+    --------------------
+    A query string which can extract a page of rows
+
+    """
+    return f"SELECT * FROM {schema_name}.{table_name} LIMIT {n} OFFSET {offset}"
+
+def get_random_rows_query(schema_name, table_name, n, percent=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_random_rows_query (method): Function that returns the query used for extracting random rows from a Postgres table
+
+    --------------------
+    Parameters
+    --------------------
+    schema_name(str): The schema name of the selected table in the target database
+    table_name(str): The table name of the selected table in the target database
+    n(int): The number of rows to be extracted
+    percent(float): If provided, only this percentage of the rows is drawn with TABLESAMPLE BERNOULLI before shuffling them (default: None)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    SQL query to shuffle the rows (of the TABLESAMPLE, if any) with random() and keep the first n
+
+    --------------------
+    Returns
+    --------------------
+    A query string which can extract n random rows
+
+    """
+    tablesample = f" TABLESAMPLE BERNOULLI ({percent})" if percent is not None else ''
+    return f"SELECT * FROM {schema_name}.{table_name}{tablesample} ORDER BY random() LIMIT {n}"
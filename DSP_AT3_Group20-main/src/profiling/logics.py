@@ -0,0 +1,917 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+from src.profiling.queries import get_frequency_query
+
+PROFILING_WORKERS = int(os.environ.get('PROFILING_WORKERS', 4))
+PROFILING_BATCH_SIZE = int(os.environ.get('PROFILING_BATCH_SIZE', 50))
+# The frequency tables of sampled columns are counted by Postgres over the whole table, limited to this number of most frequent values
+# (FrequencyTable.from_query()), which is also the maximum number of values displayed by the bar charts; 0 counts the values of the sample instead
+FREQUENCY_TOP_K = int(os.environ.get('FREQUENCY_TOP_K', 50))
+# Number of index bits of the HyperLogLog sketches (2 ** HLL_PRECISION registers, relative standard error of 1.04 / sqrt(2 ** HLL_PRECISION))
+HLL_PRECISION = int(os.environ.get('HLL_PRECISION', 14))
+# Number of values hashed at once when a sketch is built from a loaded serie
+HLL_CHUNKSIZE = int(os.environ.get('HLL_CHUNKSIZE', 1 << 20))
+# Series of at most this number of values have their distinct values counted exactly instead of estimated with a sketch
+DISTINCT_EXACT_MAX_ROWS = int(os.environ.get('DISTINCT_EXACT_MAX_ROWS', 100000))
+# Whether the profiles count the distinct values exactly with count(distinct) (1) or estimate them from the loaded values (0),
+# default of the 'Count distinct values exactly' checkbox
+DISTINCT_EXACT = os.environ.get('DISTINCT_EXACT', '0') == '1'
+
+class ProfilingExecutor:
+    """
+    --------------------
+    Description
+    --------------------
+    -> ProfilingExecutor (class): Class that runs the profiling of columns concurrently on a pool of threads, each query borrowing its own connection from the connection pool
+
+    --------------------
+    Attributes
+    --------------------
+    -> db (PostgresConnector): Instantation of PostgresConnector class for handling Postgres connection (mandatory)
+    -> max_workers (int): Maximum number of threads, and so of connections, used at the same time (optional)
+    -> batch_size (int): Maximum number of columns profiled by a single query when the columns are split into batches (optional)
+    """
+    def __init__(self, db, max_workers=PROFILING_WORKERS, batch_size=PROFILING_BATCH_SIZE):
+        self.db = db
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+
+    def get_workers(self, n_tasks):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_workers (method): Class method that computes the number of threads used for running tasks
+
+        --------------------
+        Parameters
+        --------------------
+        -> n_tasks (int): Number of tasks to be run.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Without a connection pool, every query goes through the same connection, so the tasks are run one at a time.
+        -> Otherwise, use up to max_workers threads, without exceeding the number of tasks nor the number of connections the pool can open,
+        so that no thread waits for a free connection.
+
+        --------------------
+        Returns
+        --------------------
+        -> (int): The number of threads.
+
+        """
+        if getattr(self.db, 'pool', None) is None:
+            return 1
+        return max(1, min(self.max_workers, n_tasks, self.db.pool.maxconn))
+
+    def map(self, func, items):
+        """
+        --------------------
+        Description
+        --------------------
+        -> map (method): Class method that applies a function to every item concurrently and returns the results in the order of the items
+
+        --------------------
+        Parameters
+        --------------------
+        -> func (function): The function to be applied, it must not call Streamlit as it runs outside of the script thread.
+        -> items (list): The items to be processed.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> If a single thread is needed, apply the function to the items one after the other.
+        -> Otherwise, submit every item to a pool of threads and collect the results in the order of the items (not in the order they finish),
+        so that the display stays the same from one run to the other. The first exception raised by a task is raised again.
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): The result of the function for each item.
+
+        """
+        items = list(items)
+        n_workers = self.get_workers(len(items))
+        if n_workers <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix='profiling') as executor:
+            return list(executor.map(func, items))
+
+    def map_batches(self, func, items):
+        """
+        --------------------
+        Description
+        --------------------
+        -> map_batches (method): Class method that splits the items into batches of batch_size, applies a function returning a dictionary to every batch concurrently and merges the results
+
+        --------------------
+        Parameters
+        --------------------
+        -> func (function): The function to be applied to a list of items, returning a dictionary.
+        -> items (list): The items to be processed.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Split the items into consecutive batches of at most batch_size items.
+        -> Apply the function to the batches with map().
+        -> Merge the dictionaries in the order of the batches.
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): The merged results.
+
+        """
+        result = {}
+        for batch_result in self.map(func, self.get_batches(items)):
+            result.update(batch_result)
+        return result
+
+    def get_batches(self, items):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_batches (method): Class method that splits items into consecutive batches of at most batch_size items
+
+        --------------------
+        Parameters
+        --------------------
+        -> items (list): The items to be split.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Slice the items every batch_size items.
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): The batches, in the order of the items.
+
+        """
+        items = list(items)
+        batch_size = max(1, self.batch_size)
+        return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+    def run_queries(self, sql_queries):
+        """
+        --------------------
+        Description
+        --------------------
+        -> run_queries (method): Class method that runs independent SQL queries at the same time and returns their results in the same order
+
+        --------------------
+        Parameters
+        --------------------
+        -> sql_queries (list): The sql commands to be executed.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> With a connection pool and several queries, run them all from one event loop with the asynchronous connector of the database (get_async_connector()),
+        whose connections take slots of the pool.
+        -> Otherwise, run them one after the other with run_query().
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): The result of each query as a Pandas dataframe.
+
+        """
+        sql_queries = list(sql_queries)
+        if len(sql_queries) > 1 and getattr(self.db, 'pool', None) is not None:
+            return self.db.get_async_connector().run_queries(sql_queries)
+        return [self.db.run_query(sql_query) for sql_query in sql_queries]
+
+    def map_queries(self, build_query, parse, items):
+        """
+        --------------------
+        Description
+        --------------------
+        -> map_queries (method): Class method that splits the items into batches, runs one query per batch at the same time and merges the dictionaries parsed from their results
+
+        --------------------
+        Parameters
+        --------------------
+        -> build_query (function): The function returning the query of a batch of items.
+        -> parse (function): The function returning a dictionary from the result of a query and its batch of items.
+        -> items (list): The items to be processed.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Split the items into batches (get_batches()) and build the query of every batch.
+        -> Run the queries at the same time (run_queries()).
+        -> Parse every result and merge the dictionaries in the order of the batches.
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): The merged results.
+
+        """
+        batches = self.get_batches(items)
+        result = {}
+        for batch, df in zip(batches, self.run_queries([build_query(batch) for batch in batches])):
+            result.update(parse(df, batch))
+        return result
+
+    def profile_columns(self, columns, profiles=None):
+        """
+        --------------------
+        Description
+        --------------------
+        -> profile_columns (method): Class method that computes the information of several column classes (NumericColumn, TextColumn or DateColumn) concurrently
+
+        --------------------
+        Parameters
+        --------------------
+        -> columns (list): The column classes to be profiled.
+        -> profiles (dict): Metrics of each column already computed with a fused profile query, keyed by column name (optional).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Call the set_data method of every column with its profile, if any, using map().
+        -> Return the columns in the order they were given.
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): The profiled columns.
+
+        """
+        profiles = profiles or {}
+        self.map(lambda column: column.set_data(profiles.get(column.col_name)), columns)
+        return columns
+
+class MetricGraph:
+    """
+    --------------------
+    Description
+    --------------------
+    -> MetricGraph (class): Class that computes the metrics of a dataset or a column at most once, each metric being a method of its owner,
+    and recomputes only the metrics depending on an input once it has changed (dirty tracking)
+
+    --------------------
+    Attributes
+    --------------------
+    -> owner (object): The class whose methods compute the metrics, e.g. a Dataset or a NumericColumn (mandatory)
+    -> dependencies (dict): Names of the metrics (or inputs) each metric is computed from, by metric name (optional)
+    -> funcs (dict): Functions computing the metrics that are not methods of the owner, by metric name (optional)
+    -> values (dict): Results of the metrics computed so far, by metric name
+    """
+    def __init__(self, owner, dependencies=None):
+        self.owner = owner
+        self.dependencies = dict(dependencies or {})
+        self.funcs = {}
+        self.values = {}
+
+    def add(self, name, func, dependencies=()):
+        """
+        --------------------
+        Description
+        --------------------
+        -> add (method): Class method that registers a metric computed by a function instead of a method of the owner
+
+        --------------------
+        Parameters
+        --------------------
+        -> name (hashable): The name of the metric.
+        -> func (function): Function without parameter computing the metric.
+        -> dependencies (tuple): Names of the metrics (or inputs) the metric is computed from (default: ()).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Store the function and the dependencies of the metric.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        self.funcs[name] = func
+        self.dependencies[name] = tuple(dependencies)
+
+    def get(self, name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get (method): Class method that returns the result of a metric, computing it only if it is dirty
+
+        --------------------
+        Parameters
+        --------------------
+        -> name (hashable): The name of the metric.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> If the metric has not been computed yet, or has been invalidated, call its function (or the method of the owner with the same name) and store its result.
+        -> The metrics it depends on are requested through get() by the function itself, so each of them is also computed at most once.
+        -> Return the stored result.
+
+        --------------------
+        Returns
+        --------------------
+        -> The result of the metric (None for the methods of the owner that only set attributes).
+
+        """
+        if name not in self.values:
+            func = self.funcs.get(name) or getattr(self.owner, name)
+            self.values[name] = func()
+        return self.values[name]
+
+    def set(self, name, value=None):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set (method): Class method that stores the result of a metric computed elsewhere (e.g. by a fused profile query), so that it is not computed again
+
+        --------------------
+        Parameters
+        --------------------
+        -> name (hashable): The name of the metric.
+        -> value (object): The result of the metric (default: None).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Invalidate the metrics depending on it (invalidate()) and store the result.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        self.invalidate(name)
+        self.values[name] = value
+
+    def invalidate(self, name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> invalidate (method): Class method that marks a metric (or an input) as dirty, together with every metric depending on it directly or not
+
+        --------------------
+        Parameters
+        --------------------
+        -> name (hashable): The name of the metric or input that has changed.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Forget the result of the metric.
+        -> Invalidate every metric listing it in its dependencies.
+
+        --------------------
+        Returns
+        --------------------
+        -> (None)
+
+        """
+        self.values.pop(name, None)
+        for metric, dependencies in self.dependencies.items():
+            if name in dependencies:
+                self.invalidate(metric)
+
+    def is_dirty(self, name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> is_dirty (method): Class method that checks if a metric has to be computed
+
+        --------------------
+        Parameters
+        --------------------
+        -> name (hashable): The name of the metric.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Return True if no result is stored for the metric.
+
+        --------------------
+        Returns
+        --------------------
+        -> (bool): Whether the metric has to be computed.
+
+        """
+        return name not in self.values
+
+
+class FrequencyTable:
+    """
+    --------------------
+    Description
+    --------------------
+    -> FrequencyTable (class): Class that stores the number of occurrences of the values of a column, computed once and shared by its chart and its most frequent values
+
+    --------------------
+    Attributes
+    --------------------
+    -> counts (pd.Series): Number of occurrences of each value, by decreasing number, possibly limited to the most frequent values (mandatory)
+    -> total (int): Number of non-null values of the column, including the values missing from counts (optional, the sum of counts by default)
+    -> n_distinct (int): Number of distinct non-null values of the column, including the values missing from counts (optional, the length of counts by default)
+    """
+    def __init__(self, counts, total=None, n_distinct=None):
+        self.counts = counts
+        self.total = int(counts.sum()) if total is None else int(total)
+        self.n_distinct = len(counts) if n_distinct is None else int(n_distinct)
+
+    @classmethod
+    def from_serie(cls, serie):
+        """
+        --------------------
+        Description
+        --------------------
+        -> from_serie (method): Class method that counts the occurrences of every value of a pandas serie
+
+        --------------------
+        Parameters
+        --------------------
+        -> serie (pd.Series): The values of the column.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Count the values of the serie once with value_counts() (null values excluded).
+
+        --------------------
+        Returns
+        --------------------
+        -> (FrequencyTable): The frequency table of the serie.
+
+        """
+        return cls(serie.value_counts())
+
+    @classmethod
+    def from_query(cls, db, schema_name, table_name, col_name, top_k):
+        """
+        --------------------
+        Description
+        --------------------
+        -> from_query (method): Class method that counts the occurrences of the most frequent values of a column over the whole Postgres table
+
+        --------------------
+        Parameters
+        --------------------
+        -> db (PostgresConnector): Instantation of PostgresConnector class for handling Postgres connection.
+        -> schema_name (str): Name of the schema.
+        -> table_name (str): Name of the table.
+        -> col_name (str): Name of the column.
+        -> top_k (int): Number of most frequent values kept.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Push the grouping, the ordering and the limit down to Postgres (get_frequency_query()), so that only top_k rows are transferred.
+        -> Build the counts from the rows, and take the number of non-null and distinct values of the column from the total and n_distinct columns.
+
+        --------------------
+        Returns
+        --------------------
+        -> (FrequencyTable): The frequency table of the column.
+
+        """
+        df = db.run_query(get_frequency_query(schema_name, table_name, col_name, top_k))
+        counts = pd.Series(df['occurrence'].to_numpy(), index=df['value'].to_numpy(), name=col_name)
+        if len(df) == 0:
+            return cls(counts, 0, 0)
+        return cls(counts, df['total'].iloc[0], df['n_distinct'].iloc[0])
+
+    def get_counts_df(self, top_k=None):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_counts_df (method): Class method that returns the occurrences of the values as a dataframe, as used by the Altair charts
+
+        --------------------
+        Parameters
+        --------------------
+        -> top_k (int): Number of most frequent values kept, all of them if None or 0 (default: None).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Keep the top_k first counts and reset the index, so that the values are in the column 'index' and their counts in the column named after the serie.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pd.DataFrame): The values and their number of occurrences.
+
+        """
+        counts = self.counts.head(top_k) if top_k else self.counts
+        return pd.DataFrame(counts).reset_index()
+
+    def get_top_k_df(self, top_k, other_label='Other'):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_top_k_df (method): Class method that returns the occurrences of the most frequent values followed by a single row aggregating all the other values, so that a chart has at most top_k + 1 bars
+
+        --------------------
+        Parameters
+        --------------------
+        -> top_k (int): Number of most frequent values kept, all of them if None or 0.
+        -> other_label (str): Label of the row aggregating the other values, followed by their number (default: 'Other').
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Keep the top_k first counts (get_counts_df()) and flag them as not being the other values.
+        -> If some non-null values are not kept, add a row whose count is the number of non-null values (total) minus the counts kept, which is exact even when counts only holds the most frequent values (from_query()).
+
+        --------------------
+        Returns
+        --------------------
+        -> (pd.DataFrame): The values and their number of occurrences, plus the column is_other.
+
+        """
+        df = self.get_counts_df(top_k)
+        df['is_other'] = False
+        n_other = self.total - int(df.iloc[:, 1].sum())
+        if n_other > 0:
+            other = pd.DataFrame([[f'{other_label} ({self.n_distinct - len(df)} values)', n_other, True]], columns=df.columns)
+            df = pd.concat([df, other], ignore_index=True)
+        return df
+
+    def get_frequent(self, end=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_frequent (method): Class method that returns the most frequent values with their number of occurrences and their percentage
+
+        --------------------
+        Parameters
+        --------------------
+        -> end (int): Number of most frequent values returned (default: 20).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Keep the end first counts and name the columns 'value' and 'occurrence'.
+        -> Divide the whole column of occurrences by the number of non-null values at once to get the percentages.
+
+        --------------------
+        Returns
+        --------------------
+        -> (pd.DataFrame): The columns value, occurrence and percentage.
+
+        """
+        df = self.counts.head(end).reset_index()
+        df.columns = ['value', 'occurrence']
+        df['percentage'] = df['occurrence'] / self.total if self.total else 0.0
+        return df
+
+
+class HyperLogLog:
+    """
+    --------------------
+    Description
+    --------------------
+    -> HyperLogLog (class): Class that estimates the number of distinct values of a column in a fixed amount of memory (HyperLogLog sketch),
+    which can be built from chunks of values, merged with the sketch of another chunk or partition and serialised
+
+    --------------------
+    Attributes
+    --------------------
+    -> precision (int): Number of bits of the hash choosing the register of a value, between 4 and 18 (optional, HLL_PRECISION by default)
+    -> registers (np.ndarray): For each of the 2 ** precision registers, the maximum position of the first 1 bit of the remaining bits of the hashes (optional, zeros by default)
+    """
+    def __init__(self, precision=HLL_PRECISION, registers=None):
+        if not 4 <= precision <= 18:
+            raise ValueError(f'HyperLogLog precision must be between 4 and 18, got {precision}')
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8) if registers is None else registers
+
+    @staticmethod
+    def hash_values(values):
+        """
+        --------------------
+        Description
+        --------------------
+        -> hash_values (method): Class method that hashes the non-null values of a chunk to 64 bits, identically whatever the chunk they come from
+
+        --------------------
+        Parameters
+        --------------------
+        -> values (pd.Series): The values to hash.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Drop the null values.
+        -> Hash integers (numpy or nullable) as 64 bits integers, so that large integers above 2 ** 53 keep distinct hashes.
+        -> Hash the integral floats as 64 bits integers too, as an integer chunk becomes float as soon as it holds a null value, and the other floats as floats,
+        so that a value always has the same hash whatever the chunk it comes from.
+        -> Convert dates with a timezone to UTC.
+        -> Hash the values with the seeded, vectorised hash of pandas (hash_pandas_object()).
+
+        --------------------
+        Returns
+        --------------------
+        -> (np.ndarray): The hashes as unsigned 64 bits integers.
+
+        """
+        values = pd.Series(values).dropna()
+        if pd.api.types.is_integer_dtype(values):
+            return pd.util.hash_pandas_object(pd.Series(values.to_numpy(dtype=np.int64)), index=False).to_numpy()
+        if pd.api.types.is_float_dtype(values):
+            floats = values.to_numpy(dtype=np.float64)
+            integral = np.isfinite(floats) & (np.floor(floats) == floats) & (np.abs(floats) < 2.0 ** 63)
+            hashes = np.empty(len(floats), dtype=np.uint64)
+            hashes[integral] = pd.util.hash_pandas_object(pd.Series(floats[integral].astype(np.int64)), index=False).to_numpy()
+            hashes[~integral] = pd.util.hash_pandas_object(pd.Series(floats[~integral]), index=False).to_numpy()
+            return hashes
+        if pd.api.types.is_datetime64_any_dtype(values) and values.dt.tz is not None:
+            values = values.dt.tz_convert(None)
+        return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+    def update(self, values):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that adds a chunk of values to the sketch
+
+        --------------------
+        Parameters
+        --------------------
+        -> values (pd.Series): The values to add, null values being ignored.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Hash the values (hash_values()), the first precision bits of a hash choosing its register.
+        -> Compute the position of the first 1 bit of the remaining bits, from their bit length found by a binary search of 6 vectorised steps.
+        -> Keep in every register the maximum position of its hashes.
+
+        --------------------
+        Returns
+        --------------------
+        -> (HyperLogLog): The sketch itself.
+
+        """
+        hashes = self.hash_values(values)
+        if len(hashes) == 0:
+            return self
+        n_bits = 64 - self.precision
+        index = (hashes >> np.uint64(n_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << n_bits) - 1)
+        bit_length = np.zeros(len(rest), dtype=np.uint8)
+        for shift in (32, 16, 8, 4, 2, 1):
+            high = rest >= np.uint64(1 << shift)
+            bit_length[high] += shift
+            rest[high] >>= np.uint64(shift)
+        bit_length += (rest > 0).astype(np.uint8)
+        np.maximum.at(self.registers, index, (n_bits - bit_length + 1).astype(np.uint8))
+        return self
+
+    def merge(self, other):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge (method): Class method that adds the values of another sketch, e.g. built from another chunk or partition of the column
+
+        --------------------
+        Parameters
+        --------------------
+        -> other (HyperLogLog): The sketch to merge, with the same precision.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Raise a ValueError if the precisions differ.
+        -> Keep the maximum of the two sketches in every register, which gives the sketch of all their values together.
+
+        --------------------
+        Returns
+        --------------------
+        -> (HyperLogLog): The sketch itself.
+
+        """
+        if other.precision != self.precision:
+            raise ValueError(f'Cannot merge HyperLogLog sketches of precision {self.precision} and {other.precision}')
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> estimate (method): Class method that estimates the number of distinct values added to the sketch
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Compute the normalised harmonic mean of 2 ** register over the registers (raw HyperLogLog estimate).
+        -> For small estimates (at most 2.5 times the number of registers) with empty registers, use linear counting on the empty registers instead, which is more accurate.
+
+        --------------------
+        Returns
+        --------------------
+        -> (int): The estimated number of distinct values.
+
+        """
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        n_empty = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and n_empty > 0:
+            return int(round(m * np.log(m / n_empty)))
+        return int(round(raw))
+
+    def error_bound(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> error_bound (method): Class method that returns the standard error of the estimate, in number of distinct values
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Multiply the estimate by the relative standard error of the sketch, 1.04 / sqrt(number of registers).
+
+        --------------------
+        Returns
+        --------------------
+        -> (float): The standard error of the estimate (about 68% of the estimates are within it, 95% within twice it).
+
+        """
+        return self.estimate() * 1.04 / np.sqrt(len(self.registers))
+
+    def to_bytes(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> to_bytes (method): Class method that serialises the sketch, e.g. to store it or send it to the process merging the sketches
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Write the precision on one byte followed by the registers, one byte each.
+
+        --------------------
+        Returns
+        --------------------
+        -> (bytes): The serialised sketch.
+
+        """
+        return bytes([self.precision]) + self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        --------------------
+        Description
+        --------------------
+        -> from_bytes (method): Class method that rebuilds a sketch serialised by to_bytes()
+
+        --------------------
+        Parameters
+        --------------------
+        -> data (bytes): The serialised sketch.
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Read the precision from the first byte and raise a ValueError if the number of registers does not match it.
+        -> Copy the registers from the following bytes.
+
+        --------------------
+        Returns
+        --------------------
+        -> (HyperLogLog): The sketch.
+
+        """
+        precision = data[0]
+        if len(data) != 1 + (1 << precision):
+            raise ValueError(f'Invalid HyperLogLog sketch of {len(data)} bytes for precision {precision}')
+        return cls(precision, np.frombuffer(data, dtype=np.uint8, offset=1).copy())
+
+    @classmethod
+    def from_chunks(cls, chunks, precision=HLL_PRECISION):
+        """
+        --------------------
+        Description
+        --------------------
+        -> from_chunks (method): Class method that builds a sketch from streamed chunks of values, e.g. the chunks of a column read by run_query_chunks(), without holding the whole column
+
+        --------------------
+        Parameters
+        --------------------
+        -> chunks (iterable): The chunks of values (pd.Series).
+        -> precision (int): Number of bits of the hash choosing the register of a value (default: HLL_PRECISION).
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        -> Create an empty sketch and add every chunk to it (update()).
+
+        --------------------
+        Returns
+        --------------------
+        -> (HyperLogLog): The sketch of all the values.
+
+        """
+        sketch = cls(precision)
+        for chunk in chunks:
+            sketch.update(chunk)
+        return sketch
+
+
+def get_distinct_count(serie, exact=None, precision=HLL_PRECISION):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_distinct_count (function): Function that counts the distinct non-null values of a serie, exactly for small series and with a HyperLogLog sketch otherwise
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): The values of the column.
+    -> exact (bool): True to always count exactly, False to always estimate, None to count exactly only the series of at most DISTINCT_EXACT_MAX_ROWS values (default: None).
+    -> precision (int): Number of bits of the hash choosing the register of a value (default: HLL_PRECISION).
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> If the count is exact, return nunique() with an error of 0.
+    -> Otherwise build a sketch from chunks of HLL_CHUNKSIZE values (HyperLogLog.from_chunks()), so that only one chunk of hashes is held at a time, and return its estimate and standard error.
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): The number of distinct values and its standard error.
+
+    """
+    if exact or (exact is None and len(serie) <= DISTINCT_EXACT_MAX_ROWS):
+        return int(serie.nunique()), 0.0
+    sketch = HyperLogLog.from_chunks((serie.iloc[start:start + HLL_CHUNKSIZE] for start in range(0, len(serie), HLL_CHUNKSIZE)), precision)
+    return sketch.estimate(), sketch.error_bound()
+
+def format_estimate(value, error):
+    """
+    --------------------
+    Description
+    --------------------
+    -> format_estimate (function): Function that formats a metric with its standard error if it is estimated
+
+    --------------------
+    Parameters
+    --------------------
+    -> value (object): The value of the metric.
+    -> error (float): Its standard error, None or 0 if the value is exact.
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    -> Return the value unchanged if it is exact, otherwise the value followed by '± <error>'.
+
+    --------------------
+    Returns
+    --------------------
+    -> (object): The value, or the formatted estimate (str).
+
+    """
+    if not error:
+        return value
+    return f'{value} ± {error:.0f}'
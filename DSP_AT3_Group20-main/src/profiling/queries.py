@@ -0,0 +1,55 @@
+def quote_identifier(name):
+    """
+    --------------------
+    Description
+    --------------------
+    -> quote_identifier (method): Function that quotes a column name so that it can be embedded in a query, with the same output as psycopg2.sql.Identifier (which needs a connection to be rendered)
+
+    --------------------
+    Parameters
+    --------------------
+    name(str): The column name of the selected column in the target database
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Double every double quote of the name and wrap the name in double quotes
+
+    --------------------
+    Returns
+    --------------------
+    (str): The quoted identifier
+
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+def get_frequency_query(schema_name, table_name, col_name, top_k):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_frequency_query (method): Function that returns the query used for computing the most frequent values of a column from a Postgres table, together with the number of non-null and distinct values
+
+    --------------------
+    Parameters
+    --------------------
+    schema_name(str): The schema name of the selected table in the target database
+    table_name(str): The table name of the selected table in the target database
+    col_name(str): The column name of the selected column in the target database
+    top_k(int): The number of most frequent values returned
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Group the non-null values of the quoted column and count the rows of each group
+    Sum the counts of every group and count the groups with window functions, evaluated before the limit, to get the number of non-null and distinct values
+    Order the groups by decreasing count and keep the first top_k ones
+
+    --------------------
+    Returns
+    --------------------
+    (str): SQL query returning the columns value, occurrence, total and n_distinct, one row per value
+
+    """
+    col = quote_identifier(col_name)
+    return f'select {col} as value, count(*) as occurrence, sum(count(*)) over () as total, count(*) over () as n_distinct from {schema_name}.{table_name} where {col} is not null group by 1 order by 2 desc, 1 limit {int(top_k)}'
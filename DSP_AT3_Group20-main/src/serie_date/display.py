@@ -1,6 +1,8 @@
 import streamlit as st
 
-from src.serie_date.logics import DateColumn
+from src.serie_date.logics import DateColumn, get_date_profiles
+from src.dataframe.display import display_sample_caption, display_column_toggles
+from src.profiling.logics import DISTINCT_EXACT
 
 
 def display_dates():
@@ -19,10 +21,14 @@ def display_dates():
     Pseudo-Code
     --------------------
     Extract dataset class in the session state and store it as a variable
-    Call set_date_columns method to set the attributes values
+    Call set_date_columns method to set the attributes values, only if they are not computed yet for the loaded table (get_metric())
     Create a variable to store the column names 
+    Display a caption if the dataset is a sample
     If there is date col in the dataframe
-    Set corresponding expanders and display the relevant information
+    Display a checkbox for every column, in the order of the columns (display_column_toggles())
+    When columns are ticked for the first time, compute the metrics of all the datetime columns with a single query (one per batch of columns, run concurrently)
+    and instantiate a DateColumn class for each newly ticked column, computing their information with a single call to the executor of the session, all memoised in the dataset class
+    Display the relevant information of the ticked columns below their checkbox
 
     --------------------
     Returns
@@ -32,15 +38,19 @@ def display_dates():
 
     """
     data = st.session_state.data
-    data.set_date_columns()
+    data.get_metric('set_date_columns')
     date_cols = data.date_cols
+    display_sample_caption()
 
     if date_cols is not None:
-        for col in date_cols:
-            with st.expander(col, expanded=False):
-                display_date(col, None)
+        exact_distinct = st.session_state.get('exact_distinct', DISTINCT_EXACT)
+        new_column = lambda col: DateColumn(st.session_state.schema_selected, st.session_state.table_selected, col, st.session_state.db, data.df[col], data.is_sample, exact_distinct)
+        get_profiles = lambda executor: get_date_profiles(st.session_state.db, st.session_state.schema_selected, st.session_state.table_selected, date_cols, executor, exact_distinct)
+        for col, container, date_column in display_column_toggles('date', date_cols, new_column, get_profiles, 'set_date_columns'):
+            with container:
+                display_date(col, None, date_column)
 
-def display_date(col_name, i):
+def display_date(col_name, i, date_column=None):
     """
     --------------------
     Description
@@ -52,15 +62,17 @@ def display_date(col_name, i):
     --------------------
     col_name(str): column name to create the DateColumn class
     i(str): not used 
+    date_column(DateColumn): DateColumn class whose information is already computed (optional)
 
     --------------------
     Pseudo-Code
     --------------------
-    Initiate a DateColumn class with provided parameters in the session state and store it as a new variable
-    Call set_data method of the DateColumn class
+    If no date_column is provided, initiate a DateColumn class with provided parameters in the session state and call its set_data method
+    Show a warning if the number of unique values could not be counted
     Call get_summary_df of the DateColumn class and show it as a static table in the streamlit app
     Set a bar chart title
-    Show the barchart which is created using altair package in the streamlit app
+    Show the barchart of the number of dates by period which is created using altair package in the streamlit app
+    Display the period the dates are counted by, and the runs of empty periods if there are any
     Set a title for the following dataframe
     Call frequent method of the DateColumn class and show it in the streamlit app
 
@@ -70,10 +82,17 @@ def display_date(col_name, i):
     None
 
     """
-    date_column = DateColumn(st.session_state.schema_selected, st.session_state.table_selected, col_name, st.session_state.db, st.session_state.data.df[col_name])
-    date_column.set_data()
+    if date_column is None:
+        date_column = DateColumn(st.session_state.schema_selected, st.session_state.table_selected, col_name, st.session_state.db, st.session_state.data.df[col_name], st.session_state.data.is_sample, st.session_state.get('exact_distinct', DISTINCT_EXACT))
+        date_column.set_data()
+    if date_column.unique_msg is not None:
+        st.warning(date_column.unique_msg)
     st.table(date_column.get_summary_df())
     st.text('Bar Chart')
     st.altair_chart(date_column.barchart)
+    if date_column.granularity is not None:
+        st.caption(f'Dates counted by {date_column.granularity}, {len(date_column.date_gaps)} gap(s) of empty periods')
+    if date_column.date_gaps is not None and len(date_column.date_gaps) > 0:
+        st.dataframe(date_column.date_gaps)
     st.text('Most Frequent Values')
     st.dataframe(date_column.frequent)
\ No newline at end of file
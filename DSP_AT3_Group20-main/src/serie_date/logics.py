@@ -1,8 +1,332 @@
-import datetime
+import os
+import numpy as np
 import pandas as pd
 import altair as alt
 
-from src.serie_date.queries import get_min_date_query, get_weekend_count_query, get_1900_count_query
+from src.serie_date.queries import get_min_date_query, get_weekend_count_query, get_1900_count_query, get_date_profile_query, get_date_buckets_query, DATE_PROFILE_METRICS
+from src.dataframe.logics import set_metrics_basis, get_column_profiles, split_column_profiles
+from src.profiling.logics import MetricGraph, FrequencyTable, FREQUENCY_TOP_K, get_distinct_count, format_estimate, DISTINCT_EXACT
+
+# Placeholder dates counted by get_date_stats(), displayed by DateColumn and counted in SQL by the n_empty_1900 and n_empty_1970 aggregates of DATE_PROFILE_METRICS
+DATE_SENTINELS = ['1900-01-01', '1970-01-01']
+DAY_NS = 86400 * 10**9
+# 1970-01-01 was a Thursday, day 4 of the week as numbered by Postgres extract(dow) (0 = Sunday)
+EPOCH_DOW = 4
+# Maximum number of periods displayed by the bar chart of a datetime column
+DATE_MAX_BUCKETS = int(os.environ.get('DATE_MAX_BUCKETS', 100))
+# Periods the dates can be counted by, from the finest to the coarsest, with their approximate duration and their pandas frequency (weeks start on Monday as with date_trunc())
+DATE_GRANULARITIES = {
+    'hour': (pd.Timedelta(hours=1), 'H'),
+    'day': (pd.Timedelta(days=1), 'D'),
+    'week': (pd.Timedelta(days=7), 'W-MON'),
+    'month': (pd.Timedelta(days=30.44), 'MS'),
+    'quarter': (pd.Timedelta(days=91.31), 'QS'),
+    'year': (pd.Timedelta(days=365.25), 'YS'),
+    'decade': (pd.Timedelta(days=3652.5), '10YS')
+}
+
+def get_date_profiles(db, schema_name, table_name, col_names, executor=None, exact_distinct=True):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_date_profiles (function): Function that computes the metrics of all the datetime columns of a table with a single SQL query (get_date_profile_query())
+
+    --------------------
+    Parameters
+    --------------------
+    db(PostgresConnector): Instantation of PostgresConnector class for handling Postgres connection
+    schema_name(str): The schema name of the selected table in the target database
+    table_name(str): The table name of the selected table in the target database
+    col_names(list): The names of the datetime columns of the selected table
+    executor(ProfilingExecutor): Executor used for profiling batches of columns concurrently (optional)
+    exact_distinct(bool): Whether the distinct values are counted exactly by the query, otherwise they are left to DateColumn.set_unique() (default: True)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Unless the distinct values are counted exactly, drop the unique aggregate from the metrics
+    Build the fused query of these metrics for the whole table
+    Run it once and split its single row into one profile per column (get_column_profiles())
+    If an executor is provided, split the columns into batches and run the queries of all the batches at the same time (ProfilingExecutor.map_queries())
+
+    --------------------
+    Returns
+    --------------------
+    (dict): Profile of each column, as a dictionary of metric values keyed by the DateColumn attribute names
+
+    """
+    metrics = DATE_PROFILE_METRICS if exact_distinct else {name: metric for name, metric in DATE_PROFILE_METRICS.items() if name != 'unique'}
+    if executor is None:
+        return get_column_profiles(db, get_date_profile_query(schema_name, table_name, col_names, metrics), col_names, metrics)
+    return executor.map_queries(lambda batch: get_date_profile_query(schema_name, table_name, batch, metrics), lambda df, batch: split_column_profiles(df, batch, metrics), col_names)
+
+def get_date_stats(serie, sentinels=DATE_SENTINELS, now=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_date_stats (function): Function that computes the statistics of a datetime serie directly on its buffer of int64 nanoseconds since 1970-01-01,
+     with the same rules as the SQL queries (extract(dow), date(), now())
+
+    --------------------
+    Parameters
+    --------------------
+    serie(pd.Series): The datetime serie (values which are not datetimes are converted with pd.to_datetime())
+    sentinels(list): The placeholder dates to count, as YYYY-MM-DD strings (default: DATE_SENTINELS)
+    now(pd.Timestamp): The current time the future dates are compared to (default: the time of the call)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Convert the serie to datetime64 if needed and take its int64 buffer once, the dates with a timezone being read as their local time (as Postgres does in the session timezone)
+    Drop the missing values (NaT)
+    Compute the minimum and maximum
+    Compute the day of each date (floor division by the number of nanoseconds of a day, also correct before 1970), and from it the day of the week numbered as extract(dow)
+    Count the dates of each day of the week with a single bincount, and derive the weekend (0 and 6) and weekday (1 to 5) counts
+    Count the dates whose day equals each sentinel date
+    Count the dates after now, comparing UTC instants for the dates with a timezone
+
+    --------------------
+    Returns
+    --------------------
+    (dict): n_rows, n_missing, col_min, col_max, n_future, n_weekend, n_weekday, dow_counts (count of each day of the week, 0 = Sunday)
+     and sentinels (count of each sentinel date); the minimum and maximum of a serie without date are None
+
+    """
+    if not pd.api.types.is_datetime64_any_dtype(serie):
+        serie = pd.to_datetime(serie)
+    tz = getattr(serie.dt, 'tz', None)
+    local = serie.dt.tz_localize(None) if tz is not None else serie
+    ns = local.to_numpy(dtype='datetime64[ns]').view('int64')
+    valid = ns != np.iinfo('int64').min
+    stats = {'n_rows': len(ns), 'n_missing': int(len(ns) - np.count_nonzero(valid))}
+    ns = ns[valid]
+    days = ns // DAY_NS
+    dow_counts = np.bincount((days + EPOCH_DOW) % 7, minlength=7)
+    stats['dow_counts'] = dow_counts.tolist()
+    stats['n_weekend'] = int(dow_counts[0] + dow_counts[6])
+    stats['n_weekday'] = int(dow_counts[1:6].sum())
+    stats['sentinels'] = {date: int(np.count_nonzero(days == pd.Timestamp(date).value // DAY_NS)) for date in sentinels}
+    if tz is not None:
+        instants = serie.dt.tz_convert(None).to_numpy(dtype='datetime64[ns]').view('int64')[valid]
+        now = pd.Timestamp.now(tz='UTC') if now is None else now
+        now_ns = now.tz_convert(None).value
+    else:
+        instants = ns
+        now_ns = (pd.Timestamp.now() if now is None else now).value
+    stats['n_future'] = int(np.count_nonzero(instants > now_ns))
+    stats['col_min'], stats['col_max'] = None, None
+    if len(ns) > 0:
+        stats['col_min'], stats['col_max'] = pd.Timestamp(ns.min()), pd.Timestamp(ns.max())
+        if tz is not None:
+            stats['col_min'], stats['col_max'] = stats['col_min'].tz_localize(tz), stats['col_max'].tz_localize(tz)
+    return stats
+
+def truncate_dates(serie, granularity):
+    """
+    --------------------
+    Description
+    --------------------
+    -> truncate_dates (function): Function that truncates every date of a serie to the start of its period, as Postgres date_trunc() does
+
+    --------------------
+    Parameters
+    --------------------
+    serie(pd.Series): The datetime serie, without missing values
+    granularity(str): The period the dates are truncated to (key of DATE_GRANULARITIES)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Convert the serie to datetime64 if needed and keep the local time of the dates with a timezone
+    Floor the dates to the hour or the day, or go back to the Monday of their week
+    For longer periods, rebuild the first day of the month, quarter, year or decade from the year and the month of the dates
+
+    --------------------
+    Returns
+    --------------------
+    (pd.Series): The start of the period of every date, without timezone
+
+    """
+    dates = serie if pd.api.types.is_datetime64_any_dtype(serie) else pd.to_datetime(serie)
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    if granularity in ('hour', 'day'):
+        return dates.dt.floor(DATE_GRANULARITIES[granularity][1])
+    if granularity == 'week':
+        return dates.dt.normalize() - pd.to_timedelta(dates.dt.dayofweek, unit='D')
+    year, month = dates.dt.year, dates.dt.month
+    if granularity == 'quarter':
+        month = (month - 1) // 3 * 3 + 1
+    elif granularity in ('year', 'decade'):
+        month = month * 0 + 1
+        year = year // 10 * 10 if granularity == 'decade' else year
+    return pd.to_datetime(pd.DataFrame({'year': year, 'month': month, 'day': 1}))
+
+def get_date_granularity(col_min, col_max, max_buckets=DATE_MAX_BUCKETS):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_date_granularity (function): Function that chooses the finest period giving at most max_buckets periods between two dates
+
+    --------------------
+    Parameters
+    --------------------
+    col_min(pd.Timestamp): The earliest date of the column
+    col_max(pd.Timestamp): The latest date of the column
+    max_buckets(int): The maximum number of periods (default: DATE_MAX_BUCKETS)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Return None if the column has no date
+    For every period of DATE_GRANULARITIES, from the finest: skip it if the span divided by its approximate duration already exceeds max_buckets,
+    otherwise count the periods between the truncated earliest and latest dates exactly and return it if there are at most max_buckets of them
+    Return the coarsest period (decade) if no period is coarse enough
+
+    --------------------
+    Returns
+    --------------------
+    (str): The name of the period
+
+    """
+    if pd.isnull(col_min) or pd.isnull(col_max):
+        return None
+    span = truncate_dates(pd.Series([col_max]), 'hour').iloc[0] - truncate_dates(pd.Series([col_min]), 'hour').iloc[0]
+    for granularity, (duration, freq) in DATE_GRANULARITIES.items():
+        if span / duration > max_buckets:
+            continue
+        bounds = truncate_dates(pd.Series([col_min, col_max]), granularity)
+        if len(pd.date_range(bounds.iloc[0], bounds.iloc[1], freq=freq)) <= max_buckets:
+            return granularity
+    return granularity
+
+def fill_date_gaps(counts, granularity):
+    """
+    --------------------
+    Description
+    --------------------
+    -> fill_date_gaps (function): Function that adds the empty periods between the periods counted, so that the gaps of a datetime column are visible
+
+    --------------------
+    Parameters
+    --------------------
+    counts(pd.Series): The number of dates of every non-empty period, indexed by the start of the period
+    granularity(str): The period the dates have been truncated to (key of DATE_GRANULARITIES)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Reindex the counts on every period between the first and the last one (pd.date_range()), the missing periods having a count of 0
+
+    --------------------
+    Returns
+    --------------------
+    (pd.DataFrame): The columns period and count, one row per period in chronological order
+
+    """
+    if len(counts) == 0:
+        return pd.DataFrame({'period': pd.Series([], dtype='datetime64[ns]'), 'count': pd.Series([], dtype='int64')})
+    counts = counts.groupby(pd.to_datetime(counts.index)).sum()
+    periods = pd.date_range(counts.index.min(), counts.index.max(), freq=DATE_GRANULARITIES[granularity][1])
+    counts = counts.reindex(periods, fill_value=0).astype('int64')
+    return pd.DataFrame({'period': counts.index, 'count': counts.to_numpy()})
+
+def get_date_buckets(serie, granularity):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_date_buckets (function): Function that counts the dates of a datetime serie already loaded by period
+
+    --------------------
+    Parameters
+    --------------------
+    serie(pd.Series): The datetime serie
+    granularity(str): The period the dates are counted by (key of DATE_GRANULARITIES)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Truncate the non-missing dates to their period (truncate_dates()), as the Postgres query does (get_date_buckets_query()), and count them
+    Add the empty periods (fill_date_gaps())
+
+    --------------------
+    Returns
+    --------------------
+    (pd.DataFrame): The columns period and count, one row per period in chronological order
+
+    """
+    dates = serie.dropna()
+    if len(dates) == 0:
+        return fill_date_gaps(pd.Series([], dtype='int64'), granularity)
+    return fill_date_gaps(truncate_dates(dates, granularity).value_counts(), granularity)
+
+def get_table_date_buckets(db, schema_name, table_name, col_name, granularity):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_table_date_buckets (function): Function that counts the dates of a datetime column over the whole Postgres table by period, the counting being done by Postgres
+
+    --------------------
+    Parameters
+    --------------------
+    db(PostgresConnector): Instantation of PostgresConnector class for handling Postgres connection
+    schema_name(str): The schema name of the selected table in the target database
+    table_name(str): The table name of the selected table in the target database
+    col_name(str): The column name of the selected column in the target database
+    granularity(str): The period the dates are counted by (key of DATE_GRANULARITIES)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Run the query counting the dates by period with date_trunc() (get_date_buckets_query()), which only returns one row per non-empty period
+    Add the empty periods (fill_date_gaps())
+
+    --------------------
+    Returns
+    --------------------
+    (pd.DataFrame): The columns period and count, one row per period in chronological order
+
+    """
+    df = db.run_query(get_date_buckets_query(schema_name, table_name, col_name, granularity))
+    if len(df) == 0:
+        return fill_date_gaps(pd.Series([], dtype='int64'), granularity)
+    return fill_date_gaps(pd.Series(df['count'].to_numpy(), index=pd.to_datetime(df['period'])), granularity)
+
+def get_date_gaps(buckets):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_date_gaps (function): Function that finds the runs of consecutive empty periods of a datetime column
+
+    --------------------
+    Parameters
+    --------------------
+    buckets(pd.DataFrame): The columns period and count, one row per period in chronological order (get_date_buckets())
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Number the runs of consecutive periods that are all empty or all non-empty
+    For every run of empty periods, keep its first and last period and its number of periods
+
+    --------------------
+    Returns
+    --------------------
+    (pd.DataFrame): The columns start, end and periods, one row per gap
+
+    """
+    empty = buckets['count'] == 0
+    runs = (empty != empty.shift()).cumsum()
+    gaps = buckets[empty].groupby(runs[empty])['period'].agg(['min', 'max', 'size'])
+    gaps.columns = ['start', 'end', 'periods']
+    return gaps.reset_index(drop=True)
+
 
 class DateColumn:
     """
@@ -20,6 +344,8 @@ class DateColumn:
     -> db (PostgresConnector): Instantation of PostgresConnector class for handling Postgres connection (mandatory)
     -> serie (pd.Series): Pandas serie where the content of a column has been loaded (mandatory)
     -> n_unique (int): Number of unique value of a serie (optional)
+    -> unique_error (float): Standard error of the number of unique values when it is estimated with a HyperLogLog sketch, 0 or None when it is exact (optional)
+    -> unique_msg (str): Why the number of unique values could not be computed, None when it is set (optional)
     -> n_missing (int): Number of missing values of a serie (optional)
     -> col_min (int): Minimum value of a serie (optional)
     -> col_max (int): Maximum value of a serie (optional)
@@ -28,17 +354,37 @@ class DateColumn:
     -> n_future (int): Number of times a serie has dates falling in the future (optional)
     -> n_empty_1900 (int): Number of times a serie has dates equal to '1900-01-01' (optional)
     -> n_empty_1970 (int): Number of times a serie has dates equal to '1970-01-01' (optional)
-    -> barchart (int): Altair barchart displaying the count for each value of a serie (optional)
+    -> barchart (int): Altair barchart displaying the count of dates of each period of a serie (optional)
+    -> granularity (str): Period the dates are counted by in the barchart, chosen from the span of the serie (optional)
+    -> date_buckets (pd.DataFrame): Number of dates of every period, including the empty ones (optional)
+    -> date_gaps (pd.DataFrame): First and last period of every run of empty periods (optional)
     -> frequent (int): Dataframe containing the most frequest value of a serie (optional)
+    -> is_sample (bool): Whether serie only contains a sample of the table rows (optional)
+    -> exact_distinct (bool): Whether the distinct values are always counted exactly, rather than estimated with a HyperLogLog sketch for large or sampled series (optional, DISTINCT_EXACT by default)
+    -> exact_metrics (list): Descriptions of the metrics computed in SQL on the whole table, which are exact even when serie is a sample
+    -> profile_metrics (list): Descriptions of the metrics computed by the fused profile query (get_date_profile_query())
+    -> metrics (MetricGraph): Metrics computed so far, each computed once from self.serie (or set from the profile) and reused
 
     """
-    def __init__(self, schema_name=None, table_name=None, col_name=None, db=None, serie=None):
+    exact_metrics = ['Number of Weekend Dates', 'Number of Rows with 1900-01-01', 'Minimum Value']
+    profile_metrics = ['Number of Unique Values', 'Number of Rows with Missing Values', 'Number of Weekend Dates', 'Number of Weekday Dates', 'Number of Dates in Future', 'Number of Rows with 1900-01-01', 'Number of Rows with 1970-01-01', 'Minimum Value', 'Maximum Value']
+    # Methods setting the metrics of the fused profile query, then the ones computed from self.serie, with the metrics (or 'serie') they are computed from
+    profile_methods = ['set_unique', 'set_missing', 'set_min', 'set_max', 'set_weekend', 'set_weekday', 'set_future', 'set_empty_1900', 'set_empty_1970']
+    metric_methods = profile_methods + ['set_barchart', 'set_frequent']
+    metric_dependencies = {'frequency_table': ('serie',), 'set_barchart': ('serie', 'set_min', 'set_max'), 'set_frequent': ('frequency_table',), 'compute_stats': ('serie',)}
+    metric_dependencies.update({method: ('compute_stats',) for method in ['set_missing', 'set_min', 'set_max', 'set_weekend', 'set_weekday', 'set_future', 'set_empty_1900', 'set_empty_1970']})
+
+    def __init__(self, schema_name=None, table_name=None, col_name=None, db=None, serie=None, is_sample=False, exact_distinct=DISTINCT_EXACT):
         self.schema_name = schema_name
         self.table_name = table_name
         self.col_name = col_name
         self.db = db
         self.serie = serie
+        self.is_sample = is_sample
+        self.exact_distinct = exact_distinct
         self.unique = None
+        self.unique_error = None
+        self.unique_msg = None
         self.n_missing = None
         self.col_min = None
         self.col_max = None
@@ -48,9 +394,13 @@ class DateColumn:
         self.n_empty_1900 = None
         self.n_empty_1970 = None
         self.barchart = None
+        self.granularity = None
+        self.date_buckets = None
+        self.date_gaps = None
         self.frequent = None
+        self.metrics = MetricGraph(self, self.metric_dependencies)
 
-    def set_data(self):
+    def set_data(self, profile=None):
         """
         --------------------
         Description
@@ -60,12 +410,46 @@ class DateColumn:
         --------------------
         Parameters
         --------------------
+        profile(dict): Metrics of the column already computed by get_date_profiles() (optional)
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        If a profile is provided, set the metrics from it without any query
+        Call relevant methods to set the attributes through self.metrics, which skips the metrics already computed (or set from the profile)
+        Compute the barchart and the most frequent values from self.serie, sharing a single count of the values
+
+        --------------------
+        Returns
+        --------------------
         None
 
+        """
+        if profile is not None:
+            self.set_profile(profile)
+        for method in self.metric_methods:
+            self.metrics.get(method)
+
+    def set_profile(self, profile):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_profile (method): Class method that sets the metrics of the column from its profile computed in SQL on the whole table
+
+        --------------------
+        Parameters
+        --------------------
+        profile(dict): Metrics of the column computed by get_date_profiles()
+
         --------------------
         Pseudo-Code
         --------------------
-        Call relevant methods to set the attributes
+        Set each attribute from the value of the profile with the same name
+        Convert the minimum and maximum values to datetime type
+        As all these metrics are computed on the whole table, mark them as exact
+        Mark the methods computing these metrics as computed in self.metrics, so that set_data() does not run them
+        If the profile has no number of unique values (get_date_profiles() without exact_distinct), leave it to set_unique() and do not mark it as exact
 
         --------------------
         Returns
@@ -73,17 +457,16 @@ class DateColumn:
         None
 
         """
-        self.set_unique()
-        self.set_missing()
-        self.set_min()
-        self.set_max()
-        self.set_weekend()
-        self.set_weekday()
-        self.set_future()
-        self.set_empty_1900()
-        self.set_empty_1970()
-        self.set_barchart()
-        self.set_frequent()
+        for metric in DATE_PROFILE_METRICS:
+            if metric in profile:
+                setattr(self, metric, profile[metric])
+        self.col_min = pd.to_datetime(self.col_min)
+        self.col_max = pd.to_datetime(self.col_max)
+        has_unique = 'unique' in profile
+        self.exact_metrics = [metric for metric in self.profile_metrics if has_unique or metric != 'Number of Unique Values']
+        for method in self.profile_methods:
+            if has_unique or method != 'set_unique':
+                self.metrics.set(method)
 
     def is_serie_none(self):
         """
@@ -120,7 +503,7 @@ class DateColumn:
         else:
             return False
 
-    def set_unique(self):
+    def set_unique(self, exact=None):
         """
         --------------------
         Description
@@ -130,12 +513,13 @@ class DateColumn:
         --------------------
         Parameters
         --------------------
-        None
+        exact(bool): True to count exactly, False to estimate with a HyperLogLog sketch, None to count exactly only small series (default: None, or True if self.exact_distinct, see get_distinct_count())
 
         --------------------
         Pseudo-Code
         --------------------
-        Call nunique method of pandas serie and set the attribute
+        Count the distinct values of the serie, exactly for small series and with a HyperLogLog sketch otherwise (get_distinct_count())
+        Set the attributes, or leave them unset and keep the reason in unique_msg if the values cannot be counted
 
         --------------------
         Returns
@@ -143,7 +527,13 @@ class DateColumn:
         None
 
         """
-        self.unique = self.serie.nunique()
+        if exact is None and self.exact_distinct:
+            exact = True
+        try:
+            self.unique, self.unique_error = get_distinct_count(self.serie, exact)
+        except (TypeError, ValueError) as e:
+            self.unique, self.unique_error = None, None
+            self.unique_msg = f'The number of unique values of {self.col_name} could not be counted: {e}'
 
     def set_missing(self):
         """
@@ -161,7 +551,7 @@ class DateColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Sum the count of the null value in the pandas serie and set the corresponding attribute
+        Get the count of the null values of the pandas serie from the datetime kernel (compute_stats()) and set the corresponding attribute
 
         --------------------
         Returns
@@ -170,14 +560,14 @@ class DateColumn:
         -> (type): description
 
         """
-        self.n_missing = pd.isnull(self.serie).sum()
+        self.n_missing = self.metrics.get('compute_stats')['n_missing']
 
     def set_min(self):
         """
         --------------------
         Description
         --------------------
-        -> set_min (method): Class method that computes the minimum value of a serie using a SQL query (get_min_date_query())
+        -> set_min (method): Class method that computes the minimum value of a serie, using a SQL query (get_min_date_query()) when the serie is a sample
 
         --------------------
         Parameters
@@ -187,7 +577,8 @@ class DateColumn:
         --------------------
         Pseudo-Code
         --------------------
-        In the database class run the relevant query to retrieve the minimum value in the serie and store the value in a new variable 
+        If the serie holds the whole column, get its minimum value from the datetime kernel (compute_stats())
+        Otherwise in the database class run the relevant query to retrieve the minimum value in the serie and store the value in a new variable 
         Convert the minimum value in the column to datetime type and set the relevant attribute
 
         --------------------
@@ -197,8 +588,11 @@ class DateColumn:
         -> (type): description
 
         """
-        col_min = self.db.run_query(get_min_date_query(self.schema_name, self.table_name, self.col_name)).iloc[0]['min_date']
-        self.col_min = pd.to_datetime(col_min)
+        if self.serie is not None and not self.is_sample:
+            self.col_min = self.metrics.get('compute_stats')['col_min']
+        else:
+            col_min = self.db.run_query(get_min_date_query(self.schema_name, self.table_name, self.col_name)).iloc[0]['min_date']
+            self.col_min = pd.to_datetime(col_min)
 
     def set_max(self):
         """
@@ -215,7 +609,7 @@ class DateColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Max function to get the maximum value in that data.serie and set the relevant attribute
+        Get the maximum value of the serie from the datetime kernel (compute_stats()) and set the relevant attribute
 
         --------------------
         Returns
@@ -223,14 +617,14 @@ class DateColumn:
         None
 
         """
-        self.col_max = max(self.serie)
+        self.col_max = self.metrics.get('compute_stats')['col_max']
 
     def set_weekend(self):
         """
         --------------------
         Description
         --------------------
-        -> set_weekend (method): Class method that computes the number of times a serie has dates falling during weekend using a SQL query (get_weekend_count_query())
+        -> set_weekend (method): Class method that computes the number of times a serie has dates falling during weekend, using a SQL query (get_weekend_count_query()) when the serie is a sample
 
         --------------------
         Parameters
@@ -240,7 +634,8 @@ class DateColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Run the relevant query in the database class 
+        If the serie holds the whole column, get the count of dates falling on Saturday or Sunday from the datetime kernel (compute_stats())
+        Otherwise run the relevant query in the database class 
         Get the value of the dataframe result
         Set the attribute
 
@@ -250,7 +645,10 @@ class DateColumn:
         None
 
         """
-        self.n_weekend = self.db.run_query(get_weekend_count_query(self.schema_name, self.table_name, self.col_name)).iloc[0]['count']
+        if self.serie is not None and not self.is_sample:
+            self.n_weekend = self.metrics.get('compute_stats')['n_weekend']
+        else:
+            self.n_weekend = self.db.run_query(get_weekend_count_query(self.schema_name, self.table_name, self.col_name)).iloc[0]['count']
 
     def set_weekday(self):
         """
@@ -267,14 +665,14 @@ class DateColumn:
         --------------------
         Pseudo-Code
         --------------------
-        The length of the serie minus the number of weekend and set the attribute 
+        Count the dates of the serie falling from Monday to Friday (compute_stats()) and set the attribute, missing dates (NaT) being neither weekdays nor weekend days as in the SQL profile
 
         --------------------
         Returns
         --------------------
         None
         """
-        self.n_weekday = len(self.serie) - self.n_weekend
+        self.n_weekday = self.metrics.get('compute_stats')['n_weekday']
 
     def set_future(self):
         """
@@ -291,7 +689,7 @@ class DateColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Subset the serie to get a dataframe stores only dates larger than today and set the attribute
+        Get the count of dates larger than now from the datetime kernel (compute_stats()) and set the attribute
 
 
         --------------------
@@ -300,14 +698,14 @@ class DateColumn:
         None
 
         """
-        self.n_future = self.serie[self.serie > datetime.datetime.now()].count()
+        self.n_future = self.metrics.get('compute_stats')['n_future']
 
     def set_empty_1900(self):
         """
         --------------------
         Description
         --------------------
-        -> set_empty_1900 (method): Class method that computes the number of times a serie has dates equal to '1900-01-01' using a SQL query (get_1900_count_query())
+        -> set_empty_1900 (method): Class method that computes the number of times a serie has dates equal to '1900-01-01', using a SQL query (get_1900_count_query()) when the serie is a sample
 
         --------------------
         Parameters
@@ -317,7 +715,8 @@ class DateColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Run the relevant query in the database class 
+        If the serie holds the whole column, get the count of dates on 1900-01-01 from the datetime kernel (compute_stats())
+        Otherwise run the relevant query in the database class 
         Get the value of the result dataframe
         Set the attribute
 
@@ -327,7 +726,10 @@ class DateColumn:
         None
 
         """
-        self.n_empty_1900 = self.db.run_query(get_1900_count_query(self.schema_name, self.table_name, self.col_name)).iloc[0]['count']
+        if self.serie is not None and not self.is_sample:
+            self.n_empty_1900 = self.metrics.get('compute_stats')['sentinels']['1900-01-01']
+        else:
+            self.n_empty_1900 = self.db.run_query(get_1900_count_query(self.schema_name, self.table_name, self.col_name)).iloc[0]['count']
 
     def set_empty_1970(self):
         """
@@ -344,8 +746,7 @@ class DateColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Subset the serie to get a serie which has a date value equals to 1970-01-01
-        Count the rows of the serie
+        Get the count of dates (whatever their time) on 1970-01-01 from the datetime kernel (compute_stats())
         Set the attribute
 
         --------------------
@@ -354,14 +755,39 @@ class DateColumn:
         None
 
         """
-        self.n_empty_1970 = self.serie[self.serie == datetime.datetime(1970,1,1)].count()
+        self.n_empty_1970 = self.metrics.get('compute_stats')['sentinels']['1970-01-01']
         
-    def set_barchart(self):  
+    def compute_stats(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> compute_stats (method): Class method that computes the statistics of self.serie with the datetime kernel, shared by the metric methods
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Return the result of get_date_stats() on the serie for the DATE_SENTINELS dates, computed once through self.metrics ('compute_stats')
+
+        --------------------
+        Returns
+        --------------------
+        (dict): The statistics of the serie (see get_date_stats())
+
+        """
+        return get_date_stats(self.serie, DATE_SENTINELS)
+
+    def frequency_table(self):
         """
         --------------------
         Description
         --------------------
-        -> set_barchart (method): Class method that computes the Altair barchart displaying the count for each value of a serie
+        -> frequency_table (method): Class method that counts the occurrences of each value of the column, shared by the chart and the most frequent values
 
         --------------------
         Parameters
@@ -371,9 +797,40 @@ class DateColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Get a dataframe which store the count of unique values in the serie
-        Reset the index for convenience of plotting
-        Use altair package to plot a bar chart and set the attribute
+        If the serie is a sample and FREQUENCY_TOP_K is positive, count the FREQUENCY_TOP_K most frequent values of the whole table with a single grouped query (FrequencyTable.from_query())
+        Otherwise count every value of the serie (FrequencyTable.from_serie())
+        Computed once through self.metrics ('frequency_table')
+
+        --------------------
+        Returns
+        --------------------
+        (FrequencyTable): The number of occurrences of each value, by decreasing number
+
+        """
+        if FREQUENCY_TOP_K > 0 and self.is_sample and self.db is not None:
+            return FrequencyTable.from_query(self.db, self.schema_name, self.table_name, self.col_name, FREQUENCY_TOP_K)
+        return FrequencyTable.from_serie(self.serie)
+
+    def set_barchart(self, max_buckets=DATE_MAX_BUCKETS):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_barchart (method): Class method that computes the Altair barchart displaying the count of dates of each period of a serie
+
+        --------------------
+        Parameters
+        --------------------
+        max_buckets(int): The maximum number of periods displayed (default: DATE_MAX_BUCKETS)
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Choose the period (hour, day, week, month, quarter, year or decade) from the minimum and maximum values (get_date_granularity())
+        If the serie holds the whole column, count its dates by period (get_date_buckets())
+        Otherwise count the dates of the whole table by period in Postgres with date_trunc() (get_table_date_buckets()), so that the gaps are not the ones of the sample
+        Find the runs of empty periods (get_date_gaps())
+        Use altair package to plot a bar chart of the periods and set the attributes
 
         --------------------
         Returns
@@ -381,12 +838,20 @@ class DateColumn:
         None 
 
         """
-        df = pd.DataFrame(self.serie.value_counts())
-        df = df.reset_index()
-        print(df)
-        self.barchart = alt.Chart(df).mark_bar().encode(
-            x = alt.X('index', title =f'{self.col_name}'),
-            y = alt.Y(f'{self.col_name}', title='Count of Records')
+        self.metrics.get('set_min')
+        self.metrics.get('set_max')
+        self.granularity = get_date_granularity(self.col_min, self.col_max, max_buckets)
+        if self.granularity is None:
+            self.date_buckets = fill_date_gaps(pd.Series([], dtype='int64'), 'day')
+        elif self.serie is not None and not self.is_sample:
+            self.date_buckets = get_date_buckets(self.serie, self.granularity)
+        else:
+            self.date_buckets = get_table_date_buckets(self.db, self.schema_name, self.table_name, self.col_name, self.granularity)
+        self.date_gaps = get_date_gaps(self.date_buckets)
+        self.barchart = alt.Chart(self.date_buckets).mark_bar().encode(
+            x = alt.X('period:T', title =f'{self.col_name} (by {self.granularity})'),
+            y = alt.Y('count:Q', title='Count of Records'),
+            tooltip = ['period:T', 'count:Q']
         )
 
     def set_frequent(self, end=20):
@@ -404,11 +869,8 @@ class DateColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Create data frame using value_counts method
-        Reset the index 
-        Rename column names
-        For every value occurrence, divide it by the sum of all occurrence
-        Get the end count of rows and store it as df
+        Get the end most frequent values from the frequency table (frequency_table()) with the columns value, occurrence and percentage
+        The percentages are computed at once by dividing the occurrences by the number of non-null values of the column
         Set the attribute
 
         --------------------
@@ -417,13 +879,7 @@ class DateColumn:
         None
 
         """
-        df = pd.DataFrame(self.serie.value_counts())
-        df = df.reset_index()
-        df.columns = ['value', 'occurrence']
-        for i in range(len(df.occurrence)):
-            df.loc[i,'percentage'] = df.loc[i,'occurrence'] / sum(df.occurrence)
-        df = df.head(end)
-        self.frequent = df 
+        self.frequent = self.metrics.get('frequency_table').get_frequent(end)
 
     def get_summary_df(self):
         """
@@ -441,6 +897,7 @@ class DateColumn:
         --------------------
         Create a dataframe and show every requested information
         Convert the dataframe values into string
+        If the serie is a sample, label each metric as exact or estimated from the sample
 
         --------------------
         Returns
@@ -448,7 +905,7 @@ class DateColumn:
         (dataframe): The dataframe shows all the requested information in string format 
 
         """
-        df = pd.DataFrame([['Number of Unique Values', self.unique],
+        df = pd.DataFrame([['Number of Unique Values', format_estimate(self.unique, self.unique_error)],
                             ['Number of Rows with Missing Values', self.n_missing],
                             ['Number of Weekend Dates', self.n_weekend],
                             ['Number of Weekday Dates', self.n_weekday],
@@ -458,4 +915,7 @@ class DateColumn:
                             ['Minimum Value', self.col_min],
                             ['Maximum Value', self.col_max]],
                             columns= ['Description', 'Value'])
-        return df.astype(str)
+        df = df.astype(str)
+        if self.is_sample:
+            df = set_metrics_basis(df, self.exact_metrics)
+        return df
@@ -1,3 +1,4 @@
+from src.profiling.queries import quote_identifier
 
 def get_min_date_query(schema_name, table_name, col_name):
     """
@@ -79,3 +80,82 @@ def get_1900_count_query(schema_name, table_name, col_name):
 
     """
     return f"select count(*) from (select date({col_name}) as date from {schema_name}.{table_name}) as temp where date = '1900-01-01'"
+
+
+DATE_PROFILE_METRICS = {
+    'unique': "count(distinct {col})",
+    'n_missing': "count(*) - count({col})",
+    'col_min': "min({col})",
+    'col_max': "max({col})",
+    'n_weekend': "count(*) filter (where extract(dow from {col}) in (0,6))",
+    'n_weekday': "count(*) filter (where extract(dow from {col}) between 1 and 5)",
+    'n_future': "count(*) filter (where {col} > now())",
+    'n_empty_1900': "count(*) filter (where date({col}) = '1900-01-01')",
+    'n_empty_1970': "count(*) filter (where date({col}) = '1970-01-01')"
+}
+
+def get_date_profile_query(schema_name, table_name, col_names, metrics=DATE_PROFILE_METRICS):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_date_profile_query (method): Function that returns a single query computing all the metrics of every datetime column of a Postgres table in one scan
+
+    --------------------
+    Parameters
+    --------------------
+    schema_name(str): The schema name of the selected table in the target database
+    table_name(str): The table name of the selected table in the target database
+    col_names(list): The names of the datetime columns of the selected table
+    metrics(dict): Aggregates computed for every column, keyed by metric name (default: DATE_PROFILE_METRICS)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    For every column and every metric, add the aggregate of the quoted column to the select list
+    Alias each aggregate with the metric name and the position of the column
+
+    --------------------
+    Returns
+    --------------------
+    (str): SQL query returning a single row with one value per metric and column
+
+    """
+    aggregates = [f"{metric.format(col=quote_identifier(col_name))} as {name}_{i}" for i, col_name in enumerate(col_names) for name, metric in metrics.items()]
+    return f"select {', '.join(aggregates)} from {schema_name}.{table_name}"
+
+# Periods accepted by get_date_buckets_query(), a subset of the date_trunc() units (the keys of DATE_GRANULARITIES in serie_date/logics.py)
+DATE_TRUNC_UNITS = ('hour', 'day', 'week', 'month', 'quarter', 'year', 'decade')
+
+def get_date_buckets_query(schema_name, table_name, col_name, granularity):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_date_buckets_query (method): Function that returns the query used for counting the dates of a datetime column from a Postgres table by period (hour, day, week, month...)
+
+    --------------------
+    Parameters
+    --------------------
+    schema_name(str): The schema name of the selected table in the target database
+    table_name(str): The table name of the selected table in the target database
+    col_name(str): The column name of the selected column in the target database
+    granularity(str): The period the dates are truncated to, one of DATE_TRUNC_UNITS (e.g. 'day', 'month')
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Raise a ValueError if the period is not one of DATE_TRUNC_UNITS, as it is embedded in the query
+    Truncate every non-null date of the quoted column to the start of its period with date_trunc(), as a timestamp without time zone (the local time of the session)
+    Count the dates of each period, in chronological order
+
+    --------------------
+    Returns
+    --------------------
+    (str): SQL query returning the columns period and count, one row per non-empty period
+
+    """
+    if granularity not in DATE_TRUNC_UNITS:
+        raise ValueError(f'Unknown date granularity {granularity!r}, expected one of {DATE_TRUNC_UNITS}')
+    col = quote_identifier(col_name)
+    return f"select date_trunc('{granularity}', {col})::timestamp as period, count(*) as count from {schema_name}.{table_name} where {col} is not null group by 1 order by 1"
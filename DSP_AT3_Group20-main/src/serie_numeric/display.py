@@ -1,6 +1,8 @@
 import streamlit as st
 
-from src.serie_numeric.logics import NumericColumn
+from src.serie_numeric.logics import NumericColumn, get_numeric_profiles, HISTOGRAM_METHODS
+from src.dataframe.display import display_sample_caption, display_column_toggles
+from src.profiling.logics import DISTINCT_EXACT
 
 def display_numerics():
     """
@@ -18,10 +20,14 @@ def display_numerics():
     Pseudo-Code
     --------------------
     Extract dataset class in the session state and store it as a variable
-    Call set_numeric_columns method to set the attributes values
+    Call set_numeric_columns method to set the attributes values, only if they are not computed yet for the loaded table (get_metric())
     Create a variable to store the column names 
+    Display a caption if the dataset is a sample
     If there is num col in the dataframe
-    Set corresponding expanders and display the relevant information
+    Display a checkbox for every column, in the order of the columns (display_column_toggles())
+    When columns are ticked for the first time, compute the metrics of all the numeric columns with a single query (one per batch of columns, run concurrently)
+    and instantiate a NumericColumn class for each newly ticked column, computing their information with a single call to the executor of the session, all memoised in the dataset class
+    Display the relevant information of the ticked columns below their checkbox
 
     --------------------
     Returns
@@ -31,15 +37,19 @@ def display_numerics():
 
     """
     numeric = st.session_state.data
-    numeric.set_numeric_columns()
+    numeric.get_metric('set_numeric_columns')
     num_cols = numeric.num_cols
+    display_sample_caption()
 
     if num_cols is not None:
-        for col in num_cols:
-            with st.expander(col, expanded=False):
-                display_numeric(col, None)
+        exact_distinct = st.session_state.get('exact_distinct', DISTINCT_EXACT)
+        new_column = lambda col: NumericColumn(st.session_state.schema_selected, st.session_state.table_selected, col, st.session_state.db, numeric.df[col], numeric.is_sample, exact_distinct)
+        get_profiles = lambda executor: get_numeric_profiles(st.session_state.db, st.session_state.schema_selected, st.session_state.table_selected, num_cols, executor, exact_distinct)
+        for col, container, numeric_column in display_column_toggles('numeric', num_cols, new_column, get_profiles, 'set_numeric_columns'):
+            with container:
+                display_numeric(col, None, numeric_column)
 
-def display_numeric(col_name, i):
+def display_numeric(col_name, i, numeric_column=None):
     """
     --------------------
     Description
@@ -51,15 +61,17 @@ def display_numeric(col_name, i):
     --------------------
     col_name(str): column name to create the DateColumn class
     i(str): not used 
+    numeric_column(NumericColumn): NumericColumn class whose information is already computed (optional)
 
     --------------------
     Pseudo-Code
     --------------------
-    Initiate a NumericColumn class with provided parameters in the session state and store it as a new variable
-    Call set_data method of the numeric_column class
+    If no numeric_column is provided, initiate a NumericColumn class with provided parameters in the session state and call its set_data method
+    Show a warning if the number of unique values could not be counted
     Call get_summary_df of the numeric_column class and show it as a static table in the streamlit app
     Set a bar chart title
-    Show the barchart which is created using altair package in the streamlit app
+    Display a radio button choosing the binning method of the histogram (equal width or equal depth), and compute the histogram again only when the method changes (set_histogram_method())
+    Show the histogram of the pre-aggregated bins which is created using altair package in the streamlit app
     Set a title for the following dataframe
     Call frequent method of the NumericColumn class and show it in the streamlit app
 
@@ -69,10 +81,16 @@ def display_numeric(col_name, i):
     None
 
     """
-    numeric_column = NumericColumn(st.session_state.schema_selected, st.session_state.table_selected, col_name, st.session_state.db, st.session_state.data.df[col_name])
-    numeric_column.set_data()
+    if numeric_column is None:
+        numeric_column = NumericColumn(st.session_state.schema_selected, st.session_state.table_selected, col_name, st.session_state.db, st.session_state.data.df[col_name], st.session_state.data.is_sample, st.session_state.get('exact_distinct', DISTINCT_EXACT))
+        numeric_column.set_data()
+    if numeric_column.unique_msg is not None:
+        st.warning(numeric_column.unique_msg)
     st.table(numeric_column.get_summary_df())
     st.text('Bar Chart')
+    method = st.radio('Binning', HISTOGRAM_METHODS, format_func=lambda method: method.replace('_', ' ').capitalize(), key=f'histogram_{st.session_state.schema_selected}.{st.session_state.table_selected}.{col_name}', horizontal=True)
+    numeric_column.set_histogram_method(method)
+    numeric_column.metrics.get('set_histogram')
     st.altair_chart(numeric_column.histogram)
     st.text('Most Frequent Values')
     st.dataframe(numeric_column.frequent)
\ No newline at end of file
@@ -1,10 +1,241 @@
-from numpy import average
+import os
+import numpy as np
 import streamlit as st
 import pandas as pd
 import altair as alt
 
 from src.database.logics import PostgresConnector
-from src.serie_numeric.queries import get_negative_number_query, get_std_query, get_unique_query
+from src.dataframe.logics import set_metrics_basis, get_column_profiles, split_column_profiles
+from src.profiling.logics import MetricGraph, FrequencyTable, FREQUENCY_TOP_K, get_distinct_count, format_estimate, DISTINCT_EXACT
+from src.serie_numeric.queries import get_negative_number_query, get_std_query, get_unique_query, get_numeric_profile_query, get_histogram_query, NUMERIC_PROFILE_METRICS, HISTOGRAM_EDGES
+
+# Number of values summarised at once by get_numeric_stats(), small enough for a chunk and its temporaries to stay in the CPU cache
+NUMERIC_KERNEL_CHUNKSIZE = int(os.environ.get('NUMERIC_KERNEL_CHUNKSIZE', 65536))
+# Number of bins of the histograms, and binning method used by default ('equal_width' or 'equal_depth')
+HISTOGRAM_BINS = int(os.environ.get('HISTOGRAM_BINS', 50))
+HISTOGRAM_METHODS = list(HISTOGRAM_EDGES)
+HISTOGRAM_METHOD = os.environ.get('HISTOGRAM_METHOD', 'equal_width')
+
+def get_numeric_profiles(db, schema_name, table_name, col_names, executor=None, exact_distinct=True):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_numeric_profiles (function): Function that computes the metrics of all the numeric columns of a table with a single SQL query (get_numeric_profile_query())
+
+    --------------------
+    Parameters
+    --------------------
+    db(PostgresConnector): Instantation of PostgresConnector class for handling Postgres connection
+    schema_name(str): The schema name of the selected table in the target database
+    table_name(str): The table name of the selected table in the target database
+    col_names(list): The names of the numeric columns of the selected table
+    executor(ProfilingExecutor): Executor used for profiling batches of columns concurrently (optional)
+    exact_distinct(bool): Whether the distinct values are counted exactly by the query, otherwise they are left to NumericColumn.set_unique() (default: True)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Unless the distinct values are counted exactly, drop the n_unique aggregate, the most expensive one, from the metrics
+    Build the fused query of these metrics for the whole table
+    Run it once and split its single row into one profile per column (get_column_profiles())
+    If an executor is provided, split the columns into batches and run the queries of all the batches at the same time (ProfilingExecutor.map_queries())
+
+    --------------------
+    Returns
+    --------------------
+    (dict): Profile of each column, as a dictionary of metric values keyed by the NumericColumn attribute names
+
+    """
+    metrics = NUMERIC_PROFILE_METRICS if exact_distinct else {name: metric for name, metric in NUMERIC_PROFILE_METRICS.items() if name != 'n_unique'}
+    if executor is None:
+        return get_column_profiles(db, get_numeric_profile_query(schema_name, table_name, col_names, metrics), col_names, metrics)
+    return executor.map_queries(lambda batch: get_numeric_profile_query(schema_name, table_name, batch, metrics), lambda df, batch: split_column_profiles(df, batch, metrics), col_names)
+
+def get_numeric_stats(serie, quantiles=(0.25, 0.5, 0.75), chunksize=NUMERIC_KERNEL_CHUNKSIZE):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_numeric_stats (function): Function that computes the descriptive statistics of a numeric serie from its NumPy buffer,
+     in a single pass over the values plus a selection for the quantiles
+
+    --------------------
+    Parameters
+    --------------------
+    serie(pd.Series): The numeric serie
+    quantiles(tuple): The quantiles to compute, between 0 and 1 (default: quartiles)
+    chunksize(int): Number of values summarised at once (default: NUMERIC_KERNEL_CHUNKSIZE)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Take the NumPy buffer of the serie once, as float with NaN for the missing values unless it is an integer serie (which cannot hold missing values)
+    Drop the missing values
+    For each chunk of values, compute its count of zeros and negatives, sum, minimum, maximum, mean and sum of squared deviations
+    and merge it into the running totals with the parallel form of Welford's algorithm (Chan et al.), which keeps the variance accurate
+    Compute the quantiles (median included) with a selection (np.quantile, based on partitioning) instead of a full sort
+    Keep the minimum, maximum and sum of an integer serie as integers
+
+    --------------------
+    Returns
+    --------------------
+    (dict): n_rows, n_missing, n_zeros, n_negatives, col_sum, col_mean, col_var and col_std (sample variance and standard deviation, as Postgres stddev()),
+     col_min, col_max, col_median and quantiles (dict of the value of each quantile); the statistics of an empty serie are None
+
+    """
+    values = serie.to_numpy()
+    is_integer = values.dtype.kind in 'iub'
+    if is_integer:
+        values = values.astype('int64', copy=False)
+    else:
+        values = serie.to_numpy(dtype='float64', na_value=np.nan)
+        values = values[~np.isnan(values)]
+    stats = {'n_rows': len(serie), 'n_missing': len(serie) - len(values), 'n_zeros': 0, 'n_negatives': 0}
+    count, total, mean, m2, col_min, col_max = 0, 0, 0.0, 0.0, None, None
+    for start in range(0, len(values), chunksize):
+        chunk = values[start:start + chunksize]
+        chunk_count = len(chunk)
+        chunk_mean = chunk.mean()
+        chunk_m2 = np.square(chunk - chunk_mean).sum()
+        delta = chunk_mean - mean
+        new_count = count + chunk_count
+        mean += delta * chunk_count / new_count
+        m2 += chunk_m2 + delta * delta * count * chunk_count / new_count
+        count = new_count
+        total += chunk.sum()
+        stats['n_zeros'] += int(np.count_nonzero(chunk == 0))
+        stats['n_negatives'] += int(np.count_nonzero(chunk < 0))
+        chunk_min, chunk_max = chunk.min(), chunk.max()
+        col_min = chunk_min if col_min is None else min(col_min, chunk_min)
+        col_max = chunk_max if col_max is None else max(col_max, chunk_max)
+    if count == 0:
+        stats.update(col_sum=None, col_mean=None, col_var=None, col_std=None, col_min=None, col_max=None, col_median=None, quantiles={q: None for q in quantiles})
+        return stats
+    variance = float(m2 / (count - 1)) if count > 1 else None
+    levels = sorted(set(quantiles) | {0.5})
+    quantile_values = dict(zip(levels, np.quantile(values, levels).tolist()))
+    stats.update(
+        col_sum=total.item(),
+        col_mean=float(mean),
+        col_var=variance,
+        col_std=variance ** 0.5 if variance is not None else None,
+        col_min=col_min.item(),
+        col_max=col_max.item(),
+        col_median=quantile_values[0.5],
+        quantiles={q: quantile_values[q] for q in quantiles}
+    )
+    return stats
+
+def format_histogram_bins(lower, upper, count):
+    """
+    --------------------
+    Description
+    --------------------
+    -> format_histogram_bins (function): Function that formats the bins of a histogram computed by Postgres or NumPy as a dataframe
+
+    --------------------
+    Parameters
+    --------------------
+    lower(array-like): The lower edge of every bin
+    upper(array-like): The upper edge of every bin
+    count(array-like): The number of values of every bin
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Build a dataframe with the columns lower, upper and count
+    Drop the empty bins of width 0, which come from repeated edges (equal_depth bins of a column with many identical values)
+    Return no bin if the column has no value
+
+    --------------------
+    Returns
+    --------------------
+    (pd.DataFrame): The columns lower, upper and count, one row per bin
+
+    """
+    df = pd.DataFrame({'lower': lower, 'upper': upper, 'count': count})
+    df['count'] = df['count'].astype('int64')
+    if df['count'].sum() == 0:
+        return df.iloc[0:0].reset_index(drop=True)
+    return df[(df['upper'] > df['lower']) | (df['count'] > 0)].reset_index(drop=True)
+
+def get_histogram_bins(serie, bins=HISTOGRAM_BINS, method=HISTOGRAM_METHOD):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_histogram_bins (function): Function that computes the histogram of a numeric serie already loaded, aggregated into at most bins bins with NumPy
+
+    --------------------
+    Parameters
+    --------------------
+    serie(pd.Series): The numeric serie
+    bins(int): The number of bins (default: HISTOGRAM_BINS)
+    method(str): 'equal_width' for bins of the same width between the minimum and the maximum, 'equal_depth' for bins bounded by quantiles (default: HISTOGRAM_METHOD)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Take the NumPy buffer of the non-missing values as float
+    Compute the bins + 1 edges as the Postgres query does (get_histogram_query()): evenly spaced between the minimum and the maximum, or the quantiles (np.quantile, interpolated as percentile_cont())
+    Assign every value to the last edge lower or equal to it, as width_bucket() does, the maximum value being kept in the last bin, and count the values of each bin with np.bincount
+    Format the bins (format_histogram_bins())
+
+    --------------------
+    Returns
+    --------------------
+    (pd.DataFrame): The columns lower, upper and count, one row per bin
+
+    """
+    if method not in HISTOGRAM_METHODS:
+        raise ValueError(f"Unknown histogram method '{method}', expected one of {HISTOGRAM_METHODS}")
+    values = pd.to_numeric(serie, errors='coerce').dropna().to_numpy(dtype='float64')
+    if len(values) == 0:
+        return format_histogram_bins([], [], [])
+    if method == 'equal_width':
+        lo, hi = values.min(), values.max()
+        edges = lo + (hi - lo) * np.arange(bins + 1) / bins
+    else:
+        edges = np.quantile(values, np.arange(bins + 1) / bins)
+    buckets = np.minimum(np.searchsorted(edges, values, side='right'), bins)
+    counts = np.bincount(buckets, minlength=bins + 1)[1:]
+    return format_histogram_bins(edges[:-1], edges[1:], counts)
+
+def get_table_histogram_bins(db, schema_name, table_name, col_name, bins=HISTOGRAM_BINS, method=HISTOGRAM_METHOD):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_table_histogram_bins (function): Function that computes the histogram of a numeric column over the whole Postgres table, aggregated into at most bins bins by Postgres
+
+    --------------------
+    Parameters
+    --------------------
+    db(PostgresConnector): Instantation of PostgresConnector class for handling Postgres connection
+    schema_name(str): The schema name of the selected table in the target database
+    table_name(str): The table name of the selected table in the target database
+    col_name(str): The column name of the selected column in the target database
+    bins(int): The number of bins (default: HISTOGRAM_BINS)
+    method(str): 'equal_width' or 'equal_depth' (default: HISTOGRAM_METHOD)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Run the histogram query (get_histogram_query()), which only returns one row per bin
+    Format the bins (format_histogram_bins())
+
+    --------------------
+    Returns
+    --------------------
+    (pd.DataFrame): The columns lower, upper and count, one row per bin
+
+    """
+    if method not in HISTOGRAM_METHODS:
+        raise ValueError(f"Unknown histogram method '{method}', expected one of {HISTOGRAM_METHODS}")
+    df = db.run_query(get_histogram_query(schema_name, table_name, col_name, bins, method))
+    return format_histogram_bins(df['lower'], df['upper'], df['count'])
+
 
 class NumericColumn:
     """
@@ -22,6 +253,8 @@ class NumericColumn:
     -> db (PostgresConnector): Instantation of PostgresConnector class for handling Postgres connection (mandatory)
     -> serie (pd.Series): Pandas serie where the content of a column has been loaded (mandatory)
     -> n_unique (int): Number of unique value of a serie (optional)
+    -> unique_error (float): Standard error of the number of unique values when it is estimated with a HyperLogLog sketch, 0 or None when it is exact (optional)
+    -> unique_msg (str): Why the number of unique values could not be computed, None when it is set (optional)
     -> n_missing (int): Number of missing values of a serie (optional)
     -> col_mean (int): Average value of a serie (optional)
     -> col_std (int): Standard deviation value of a serie (optional)
@@ -31,16 +264,36 @@ class NumericColumn:
     -> n_zeros (int): Number of times a serie has values equal to 0 (optional)
     -> n_negatives (int): Number of times a serie has negative values (optional)
     -> histogram (int): Altair histogram displaying the count for each bin value of a serie (optional)
+    -> histogram_method (str): Binning method of the histogram, 'equal_width' or 'equal_depth' (optional, HISTOGRAM_METHOD by default)
+    -> histogram_bins (pd.DataFrame): Lower edge, upper edge and number of values of every bin of the histogram (optional)
+    -> histogram_edges (list): Edges of the bins of the histogram, in increasing order (optional)
     -> frequent (int): Datframe containing the most frequest value of a serie (optional)
+    -> is_sample (bool): Whether serie only contains a sample of the table rows (optional)
+    -> exact_distinct (bool): Whether the distinct values are always counted exactly, rather than estimated with a HyperLogLog sketch for large or sampled series (optional, DISTINCT_EXACT by default)
+    -> exact_metrics (list): Descriptions of the metrics computed in SQL on the whole table, which are exact even when serie is a sample
+    -> profile_metrics (list): Descriptions of the metrics computed by the fused profile query (get_numeric_profile_query())
+    -> metrics (MetricGraph): Metrics computed so far, each computed once from self.serie (or set from the profile) and reused
 
     """
-    def __init__(self, schema_name, table_name, col_name ,db , serie):
+    exact_metrics = ['Number of Unique Values', 'number of Rows with Negative Values', 'Standard Deviation Value']
+    profile_metrics = ['Number of Unique Values', 'Number of Rows with Missing Values', 'number of Rows with 0', 'number of Rows with Negative Values', 'Average Value', 'Standard Deviation Value', 'Minimum Value', 'Maximum Value', 'Median Value']
+    # Methods setting the metrics of the fused profile query, then the ones computed from self.serie, with the metrics (or 'serie') they are computed from
+    profile_methods = ['set_unique', 'set_missing', 'set_zeros', 'set_negatives', 'set_mean', 'set_std', 'set_min', 'set_max', 'set_median']
+    metric_methods = profile_methods + ['set_histogram', 'set_frequent']
+    metric_dependencies = {'frequency_table': ('serie',), 'set_histogram': ('serie', 'histogram_method'), 'set_frequent': ('frequency_table',), 'compute_stats': ('serie',)}
+    metric_dependencies.update({method: ('compute_stats',) for method in ['set_missing', 'set_zeros', 'set_negatives', 'set_mean', 'set_std', 'set_min', 'set_max', 'set_median']})
+
+    def __init__(self, schema_name, table_name, col_name ,db , serie, is_sample=False, exact_distinct=DISTINCT_EXACT):
         self.schema_name=schema_name
         self.table_name = table_name
         self.col_name = col_name
         self.db = db
         self.serie = serie
+        self.is_sample = is_sample
+        self.exact_distinct = exact_distinct
         self.n_unique = None
+        self.unique_error = None
+        self.unique_msg = None
         self.n_missing = None
         self.col_mean = None
         self.col_std = None
@@ -50,9 +303,13 @@ class NumericColumn:
         self.n_zeros = None
         self.n_negatives = None
         self.histogram = None
+        self.histogram_method = HISTOGRAM_METHOD
+        self.histogram_bins = None
+        self.histogram_edges = None
         self.frequent = None
+        self.metrics = MetricGraph(self, self.metric_dependencies)
 
-    def set_data(self):
+    def set_data(self, profile=None):
         """
         --------------------
         Description
@@ -63,12 +320,14 @@ class NumericColumn:
         --------------------
         Parameters
         --------------------
-       None
+        profile(dict): Metrics of the column already computed by get_numeric_profiles() (optional)
 
         --------------------
         Pseudo-Code
         --------------------
-        Call relevant methods to set the attributes
+        If a profile is provided, set the metrics from it without any query
+        Call relevant methods to set the attributes through self.metrics, which skips the metrics already computed (or set from the profile)
+        Compute the binned histogram and the most frequent values from self.serie
 
         --------------------
         Returns
@@ -76,19 +335,49 @@ class NumericColumn:
         None
 
         """
-        
-        self.set_unique()   
-        self.set_missing()
-        self.set_zeros()
-        self.set_negatives()
-        self.set_mean()
-        self.set_std()
-        self.set_min()
-        self.set_max()
-        self.set_median()
-        self.set_histogram()
-        self.set_frequent()
- 
+        if profile is not None:
+            self.set_profile(profile)
+        for method in self.metric_methods:
+            self.metrics.get(method)
+
+    def set_profile(self, profile):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_profile (method): Class method that sets the metrics of the column from its profile computed in SQL on the whole table
+
+        --------------------
+        Parameters
+        --------------------
+        profile(dict): Metrics of the column computed by get_numeric_profiles()
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Set each attribute from the value of the profile with the same name
+        Convert the average, standard deviation and median to float (Postgres returns numeric values as Decimal)
+        As all these metrics are computed on the whole table, mark them as exact
+        Mark the methods computing these metrics as computed in self.metrics, so that set_data() does not run them
+        If the profile has no number of unique values (get_numeric_profiles() without exact_distinct), leave it to set_unique() and do not mark it as exact
+
+        --------------------
+        Returns
+        --------------------
+        None
+
+        """
+        for metric in NUMERIC_PROFILE_METRICS:
+            if metric in profile:
+                setattr(self, metric, profile[metric])
+        for metric in ('col_mean', 'col_std', 'col_median'):
+            if getattr(self, metric) is not None:
+                setattr(self, metric, float(getattr(self, metric)))
+        has_unique = 'n_unique' in profile
+        self.exact_metrics = [metric for metric in self.profile_metrics if has_unique or metric != 'Number of Unique Values']
+        for method in self.profile_methods:
+            if has_unique or method != 'set_unique':
+                self.metrics.set(method)
 
     def is_serie_none(self):
         """
@@ -128,32 +417,41 @@ class NumericColumn:
 
      
 
-    def set_unique(self):
+    def set_unique(self, exact=None):
         """
         --------------------
         Description
         --------------------
-        -> set_unique (method): Class method that computes the number of unique value of a column using a SQL query (get_unique_query())
+        -> set_unique (method): Class method that computes the number of unique value of a column, estimated from the serie unless it is counted exactly on the whole table
 
         --------------------
         Parameters
         --------------------
-        None
+        exact(bool): True to count exactly, False to estimate with a HyperLogLog sketch, None to count exactly only small series (default: None, or True if self.exact_distinct, see get_distinct_count())
 
         --------------------
         Pseudo-Code
         --------------------
-        => To be filled by student
-        -> pseudo-code
-        --------------------------
-        Call get_unique_query method from serie_numeric/queries.py and set the attribute
+        If there is no serie, or if the serie is a sample and the count is exact, call get_unique_query method from serie_numeric/queries.py and set the attribute
+        Otherwise count the distinct values of the serie exactly or with a HyperLogLog sketch (get_distinct_count()) and set the attributes, the count of a sample being an estimate
+        If the values cannot be counted, leave the attributes unset and keep the reason in unique_msg
         --------------------
         Returns
         --------------------
         None
 
         """
-        self.unique =self.db.run_query(get_unique_query(self.schema_name, self.table_name, self.col_name)).iloc[0]['count']
+        if exact is None and self.exact_distinct:
+            exact = True
+        if self.serie is None or (self.is_sample and exact):
+            self.n_unique =self.db.run_query(get_unique_query(self.schema_name, self.table_name, self.col_name)).iloc[0]['count']
+            self.unique_error = 0.0
+            return
+        try:
+            self.n_unique, self.unique_error = get_distinct_count(self.serie, exact)
+        except (TypeError, ValueError) as e:
+            self.n_unique, self.unique_error = None, None
+            self.unique_msg = f'The number of unique values of {self.col_name} could not be counted: {e}'
         # self.n_unique = # find the size of the result 
         # st.write(rows)
 
@@ -172,7 +470,7 @@ class NumericColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Sum the count of the null value in the pandas serie and set the corresponding attribute
+        Get the count of the null values of the pandas serie from the numeric kernel (compute_stats()) and set the corresponding attribute
 
         --------------------
         Returns
@@ -181,7 +479,7 @@ class NumericColumn:
 
         """
         #=> To be filled by student
-        self.n_missing = pd.isnull(self.serie).sum()
+        self.n_missing = self.metrics.get('compute_stats')['n_missing']
 
     def set_zeros(self):
         """
@@ -198,7 +496,7 @@ class NumericColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Get sum of values of the dataframe which are equal to 0
+        Get the count of values of the serie which are equal to 0 from the numeric kernel (compute_stats())
         Set the attribute
 
         --------------------
@@ -207,14 +505,14 @@ class NumericColumn:
        None
 
         """
-        self.n_zeros = (self.serie == 0).sum()
+        self.n_zeros = self.metrics.get('compute_stats')['n_zeros']
 
     def set_negatives(self):
         """
         --------------------
         Description
         --------------------
-        -> set_negatives (method): Class method that computes the number of times a serie has negative values using a SQL query (get_negative_number_query())
+        -> set_negatives (method): Class method that computes the number of times a serie has negative values, using a SQL query (get_negative_number_query()) when the serie is a sample
 
         --------------------
         Parameters
@@ -224,7 +522,8 @@ class NumericColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Run the relevant query in the database class
+        If the serie holds the whole column, get the count of negative values from the numeric kernel (compute_stats())
+        Otherwise run the relevant query in the database class, so that the count is exact for the whole table
         Get the value of the dataframe result
         Set the attribute 
 
@@ -236,7 +535,10 @@ class NumericColumn:
 
         """
         #=> To be filled by student
-        self.n_negatives = self.db.run_query(get_negative_number_query(self.schema_name, self.table_name, self.col_name)).iloc[0]['count']
+        if not self.is_sample:
+            self.n_negatives = self.metrics.get('compute_stats')['n_negatives']
+        else:
+            self.n_negatives = self.db.run_query(get_negative_number_query(self.schema_name, self.table_name, self.col_name)).iloc[0]['count']
 
     def set_mean(self):
         """
@@ -253,7 +555,7 @@ class NumericColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Mean function to get the average value in that data.serie and set the relevant attribute
+        Get the average value of the serie from the numeric kernel (compute_stats()) and set the relevant attribute
 
         --------------------
         Returns
@@ -262,14 +564,14 @@ class NumericColumn:
 
         """
         #=> To be filled by student
-        self.col_mean = average(self.serie)
+        self.col_mean = self.metrics.get('compute_stats')['col_mean']
 
     def set_std(self):
         """
         --------------------
         Description
         --------------------
-        -> set_std (method): Class method that computes the standard deviation value of a serie using a SQL query (get_std_query)
+        -> set_std (method): Class method that computes the standard deviation value of a serie, using a SQL query (get_std_query) when the serie is a sample
 
         --------------------
         Parameters
@@ -279,7 +581,8 @@ class NumericColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Run the relevant query in the database class 
+        If the serie holds the whole column, get the standard deviation from the numeric kernel (compute_stats())
+        Otherwise run the relevant query in the database class, so that the value is exact for the whole table
         Get the value of the dataframe result
         Set the attribute
 
@@ -290,7 +593,10 @@ class NumericColumn:
 
         """
         #=> To be filled by student
-        self.col_std = self.db.run_query(get_std_query(self.schema_name, self.table_name, self.col_name)).iloc[0]['stddev']
+        if not self.is_sample:
+            self.col_std = self.metrics.get('compute_stats')['col_std']
+        else:
+            self.col_std = self.db.run_query(get_std_query(self.schema_name, self.table_name, self.col_name)).iloc[0]['stddev']
     
     def set_min(self):
         """
@@ -307,7 +613,7 @@ class NumericColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Min function to get the minimum value in that data.serie and set the relevant attribute
+        Get the minimum value of the serie from the numeric kernel (compute_stats()) and set the relevant attribute
 
         --------------------
         Returns
@@ -316,7 +622,7 @@ class NumericColumn:
 
         """
         #=> To be filled by student
-        self.col_min = min(self.serie)
+        self.col_min = self.metrics.get('compute_stats')['col_min']
 
     def set_max(self):
         """
@@ -333,7 +639,7 @@ class NumericColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Max function to get the maximum value in that data.serie and set the relevant attribute
+        Get the maximum value of the serie from the numeric kernel (compute_stats()) and set the relevant attribute
 
         --------------------
         Returns
@@ -342,7 +648,7 @@ class NumericColumn:
 
         """
         #=> To be filled by student
-        self.col_max = max(self.serie)
+        self.col_max = self.metrics.get('compute_stats')['col_max']
 
     def set_median(self):
         """
@@ -359,7 +665,7 @@ class NumericColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Median function to get the median value in that data.serie and set the relevant attribute
+        Get the median value of the serie from the numeric kernel (compute_stats(), a selection instead of a full sort) and set the relevant attribute
 
         --------------------
         Returns
@@ -368,14 +674,14 @@ class NumericColumn:
 
         """
         #=> To be filled by student
-        self.col_median = self.serie.median()
+        self.col_median = self.metrics.get('compute_stats')['col_median']
 
-    def set_histogram(self):
+    def compute_stats(self):
         """
         --------------------
         Description
         --------------------
-        -> set_histogram (method): Class method that computes the Altair histogram displaying the count for each bin value of a serie
+        -> compute_stats (method): Class method that computes the descriptive statistics of self.serie with the numeric kernel, shared by the metric methods
 
         --------------------
         Parameters
@@ -385,22 +691,109 @@ class NumericColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Get a dataframe which store the count of unique values in the serie
-        Reset the index for convenience of plotting
-        Use altair package to plot a histogram and set the attribute
+        Return the result of get_numeric_stats() on the serie, computed once through self.metrics ('compute_stats')
 
         --------------------
         Returns
         --------------------
+        (dict): The statistics of the serie (see get_numeric_stats())
+
+        """
+        return get_numeric_stats(self.serie)
+
+    def frequency_table(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> frequency_table (method): Class method that counts the occurrences of each value of the column, shared by the chart and the most frequent values
+
+        --------------------
+        Parameters
+        --------------------
         None
 
+        --------------------
+        Pseudo-Code
+        --------------------
+        If the serie is a sample and FREQUENCY_TOP_K is positive, count the FREQUENCY_TOP_K most frequent values of the whole table with a single grouped query (FrequencyTable.from_query())
+        Otherwise count every value of the serie (FrequencyTable.from_serie())
+        Computed once through self.metrics ('frequency_table')
+
+        --------------------
+        Returns
+        --------------------
+        (FrequencyTable): The number of occurrences of each value, by decreasing number
+
         """
-        df = pd.DataFrame(self.serie.value_counts())
-        df = df.reset_index()
-        self.histogram = alt.Chart(df).mark_bar().encode(
-            x = alt.X('index', title =f'{self.col_name}'),
-            y = alt.Y(f'{self.col_name}', title = 'Count of Records')
-        ).transform_bin(f'{self.col_name}', field = f'{self.col_name}', bin = alt.Bin(maxbins=50))      
+        if FREQUENCY_TOP_K > 0 and self.is_sample and self.db is not None:
+            return FrequencyTable.from_query(self.db, self.schema_name, self.table_name, self.col_name, FREQUENCY_TOP_K)
+        return FrequencyTable.from_serie(self.serie)
+
+    def set_histogram_method(self, method):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_histogram_method (method): Class method that changes the binning method of the histogram
+
+        --------------------
+        Parameters
+        --------------------
+        method(str): 'equal_width' or 'equal_depth'
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        If the method is different from the current one, set the attribute and mark the histogram as dirty (self.metrics), so that it is computed again when requested
+
+        --------------------
+        Returns
+        --------------------
+        None
+
+        """
+        if method != self.histogram_method:
+            self.histogram_method = method
+            self.metrics.invalidate('histogram_method')
+
+    def set_histogram(self, bins=HISTOGRAM_BINS):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_histogram (method): Class method that computes the Altair histogram displaying the count of values of each bin of a serie
+
+        --------------------
+        Parameters
+        --------------------
+        bins(int): The number of bins (default: HISTOGRAM_BINS)
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        Aggregate the values into at most bins bins with the binning method of the column (histogram_method):
+        with NumPy if the serie is loaded (get_histogram_bins()), otherwise in Postgres (get_table_histogram_bins()), so that the chart only embeds the bins and not every distinct value
+        Set the bins and their edges
+        Use altair package to plot the pre-aggregated bins as a histogram and set the attribute
+
+        --------------------
+        Returns
+        --------------------
+        None
+
+        """
+        if self.serie is not None:
+            self.histogram_bins = get_histogram_bins(self.serie, bins, self.histogram_method)
+        else:
+            self.histogram_bins = get_table_histogram_bins(self.db, self.schema_name, self.table_name, self.col_name, bins, self.histogram_method)
+        self.histogram_edges = self.histogram_bins['lower'].tolist() + self.histogram_bins['upper'].tail(1).tolist()
+        self.histogram = alt.Chart(self.histogram_bins).mark_bar().encode(
+            x = alt.X('lower', bin = 'binned', title = f'{self.col_name}'),
+            x2 = 'upper',
+            y = alt.Y('count', title = 'Count of Records'),
+            tooltip = ['lower', 'upper', 'count']
+        )
 
     def set_frequent(self, end=20):
         """
@@ -417,11 +810,8 @@ class NumericColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Create data frame using value_counts method
-        Reset the index 
-        Rename column names
-        For every value occurrence, divide it by the sum of all occurrence
-        Get the end count of rows and store it as df
+        Get the end most frequent values from the frequency table (frequency_table()) with the columns value, occurrence and percentage
+        The percentages are computed at once by dividing the occurrences by the number of non-null values of the column
         Set the attribute
 
         --------------------
@@ -431,13 +821,7 @@ class NumericColumn:
 
         """
         #=> To be filled by student
-        df = pd.DataFrame(self.serie.value_counts())
-        df = df.reset_index()
-        df.columns = ['value', 'occurrence']
-        for i in range(len(df.occurrence)):
-            df.loc[i,'percentage'] = df.loc[i,'occurrence'] / sum(df.occurrence)
-        df = df.head(end)
-        self.frequent = df 
+        self.frequent = self.metrics.get('frequency_table').get_frequent(end)
 
     def get_summary_df(self):
         """
@@ -456,6 +840,7 @@ class NumericColumn:
         --------------------
         Create a dataframe and show every requested information
         Convert the dataframe values into string
+        If the serie is a sample, label each metric as exact or estimated from the sample
 
         --------------------
         Returns
@@ -463,7 +848,7 @@ class NumericColumn:
         (dataframe): The dataframe shows all the requested information in string format 
 
         """
-        df = pd.DataFrame([['Number of Unique Values', self.unique],
+        df = pd.DataFrame([['Number of Unique Values', format_estimate(self.n_unique, self.unique_error)],
                     ['Number of Rows with Missing Values', self.n_missing],
                     ['number of Rows with 0', self.n_zeros],
                     ['number of Rows with Negative Values', self.n_negatives],
@@ -473,7 +858,10 @@ class NumericColumn:
                     ['Maximum Value', self.col_max],
                     ['Median Value', self.col_median]],
                     columns= ['Description', 'Value'])  
-        return df.astype(str)
+        df = df.astype(str)
+        if self.is_sample:
+            df = set_metrics_basis(df, self.exact_metrics)
+        return df
 
         
 
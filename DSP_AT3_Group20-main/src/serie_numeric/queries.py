@@ -1,3 +1,5 @@
+from src.profiling.queries import quote_identifier
+
 def get_negative_number_query(schema_name, table_name, col_name):
     """
     --------------------
@@ -72,4 +74,82 @@ def get_unique_query(schema_name, table_name, col_name):
     --------------------♣
     (str): SQL query to get the uniqe value in the serie
     """
-    return f'select count (distinct {col_name}) from {schema_name}.{table_name}'
\ No newline at end of file
+    return f'select count (distinct {col_name}) from {schema_name}.{table_name}'
+
+NUMERIC_PROFILE_METRICS = {
+    'n_unique': 'count(distinct {col})',
+    'n_missing': 'count(*) - count({col})',
+    'n_zeros': 'count(*) filter (where {col} = 0)',
+    'n_negatives': 'count(*) filter (where {col} < 0)',
+    'col_mean': 'avg({col})',
+    'col_std': 'stddev({col})',
+    'col_min': 'min({col})',
+    'col_max': 'max({col})',
+    'col_median': 'percentile_cont(0.5) within group (order by {col})'
+}
+
+def get_numeric_profile_query(schema_name, table_name, col_names, metrics=NUMERIC_PROFILE_METRICS):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_numeric_profile_query (method): Function that returns a single query computing all the metrics of
+     every numeric column of a Postgres table in one scan
+    --------------------
+    Parameters
+    --------------------
+    schema_name(str): The schema name of the selected table in the target database
+    table_name(str): The table name of the selected table in the target database
+    col_names(list): The names of the numeric columns of the selected table
+    metrics(dict): Aggregates computed for every column, keyed by metric name (default: NUMERIC_PROFILE_METRICS)
+    --------------------
+    Pseudo-Code
+    --------------------
+    For every column and every metric, add the aggregate of the quoted column to the select list
+    Alias each aggregate with the metric name and the position of the column (column names may not be valid aliases)
+    --------------------
+    Returns
+    --------------------
+    (str): SQL query returning a single row with one value per metric and column
+    """
+    aggregates = [f'{metric.format(col=quote_identifier(col_name))} as {name}_{i}' for i, col_name in enumerate(col_names) for name, metric in metrics.items()]
+    return f"select {', '.join(aggregates)} from {schema_name}.{table_name}"
+
+HISTOGRAM_EDGES = {
+    'equal_width': 'select array_agg(lo + (hi - lo) * i / {bins} order by i) as edges from (select min({col})::float8 as lo, max({col})::float8 as hi from {table}) as bounds, generate_series(0, {bins}) as i',
+    'equal_depth': 'select percentile_cont(array(select i::float8 / {bins} from generate_series(0, {bins}) as i)) within group (order by {col}::float8) as edges from {table}'
+}
+
+def get_histogram_query(schema_name, table_name, col_name, bins, method='equal_width'):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_histogram_query (method): Function that returns the query used for computing the histogram of
+     a column from a Postgres table, already aggregated into bins
+    --------------------
+    Parameters
+    --------------------
+    schema_name(str): The schema name of the selected table in the target database
+    table_name(str): The table name of the selected table in the target database
+    col_name(str): The column name of the selected column in the target database
+    bins(int): The number of bins of the histogram
+    method(str): 'equal_width' for bins of the same width between the minimum and the maximum, 'equal_depth' for bins bounded by quantiles (keys of HISTOGRAM_EDGES)
+    --------------------
+    Pseudo-Code
+    --------------------
+    Compute the bins + 1 edges of the histogram as an array (HISTOGRAM_EDGES)
+    Assign every non-null value to a bin with width_bucket(), the maximum value being kept in the last bin, and count the values of each bin
+    Join the counts to every bin number so that the empty bins are returned too
+    --------------------
+    Returns
+    --------------------
+    (str): SQL query returning the columns bucket, lower, upper and count, one row per bin
+    """
+    table = f'{schema_name}.{table_name}'
+    col = quote_identifier(col_name)
+    edges = HISTOGRAM_EDGES[method].format(col=col, table=table, bins=int(bins))
+    return (f'with edges as ({edges}), '
+            f'counts as (select least(width_bucket({col}::float8, edges.edges), {int(bins)}) as bucket, count(*) as count from {table}, edges where {col} is not null group by 1) '
+            f'select b.bucket, edges.edges[b.bucket] as lower, edges.edges[b.bucket + 1] as upper, coalesce(counts.count, 0) as count '
+            f'from edges, generate_series(1, {int(bins)}) as b(bucket) left join counts on counts.bucket = b.bucket order by b.bucket')
@@ -1,6 +1,8 @@
 import streamlit as st
 
-from src.serie_text.logics import TextColumn
+from src.serie_text.logics import TextColumn, get_text_profiles
+from src.dataframe.display import display_sample_caption, display_column_toggles
+from src.profiling.logics import DISTINCT_EXACT
 
 def display_texts():
     """
@@ -30,13 +32,17 @@ def display_texts():
     """
     
     text = st.session_state.data
-    text.set_text_columns()
+    text.get_metric('set_text_columns')
     text_cols = text.text_cols
+    display_sample_caption()
 
     if text_cols is not None:
-        for col in text_cols:
-            with st.expander(col, expanded=False):
-                display_text(col, None) 
+        exact_distinct = st.session_state.get('exact_distinct', DISTINCT_EXACT)
+        new_column = lambda col: TextColumn(st.session_state.schema_selected, st.session_state.table_selected, col, st.session_state.db, text.df[col], text.is_sample, exact_distinct)
+        get_profiles = lambda executor: get_text_profiles(st.session_state.db, st.session_state.schema_selected, st.session_state.table_selected, text_cols, executor, exact_distinct)
+        for col, container, text_column in display_column_toggles('text', text_cols, new_column, get_profiles, 'set_text_columns'):
+            with container:
+                display_text(col, None, text_column)
 
 
 
@@ -45,7 +51,7 @@ def display_texts():
 
 
 
-def display_text(col_name, i):
+def display_text(col_name, i, text_column=None):
     """
     --------------------
     Description
@@ -71,8 +77,11 @@ def display_text(col_name, i):
     -> (type): description
 
     """
-    text_column = TextColumn(st.session_state.schema_selected, st.session_state.table_selected, col_name, st.session_state.db, st.session_state.data.df[col_name])
-    text_column.set_data()
+    if text_column is None:
+        text_column = TextColumn(st.session_state.schema_selected, st.session_state.table_selected, col_name, st.session_state.db, st.session_state.data.df[col_name], st.session_state.data.is_sample, st.session_state.get('exact_distinct', DISTINCT_EXACT))
+        text_column.set_data()
+    if text_column.unique_msg is not None:
+        st.warning(text_column.unique_msg)
     st.table(text_column.get_summary_df())
     st.text('Bar Chart')
     st.altair_chart(text_column.barchart)
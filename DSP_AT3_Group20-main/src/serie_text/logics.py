@@ -1,10 +1,101 @@
 from src import database
+import os
 import streamlit as st
 import pandas as pd
 import altair as alt
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from src.database.logics import PostgresConnector
-from src.serie_text.queries import get_missing_query, get_mode_query, get_alpha_query
+from src.dataframe.logics import set_metrics_basis, get_column_profiles, split_column_profiles
+from src.profiling.logics import MetricGraph, FrequencyTable, FREQUENCY_TOP_K, get_distinct_count, format_estimate, DISTINCT_EXACT
+from src.serie_text.queries import get_missing_query, get_mode_query, get_alpha_query, get_text_profile_query, TEXT_PROFILE_METRICS
+
+# Number of most frequent values displayed by the bar chart, the other values being aggregated into a single bar (0 to display every value)
+TEXT_BARCHART_TOP_K = int(os.environ.get('TEXT_BARCHART_TOP_K', 30))
+# Number of loaded values above which the most frequent values of a whole column are also counted by Postgres (FrequencyTable.from_query()) rather than in memory
+TEXT_FREQUENCY_QUERY_MIN_ROWS = int(os.environ.get('TEXT_FREQUENCY_QUERY_MIN_ROWS', 100000))
+
+def get_text_profiles(db, schema_name, table_name, col_names, executor=None, exact_distinct=True):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_text_profiles (function): Function that computes the metrics of all the text columns of a table with a single SQL query (get_text_profile_query())
+
+    --------------------
+    Parameters
+    --------------------
+    db - instantation of PostgresConnector class for handling Postgres connection
+    schema_name - this is the name of the schema in the postgres database we are extracting
+    table_name - the name of the table after selecting the specific schema name we analysing
+    col_names - the names of the text columns of the selected table
+    executor - ProfilingExecutor used for profiling batches of columns concurrently (optional)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Unless the distinct values are counted exactly, drop the n_unique aggregate from the metrics
+    Build the fused query of these metrics for the whole table
+    Run it once and split its single row into one profile per column (get_column_profiles())
+    If an executor is provided, split the columns into batches and run the queries of all the batches at the same time (ProfilingExecutor.map_queries())
+
+    --------------------
+    Returns
+    --------------------
+    dictionary with the profile of each column, keyed by the TextColumn attribute names
+
+    """
+    metrics = TEXT_PROFILE_METRICS if exact_distinct else {name: metric for name, metric in TEXT_PROFILE_METRICS.items() if name != 'n_unique'}
+    if executor is None:
+        return get_column_profiles(db, get_text_profile_query(schema_name, table_name, col_names, metrics), col_names, metrics)
+    return executor.map_queries(lambda batch: get_text_profile_query(schema_name, table_name, batch, metrics), lambda df, batch: split_column_profiles(df, batch, metrics), col_names)
+
+# Arrow compute kernels classifying each string, with the TextColumn attribute they count
+TEXT_CLASSES = {
+    'n_space': pc.utf8_is_space,
+    'n_lower': pc.utf8_is_lower,
+    'n_upper': pc.utf8_is_upper,
+    'n_alpha': pc.utf8_is_alpha,
+    'n_digit': pc.utf8_is_digit
+}
+
+def get_text_stats(serie):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_text_stats (function): Function that classifies all the values of a text serie at once with vectorised Arrow compute kernels
+    (whitespace only, lowercase only, uppercase only, alphabetical only, digits only, empty) and computes the statistics of their lengths
+
+    --------------------
+    Parameters
+    --------------------
+    serie(pd.Series): The text serie
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    Convert the serie to an Arrow string array in a single conversion (values which are not strings are converted to their text, missing values stay null)
+    Count the values matching each class of TEXT_CLASSES, with the same rules as the Python str methods (e.g. 'ab1' is lowercase, ' ' is not empty) and ignoring the missing values
+    Count the empty strings and the missing values
+    Compute the minimum, maximum and average length of the strings (in characters)
+
+    --------------------
+    Returns
+    --------------------
+    (dict): n_rows, n_missing, n_empty, n_space, n_lower, n_upper, n_alpha, n_digit, len_min, len_max and len_mean (None for a serie without string)
+
+    """
+    values = pa.array(serie.astype('string'), type=pa.string(), from_pandas=True)
+    stats = {'n_rows': len(values), 'n_missing': values.null_count}
+    stats['n_empty'] = pc.sum(pc.equal(values, '')).as_py() or 0
+    for name, kernel in TEXT_CLASSES.items():
+        stats[name] = pc.sum(kernel(values)).as_py() or 0
+    lengths = pc.utf8_length(values)
+    min_max = pc.min_max(lengths).as_py()
+    stats.update(len_min=min_max['min'], len_max=min_max['max'], len_mean=pc.mean(lengths).as_py())
+    return stats
 
 class TextColumn:
     """
@@ -22,6 +113,8 @@ class TextColumn:
     -> db (PostgresConnector): Instantation of PostgresConnector class for handling Postgres connection (mandatory)
     -> serie (pd.Series): Pandas serie where the content of a column has been loaded (mandatory)
     -> n_unique (int): Number of unique value of a serie (optional)
+    -> unique_error (float): Standard error of the number of unique values when it is estimated with a HyperLogLog sketch, 0 or None when it is exact (optional)
+    -> unique_msg (str): Why the number of unique values could not be computed, None when it is set (optional)
     -> n_missing (int): Number of missing values of a serie (optional)
     -> n_empty (int): Number of times a serie has empty value (optional)
     -> n_mode (int): Mode value of a serie (optional)
@@ -32,15 +125,32 @@ class TextColumn:
     -> n_digit (int): Number of times a serie has only digit characters (optional)
     -> barchart (int): Altair barchart displaying the count for each value of a serie (optional)
     -> frequent (int): Datframe containing the most frequest value of a serie (optional)
+    -> is_sample (bool): Whether serie only contains a sample of the table rows (optional)
+    -> exact_distinct (bool): Whether the distinct values are always counted exactly, rather than estimated with a HyperLogLog sketch for large or sampled series (optional, DISTINCT_EXACT by default)
+    -> exact_metrics (list): Descriptions of the metrics computed in SQL on the whole table, which are exact even when serie is a sample
+    -> profile_metrics (list): Descriptions of the metrics computed by the fused profile query (get_text_profile_query())
+    -> metrics (MetricGraph): Metrics computed so far, each computed once from self.serie (or set from the profile) and reused
 
     """
-    def __init__(self, schema_name=None, table_name=None, col_name=None, db=None, serie=None):
+    exact_metrics = ['Number of missing values', 'Number of Rows with only alphabet', 'The mode value']
+    profile_metrics = ['Number of unique values', 'Number of missing values', 'Number of Rows with empty string', 'Number of Rows with only whitespaces', 'Number of Rows with only lowercases', 'Number of Rows with only uppercases', 'Number of Rows with only alphabet', 'Number of Rows with only numbers as characters', 'The mode value']
+    # Methods setting the metrics of the fused profile query, then the ones computed from self.serie, with the metrics (or 'serie') they are computed from
+    profile_methods = ['set_unique', 'set_missing', 'set_empty', 'set_mode', 'set_whitespace', 'set_lowercase', 'set_uppercase', 'set_alphabet', 'set_digit']
+    metric_methods = profile_methods + ['set_barchart', 'set_frequent']
+    metric_dependencies = {'frequency_table': ('serie',), 'set_barchart': ('frequency_table',), 'set_frequent': ('frequency_table',), 'compute_stats': ('serie',)}
+    metric_dependencies.update({method: ('compute_stats',) for method in ['set_empty', 'set_whitespace', 'set_lowercase', 'set_uppercase', 'set_digit']})
+
+    def __init__(self, schema_name=None, table_name=None, col_name=None, db=None, serie=None, is_sample=False, exact_distinct=DISTINCT_EXACT):
         self.schema_name = schema_name
         self.table_name = table_name
         self.col_name = col_name
         self.db = db
         self.serie = serie
+        self.is_sample = is_sample
+        self.exact_distinct = exact_distinct
         self.n_unique = None
+        self.unique_error = None
+        self.unique_msg = None
         self.n_missing = None
         self.n_empty = None
         self.n_mode = None
@@ -51,9 +161,10 @@ class TextColumn:
         self.n_digit = None
         self.barchart = None
         self.frequent = None
+        self.metrics = MetricGraph(self, self.metric_dependencies)
 
     
-    def set_data(self):
+    def set_data(self, profile=None):
         """
         --------------------
         Description
@@ -63,30 +174,59 @@ class TextColumn:
         --------------------
         Parameters
         --------------------
-        None
+        profile - metrics of the column already computed by get_text_profiles() (optional)
 
         --------------------
         Pseudo-Code
         --------------------
-        Gathering the methods contained within the TextColumn class 
+        If a profile is provided, set the metrics from it without any query
+        Otherwise gathering the methods contained within the TextColumn class through self.metrics, which skips the metrics already computed (or set from the profile)
+        The barchart and the most frequent values are always computed from self.serie, sharing a single count of the values
 
         --------------------
         Returns
         --------------------
 
         """
+        if profile is not None:
+            self.set_profile(profile)
+        for method in self.metric_methods:
+            self.metrics.get(method)
+
+    def set_profile(self, profile):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_profile (method): Class method that sets the metrics of the column from its profile computed in SQL on the whole table
+
+        --------------------
+        Parameters
+        --------------------
+        profile - metrics of the column computed by get_text_profiles()
 
-        self.set_unique()
-        self.set_missing()
-        self.set_empty()
-        self.set_mode()
-        self.set_whitespace()
-        self.set_lowercase()
-        self.set_uppercase()
-        self.set_alphabet()
-        self.set_digit() 
-        self.set_barchart() 
-        self.set_frequent()
+        --------------------
+        Pseudo-Code
+        --------------------
+        set each class attribute from the value of the profile with the same name
+        as all these metrics are computed on the whole table, mark them as exact
+        mark the methods computing these metrics as computed in self.metrics, so that set_data() does not run them
+        if the profile has no number of unique values (get_text_profiles() without exact_distinct), leave it to set_unique() and do not mark it as exact
+
+        --------------------
+        Returns
+        --------------------
+        None
+
+        """
+        for metric in TEXT_PROFILE_METRICS:
+            if metric in profile:
+                setattr(self, metric, profile[metric])
+        has_unique = 'n_unique' in profile
+        self.exact_metrics = [metric for metric in self.profile_metrics if has_unique or metric != 'Number of unique values']
+        for method in self.profile_methods:
+            if has_unique or method != 'set_unique':
+                self.metrics.set(method)
       
     def is_serie_none(self):
         """
@@ -125,7 +265,7 @@ class TextColumn:
             return False
         
 
-    def set_unique(self):
+    def set_unique(self, exact=None):
         """
         --------------------
         Description
@@ -135,13 +275,14 @@ class TextColumn:
         --------------------
         Parameters
         --------------------
-        None
+        exact(bool): True to count exactly, False to estimate with a HyperLogLog sketch, None to count exactly only small series (default: None, or True if self.exact_distinct, see get_distinct_count())
 
         --------------------
         Pseudo-Code
         --------------------
-        create an object containing number of unique values in the dataframe
-        then return the result of the object showing the number of unique values in the dataframe
+        count the distinct values of the serie, exactly for small series and with a HyperLogLog sketch otherwise (get_distinct_count())
+        then set the number of unique values and its standard error
+        if the values cannot be counted, leave them unset and keep the reason in unique_msg
 
         --------------------
         Returns
@@ -149,7 +290,13 @@ class TextColumn:
         int: the number of unique values
 
         """
-        self.n_unique = self.serie.nunique()
+        if exact is None and self.exact_distinct:
+            exact = True
+        try:
+            self.n_unique, self.unique_error = get_distinct_count(self.serie, exact)
+        except (TypeError, ValueError) as e:
+            self.n_unique, self.unique_error = None, None
+            self.unique_msg = f'The number of unique values of {self.col_name} could not be counted: {e}'
       
 
     def set_missing(self):
@@ -198,17 +345,16 @@ class TextColumn:
         --------------------
         Pseudo-Code
         --------------------
-        create an object containing if dataframe has null values
-        then return the output of the result of null values from the created object
+        get the count of empty strings ('') of the serie from the text classification (compute_stats()), null values not being counted as in the SQL profile
+        then store it in self.n_empty
 
         --------------------
         Returns
         --------------------
-        int: the number of null values in the dataframe
+        int: the number of empty strings in the dataframe
 
         """
-        self.n_empty = self.serie.isnull().sum()
-        # return f'{self.n_empty} number of null values in {self.serie}'
+        self.n_empty = self.metrics.get('compute_stats')['n_empty']
 
     def set_mode(self):
         """
@@ -255,7 +401,7 @@ class TextColumn:
         --------------------
         Pseudo-Code
         --------------------
-        class attribute self.n_space equals dataframe count of white spaces
+        class attribute self.n_space equals dataframe count of values with only white spaces, from the text classification (compute_stats())
         return result from self.n_space on the number of white spaces in the dataframe
 
         --------------------
@@ -265,17 +411,7 @@ class TextColumn:
         int: returns the number of white spaces from the dataframe
 
         """
-        count=0
-        for a in self.serie:
-            if a is not None:
-                if a.isspace() == True:
-                    count+=1
-                else: 
-                    count+=0
-                
-        self.n_space = count
-
-        # self.n_space = self.serie.str.isspace().sum()
+        self.n_space = self.metrics.get('compute_stats')['n_space']
         
 
         # return f'{self.n_space} number of counts with only space characters in {self.serie}'
@@ -295,7 +431,7 @@ class TextColumn:
         --------------------
         Pseudo-Code
         --------------------
-        class attribute self.n_lower represents count of lowercase letters within the dataframe
+        class attribute self.n_lower represents count of values whose letters are all lowercase, from the text classification (compute_stats())
         return result from self.n_lower on the number of lowercase letters in the dataframe
 
         --------------------
@@ -304,7 +440,7 @@ class TextColumn:
         int: returns the numbrer lowercase letters from the dataframe
 
         """
-        self.n_lower = self.serie.str.contains(r'[a-z]').sum()
+        self.n_lower = self.metrics.get('compute_stats')['n_lower']
    
 
     def set_uppercase(self):
@@ -322,7 +458,7 @@ class TextColumn:
         --------------------
         Pseudo-Code
         --------------------
-        class attribute self.n_upper represents a count of uppercase letters within the dataframe
+        class attribute self.n_upper represents a count of values whose letters are all uppercase, from the text classification (compute_stats())
         returns result of the number of uppercase letters of the dataframe 
 
         --------------------
@@ -331,13 +467,7 @@ class TextColumn:
         int: returns the numbrer uppercase letters from the dataframe
 
         """
-        # => To be filled by student
-        # self.n_upper = self.serie.str.count(r'[A-Z]')
-        self.n_upper = self.serie.str.contains(r'[A-Z]').sum()
-        # return f'{self.n_upper} number of upper case letters in {self.serie}'
-        #self.n_upper = self.serie.str.findall(r'[A-Z]').str.len()
-        #or
-        #self.n_upper = self.serie.str.count(r'[A-Z]')
+        self.n_upper = self.metrics.get('compute_stats')['n_upper']
 
     def set_alphabet(self):
         """
@@ -384,7 +514,7 @@ class TextColumn:
         --------------------
         Pseudo-Code
         --------------------
-        self.n_digits represents the sum of digits appearing in the dataframe (using loop)
+        self.n_digits represents the count of values with only digits in the dataframe, from the text classification (compute_stats()), the missing values being ignored
         return results from from self.n_digits 
 
         --------------------
@@ -393,25 +523,69 @@ class TextColumn:
         the final result of the number of digits appearing in the dataframe
 
         """
-        count = 0
-        try:
-            for a in self.serie:
-                if a.isdigit()== True:
-                    count+=1
-        except:
-             count+=0
-        
+        self.n_digit = self.metrics.get('compute_stats')['n_digit']
+
+    def compute_stats(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> compute_stats (method): Class method that classifies the values of self.serie with the vectorised text classification, shared by the metric methods
+
+        --------------------
+        Parameters
+        --------------------
+        None
 
-        self.n_digit = count
-        # self.n_digit =  sum(c.isdigit() for c in self.serie)
+        --------------------
+        Pseudo-Code
+        --------------------
+        return the result of get_text_stats() on the serie, computed once through self.metrics ('compute_stats')
 
+        --------------------
+        Returns
+        --------------------
+        dict: the counts of each class of values and the statistics of their lengths (see get_text_stats())
+
+        """
+        return get_text_stats(self.serie)
+
+    def frequency_table(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> frequency_table (method): Class method that counts the occurrences of each value of the column, shared by the chart and the most frequent values
+
+        --------------------
+        Parameters
+        --------------------
+        None
+
+        --------------------
+        Pseudo-Code
+        --------------------
+        If FREQUENCY_TOP_K is positive and the serie is a sample, is not loaded or holds more than TEXT_FREQUENCY_QUERY_MIN_ROWS values,
+        count the FREQUENCY_TOP_K most frequent values of the whole table with a single grouped query bounded by LIMIT (FrequencyTable.from_query())
+        Otherwise count every value of the serie (FrequencyTable.from_serie())
+        Computed once through self.metrics ('frequency_table')
+
+        --------------------
+        Returns
+        --------------------
+        (FrequencyTable): The number of occurrences of each value, by decreasing number
+
+        """
+        if FREQUENCY_TOP_K > 0 and self.db is not None and (self.is_sample or self.serie is None or len(self.serie) > TEXT_FREQUENCY_QUERY_MIN_ROWS):
+            return FrequencyTable.from_query(self.db, self.schema_name, self.table_name, self.col_name, FREQUENCY_TOP_K)
+        return FrequencyTable.from_serie(self.serie)
 
     def set_barchart(self):  
         """
         --------------------
         Description
         --------------------
-        -> set_barchart (method): Class method that computes the Altair barchart displaying the count for each value of a serie
+        -> set_barchart (method): Class method that computes the Altair barchart displaying the count for the most frequent values of a serie and for all the other values together
 
         --------------------
         Parameters
@@ -421,9 +595,9 @@ class TextColumn:
         --------------------
         Pseudo-Code
         --------------------
-        Save the count for each value of a serie as a dataframe and name it 'df'
-        reset the index of the dataframe df
-        setup a barchart using Altair package 
+        Save the count for the TEXT_BARCHART_TOP_K most frequent values of a serie, followed by the exact count of all the other values in a single 'Other' row, as a dataframe from the frequency table (frequency_table()) and name it 'df'
+        (every value is kept if TEXT_BARCHART_TOP_K is 0, up to FREQUENCY_TOP_K if positive), the counts of a sampled or large column coming from a bounded SQL query
+        setup a barchart using Altair package, keeping the bars in the order of df and greying the 'Other' bar
         
 
         --------------------
@@ -434,11 +608,11 @@ class TextColumn:
 
         """
 
-        df = pd.DataFrame(self.serie.value_counts())
-        df = df.reset_index()
+        df = self.metrics.get('frequency_table').get_top_k_df(TEXT_BARCHART_TOP_K or FREQUENCY_TOP_K)
         self.barchart = alt.Chart(df).mark_bar().encode(
-            x = alt.X('index', title =f'{self.col_name}'),
-            y = alt.Y(f'{self.col_name}', title='Count of Records')
+            x = alt.X('index', title =f'{self.col_name}', sort=None),
+            y = alt.Y(f'{self.col_name}', title='Count of Records'),
+            color = alt.condition('datum.is_other', alt.value('lightgray'), alt.value('steelblue'))
         )        
 
         # df = pd.DataFrame(self.serie.value_counts())
@@ -464,11 +638,9 @@ class TextColumn:
         --------------------
         Pseudo-Code
         --------------------
-        put all the frequent values into a pandas dataframe and save it as object df
-        reset the index of the dataframe in df
-        name two columns as 'value' and 'occurrence' in df
-        create a loop for each value in occurrence the new column name 'percentage' in df = the value of occurrence / total sum of the occurence
-        show only 20 records of df dataframe as save it to the self attribute self.frequent
+        get the 20 most frequent values from the frequency table (frequency_table()) with the columns 'value', 'occurrence' and 'percentage'
+        the percentage of every value is computed at once as its occurrence / the number of non-null values of the column
+        save it to the self attribute self.frequent
          
 
 
@@ -479,13 +651,7 @@ class TextColumn:
 
         """
 
-        df = pd.DataFrame(self.serie.value_counts())
-        df = df.reset_index()
-        df.columns = ['value', 'occurrence']
-        for i in range(len(df.occurrence)):
-            df.loc[i,'percentage'] = df.loc[i,'occurrence'] / sum(df.occurrence)
-        df = df.head(end)
-        self.frequent = df 
+        self.frequent = self.metrics.get('frequency_table').get_frequent(end)
 
     def get_summary_df(self):
         """
@@ -512,6 +678,7 @@ class TextColumn:
         Number of Rows with Only alphabet (self.n_alpha),
         Number of Rows with Only digits (self.n_digit)
         with  dataframe column names [Description, value] 
+        If the serie is a sample, each metric is labelled as exact or estimated from the sample
 
         --------------------
         Returns
@@ -519,7 +686,7 @@ class TextColumn:
         This output will show all the information requested by the methods into a dataframe
 
         """
-        df = pd.DataFrame([['Number of unique values', self.n_unique],
+        df = pd.DataFrame([['Number of unique values', format_estimate(self.n_unique, self.unique_error)],
                         ['Number of missing values', self.n_missing],
                         ['Number of Rows with empty string', self.n_empty],
                         ['Number of Rows with only whitespaces', self.n_space],
@@ -530,6 +697,9 @@ class TextColumn:
                         ['The mode value',self.n_mode]],
                         columns= ['Description', 'Value'])
 
-        return df.astype(str)
+        df = df.astype(str)
+        if self.is_sample:
+            df = set_metrics_basis(df, self.exact_metrics)
+        return df
 
  
\ No newline at end of file
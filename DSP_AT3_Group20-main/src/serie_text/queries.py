@@ -1,3 +1,5 @@
+from src.profiling.queries import quote_identifier
+
 def get_missing_query(schema_name, table_name, col_name):
     """
   
@@ -85,4 +87,46 @@ def get_alpha_query(schema_name, table_name, col_name):
     """
 
     return f"select count({col_name}) from {schema_name}.{table_name} where {col_name} ~* '[A-Z]'"
-    #return f"The number of alphabetical characters only in {col_name} "select count({col_name}) from {schema_name}.{table_name} where {col_name} ~* '[A-Z]';"'
\ No newline at end of file
+    #return f"The number of alphabetical characters only in {col_name} "select count({col_name}) from {schema_name}.{table_name} where {col_name} ~* '[A-Z]';"'
+
+TEXT_PROFILE_METRICS = {
+    'n_unique': "count(distinct {col})",
+    'n_missing': "count(*) - count({col})",
+    'n_empty': "count(*) filter (where {col} = '')",
+    'n_space': "count(*) filter (where {col} ~ '^[[:space:]]+$')",
+    'n_lower': "count(*) filter (where {col} = lower({col}) and {col} <> upper({col}))",
+    'n_upper': "count(*) filter (where {col} = upper({col}) and {col} <> lower({col}))",
+    'n_alpha': "count(*) filter (where {col} ~ '^[[:alpha:]]+$')",
+    'n_digit': "count(*) filter (where {col} ~ '^[[:digit:]]+$')",
+    'n_mode': "mode() within group (order by {col})"
+}
+
+def get_text_profile_query(schema_name, table_name, col_names, metrics=TEXT_PROFILE_METRICS):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_text_profile_query (method): Function that returns a single query computing all the metrics of every text column of a Postgres table in one scan
+
+    --------------------
+    Parameters
+    --------------------
+    schema_name - this is the name of the schema in the postgres database we are extracting
+    table_name - the name of the table after selecting the specific schema name we analysing
+    col_names - the names of the text columns of the selected table
+    metrics - the aggregates computed for every column, keyed by metric name (default: TEXT_PROFILE_METRICS)
+
+    --------------------
+    Pseudo-Code
+    --------------------
+    For every column and every metric, add the aggregate (mostly COUNT with a FILTER clause) of the quoted column to the select list
+    Alias each aggregate with the metric name and the position of the column
+
+    --------------------
+    Returns
+    --------------------
+    SQL query returning a single row with one value per metric and column
+
+    """
+    aggregates = [f"{metric.format(col=quote_identifier(col_name))} as {name}_{i}" for i, col_name in enumerate(col_names) for name, metric in metrics.items()]
+    return f"select {', '.join(aggregates)} from {schema_name}.{table_name}"
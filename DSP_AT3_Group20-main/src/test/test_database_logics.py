@@ -1,4 +1,7 @@
 import os
+import asyncio
+import gc
+import datetime
 from cmath import nan
 import sys
 import unittest
@@ -8,7 +11,8 @@ import pandas.testing as pd_testing
 import psycopg2
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
-from src.database.logics import PostgresConnector
+from src.database.queries import get_catalog_metadata_query
+from src.database.logics import PostgresConnector, ConnectionPool, connection_pools, connection_pools_lock, get_connection_pool, get_pools_stats, QueryCache, query_cache, normalize_query, get_query_tables, AsyncPostgresConnector, TableCatalog
 
 class TestPostgresConnectorInstantiation(unittest.TestCase):
     """
@@ -39,6 +43,7 @@ class TestOpenConnection(unittest.TestCase):
         host = 'localhost'
         port = '5432'
         self.postgresConnector = PostgresConnector(database, username, password, host, port)
+        connection_pools.clear()
 
     #test successful connection
     @mock.patch('psycopg2.connect')
@@ -53,7 +58,7 @@ class TestOpenConnection(unittest.TestCase):
         )
         self.assertEqual(result['status'], True)
         self.assertEqual(result['msg'], 'Connection to database established')
-        self.assertEqual(self.postgresConnector.conn, mock_connect.return_value)
+        self.assertEqual(self.postgresConnector.pool.idle[0][0], mock_connect.return_value)
 
     #test failed connection
     @mock.patch('psycopg2.connect')
@@ -73,6 +78,133 @@ class TestOpenConnection(unittest.TestCase):
         self.assertEqual(result['status'], False)
         self.assertEqual(result['msg'], expected_msg)
         self.assertEqual(self.postgresConnector.conn, None)
+        self.assertEqual(self.postgresConnector.pool, None)
+
+    #test that two sessions connecting to the same database share the same pool
+    @mock.patch('psycopg2.connect')
+    def test_open_connection_shared_pool(self, mock_connect):
+        other_session = PostgresConnector('postgres', 'postgres', 'postgrespwd', 'localhost', '5432')
+        self.postgresConnector.open_connection()
+        other_session.open_connection()
+        self.assertIs(self.postgresConnector.pool, other_session.pool)
+        self.assertEqual(mock_connect.call_count, 1)
+
+class TestConnectionPool(unittest.TestCase):
+    """
+    Class used for testing the ConnectionPool class and get_connection_pool() from src/database/logics.py
+    """
+    def setUp(self):
+        connection_pools.clear()
+        self.patcher = mock.patch('psycopg2.connect', side_effect=self.new_mock_connection)
+        self.mock_connect = self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def new_mock_connection(self, **kwargs):
+        conn = mock.MagicMock()
+        conn.closed = 0
+        conn.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        return conn
+
+    # test a returned connection is reused instead of opening a new one
+    def test_borrow_and_return(self):
+        pool = ConnectionPool('postgres', 'postgres', 'pwd', 'localhost', '5432', minconn=1, maxconn=2)
+        conn = pool.getconn()
+        self.assertEqual(pool.get_stats()['in_use'], 1)
+        pool.putconn(conn)
+        self.assertIs(pool.getconn(), conn)
+        self.assertEqual(self.mock_connect.call_count, 1)
+
+    # test borrowers wait and then fail when every connection is in use
+    def test_pool_exhausted(self):
+        pool = ConnectionPool('postgres', 'postgres', 'pwd', 'localhost', '5432', minconn=0, maxconn=2, wait_timeout=0)
+        pool.getconn()
+        pool.getconn()
+        with self.assertRaises(psycopg2.pool.PoolError):
+            pool.getconn()
+        self.assertEqual(pool.get_stats()['timeouts'], 1)
+
+    # test a closed connection is discarded by the health check
+    def test_health_check(self):
+        pool = ConnectionPool('postgres', 'postgres', 'pwd', 'localhost', '5432', minconn=1, maxconn=2)
+        broken_conn = pool.idle[0][0]
+        broken_conn.closed = 1
+        conn = pool.getconn()
+        self.assertIsNot(conn, broken_conn)
+        self.assertEqual(pool.get_stats()['discarded'], 1)
+
+    # test idle connections above minconn are closed after idle_timeout
+    def test_reap_idle(self):
+        pool = ConnectionPool('postgres', 'postgres', 'pwd', 'localhost', '5432', minconn=1, maxconn=3, idle_timeout=0)
+        conns = [pool.getconn(), pool.getconn(), pool.getconn()]
+        for conn in conns:
+            pool.putconn(conn)
+        pool.getconn()
+        stats = pool.get_stats()
+        self.assertEqual(stats['size'], 1)
+        self.assertEqual(stats['reaped'], 2)
+
+    # test a slow connection attempt does not hold the lock and the reservation is rolled back on failure
+    def test_connect_outside_lock(self):
+        pool = ConnectionPool('postgres', 'postgres', 'pwd', 'localhost', '5432', minconn=0, maxconn=1, wait_timeout=0)
+        def failing_connect(**kwargs):
+            self.assertTrue(pool.lock.acquire(blocking=False))
+            pool.lock.release()
+            self.assertEqual(pool.get_stats()['pending'], 1)
+            raise psycopg2.OperationalError('server down')
+        self.mock_connect.side_effect = failing_connect
+        with self.assertRaises(psycopg2.OperationalError):
+            pool.getconn()
+        stats = pool.get_stats()
+        self.assertEqual(stats['pending'], 0)
+        self.assertEqual(stats['size'], 0)
+        self.mock_connect.side_effect = self.new_mock_connection
+        pool.getconn()
+        self.assertEqual(pool.get_stats()['created'], 1)
+
+    # test the pool is replaced when the same user connects with another password, and closed once its sessions detach
+    def test_get_connection_pool_password_changed(self):
+        pool = get_connection_pool('postgres', 'postgres', 'pwd', 'localhost', '5432')
+        self.assertIs(get_connection_pool('postgres', 'postgres', 'pwd', 'localhost', '5432'), pool)
+        new_pool = get_connection_pool('postgres', 'postgres', 'new_pwd', 'localhost', '5432')
+        self.assertIsNot(new_pool, pool)
+        self.assertTrue(pool.retired)
+        self.assertFalse(pool.closed)
+        self.assertEqual(list(get_pools_stats().keys()), ['postgres@localhost:5432/postgres'])
+        conn = pool.getconn()
+        pool.detach()
+        pool.detach()
+        self.assertTrue(pool.closed)
+        pool.putconn(conn)
+        conn.close.assert_called_once()
+        self.assertFalse(new_pool.closed)
+
+    # test the pool is created without holding the lock of the registry
+    def test_get_connection_pool_outside_lock(self):
+        def connect(**kwargs):
+            self.assertTrue(connection_pools_lock.acquire(blocking=False))
+            connection_pools_lock.release()
+            return self.new_mock_connection()
+        self.mock_connect.side_effect = connect
+        pool = get_connection_pool('postgres', 'postgres', 'pwd', 'localhost', '5432')
+        self.assertEqual(pool.get_stats()['sessions'], 1)
+
+    # test a session detaches from a replaced pool when it connects again, which closes the pool
+    def test_session_detaches_retired_pool(self):
+        session = PostgresConnector('postgres', 'postgres', 'pwd', 'localhost', '5432')
+        session.open_connection()
+        old_pool = session.pool
+        session.password = 'new_pwd'
+        session.open_connection()
+        self.assertIsNot(session.pool, old_pool)
+        self.assertTrue(old_pool.closed)
+        pool = session.pool
+        self.assertEqual(pool.get_stats()['sessions'], 1)
+        del session
+        gc.collect()
+        self.assertEqual(pool.get_stats()['sessions'], 0)
+        self.assertFalse(pool.closed)
 
 class TestCloseConnection(unittest.TestCase):
     """
@@ -86,6 +218,12 @@ class TestCloseConnection(unittest.TestCase):
         postgresConnector.close_connection()
         mock_conn.close.assert_called()
 
+    def test_close_connection_pooled(self):
+        postgresConnector = PostgresConnector(None, None, None, None, None)
+        postgresConnector.pool = mock.MagicMock()
+        postgresConnector.close_connection()
+        postgresConnector.pool.closeall.assert_not_called()
+
 class TestOpenCursor(unittest.TestCase):
     """
     Class used for testing the PostgresConnector.open_cursor() method from src/database/logics.py
@@ -98,6 +236,16 @@ class TestOpenCursor(unittest.TestCase):
         mock_con.cursor.assert_called() 
         self.assertEqual(mock_con.cursor.return_value, postgresConnector.cursor)
 
+    def test_open_cursor_pooled(self):
+        postgresConnector = PostgresConnector(None, None, None, None, None)
+        postgresConnector.pool = mock.MagicMock()
+        mock_con = postgresConnector.pool.getconn.return_value
+        postgresConnector.open_cursor()
+        self.assertEqual(mock_con.cursor.return_value, postgresConnector.cursor)
+        postgresConnector.close_cursor()
+        postgresConnector.pool.putconn.assert_called_once_with(mock_con)
+        self.assertIsNone(postgresConnector.cursor_conn)
+
 class TestCloseCursor(unittest.TestCase):
     """
     Class used for testing the PostgresConnector.close_cursor() method from src/database/logics.py
@@ -172,6 +320,278 @@ class TestRunQuery(unittest.TestCase):
 
         self.assertTrue(expected_results.equals(result))
 
+class TestAsyncPostgresConnector(unittest.TestCase):
+    """
+    Class used for testing the AsyncPostgresConnector class from src/database/logics.py
+    """
+    def new_conn(self, *args, **kwargs):
+        conn = mock.MagicMock()
+        conn.closed = 0
+        conn.status = psycopg2.extensions.STATUS_READY
+        conn.isexecuting.return_value = False
+        conn.poll.return_value = psycopg2.extensions.POLL_OK
+        cursor = conn.cursor.return_value
+        def execute(sql_query):
+            if sql_query == 'broken':
+                raise psycopg2.OperationalError('server closed the connection unexpectedly')
+            cursor.fetchall.return_value = [(sql_query,)]
+        cursor.execute.side_effect = execute
+        cursor.description = [('query',)]
+        return conn
+
+    @mock.patch('psycopg2.connect')
+    def test_gather_queries(self, mock_connect):
+        mock_connect.side_effect = self.new_conn
+        connector = AsyncPostgresConnector(max_connections=2)
+        results = connector.run_queries([f'select {i}' for i in range(5)])
+        self.assertEqual([df['query'][0] for df in results], [f'select {i}' for i in range(5)])
+        self.assertLessEqual(mock_connect.call_count, 2)
+        self.assertEqual(mock_connect.call_args.kwargs['async_'], 1)
+        connector.close_connection()
+        self.assertEqual(connector.n_open, 0)
+
+    @mock.patch('psycopg2.connect')
+    def test_run_query_error(self, mock_connect):
+        mock_connect.side_effect = self.new_conn
+        connector = AsyncPostgresConnector()
+        result = asyncio.run(connector.run_query('broken'))
+        self.assertEqual(result.shape, (0, 0))
+
+    @mock.patch('psycopg2.connect')
+    def test_run_queries_in_running_loop(self, mock_connect):
+        mock_connect.side_effect = self.new_conn
+        connector = AsyncPostgresConnector()
+        async def run():
+            return connector.run_queries(['select 1'])
+        self.assertEqual(asyncio.run(run())[0]['query'][0], 'select 1')
+
+    # test a connection whose query was cancelled or failed is closed instead of being reused
+    @mock.patch('psycopg2.connect')
+    def test_execute_cancelled(self, mock_connect):
+        mock_connect.side_effect = self.new_conn
+        connector = AsyncPostgresConnector()
+        async def cancel():
+            with mock.patch.object(connector, 'wait', side_effect=[None, asyncio.CancelledError()]):
+                await connector.execute('select 1')
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(cancel())
+        self.assertEqual((connector.idle, connector.n_open), ([], 0))
+        mock_connect.return_value.close.assert_not_called()
+        self.assertEqual(asyncio.run(connector.run_query('broken')).shape, (0, 0))
+        self.assertEqual((connector.idle, connector.n_open), ([], 0))
+
+    # test the asynchronous connections take slots of the connection pool and give them back
+    @mock.patch('psycopg2.connect')
+    def test_pool_slots(self, mock_connect):
+        mock_connect.side_effect = self.new_conn
+        pool = ConnectionPool('postgres', 'postgres', 'pwd', 'localhost', '5432', minconn=1, maxconn=1, wait_timeout=0)
+        connector = AsyncPostgresConnector(max_connections=4, pool=pool)
+        results = connector.run_queries([f'select {i}' for i in range(5)])
+        self.assertEqual([df['query'][0] for df in results], [f'select {i}' for i in range(5)])
+        # the idle pooled connection is closed to make room, and the slot is given back once the queries are done
+        self.assertEqual(mock_connect.call_count, 2)
+        self.assertEqual(pool.get_stats()['size'], 0)
+        self.assertEqual(connector.n_open, 0)
+        # no slot is free while the only connection of the pool is borrowed
+        conn = pool.getconn()
+        self.assertFalse(pool.reserve_slot())
+        with self.assertRaises(psycopg2.pool.PoolError):
+            asyncio.run(connector.execute('select 1'))
+        pool.putconn(conn)
+        self.assertEqual(pool.get_stats()['external'], 0)
+
+    def test_get_async_connector(self):
+        postgresConnector = PostgresConnector('postgres', 'postgres', 'pwd', 'localhost', '5432')
+        connector = postgresConnector.get_async_connector()
+        self.assertIs(postgresConnector.get_async_connector(), connector)
+        self.assertEqual(connector.database, 'postgres')
+
+class TestQueryCache(unittest.TestCase):
+    """
+    Class used for testing the QueryCache class and the cached PostgresConnector.run_query() from src/database/logics.py
+    """
+    def setUp(self):
+        query_cache.clear()
+
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query(" SELECT *\n  FROM public.user ; "), "SELECT * FROM public.user")
+
+    def test_get_query_tables(self):
+        sql_query = "select c.column_name from public.orders o join sales.items i on true, information_schema.columns c"
+        self.assertEqual(get_query_tables(sql_query), [('public', 'orders'), ('sales', 'items')])
+        self.assertEqual(get_query_tables('select * from "Sales"."Order ""Items""" join Public.Orders on true'), [('Sales', 'Order "Items"'), ('public', 'orders')])
+        self.assertEqual(get_query_tables('select * from information_schema.columns'), [])
+        self.assertIsNone(get_query_tables('select * from orders'))
+
+    def test_tables_fingerprint_ttl(self):
+        postgresConnector = PostgresConnector(None, None, None, None, None, use_cache=True)
+        fingerprint_df = pd.DataFrame([['public', 'orders', 1]])
+        with mock.patch.object(postgresConnector, 'run_query', return_value=fingerprint_df) as mock_run_query:
+            first = postgresConnector.get_tables_fingerprint([('public', 'orders')])
+            second = postgresConnector.get_tables_fingerprint([('public', 'orders')])
+            self.assertEqual(first, second)
+            self.assertEqual(mock_run_query.call_count, 1)
+            with mock.patch('src.database.logics.FINGERPRINT_TTL', 0):
+                postgresConnector.get_tables_fingerprint([('public', 'orders')])
+            self.assertEqual(mock_run_query.call_count, 2)
+            self.assertIsNone(postgresConnector.get_tables_fingerprint(None))
+
+    def test_lru_eviction(self):
+        cache = QueryCache(max_entries=2)
+        for key in ('a', 'b'):
+            cache.put(key, pd.DataFrame([[1]], columns=[key]))
+        cache.get('a')
+        cache.put('c', pd.DataFrame([[1]], columns=['c']))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+    def test_max_bytes(self):
+        cache = QueryCache(max_bytes=1000)
+        cache.put('big', pd.DataFrame({'a': range(1000)}))
+        self.assertIsNone(cache.get('big'))
+        self.assertEqual(cache.get_stats()['bytes'], 0)
+
+    def test_ttl(self):
+        cache = QueryCache(ttl=0)
+        cache.put('a', pd.DataFrame([[1]], columns=['a']))
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get_stats()['expired'], 1)
+
+    def test_get_returns_copy(self):
+        cache = QueryCache()
+        cache.put('a', pd.DataFrame([[1]], columns=['a']))
+        cache.get('a')['a'] = 2
+        self.assertEqual(cache.get('a').loc[0, 'a'], 1)
+
+    @mock.patch('src.database.logics.PostgresConnector.get_tables_fingerprint')
+    def test_run_query_cached(self, mock_fingerprint):
+        mock_fingerprint.return_value = (('public', 'orders', '1'),)
+        mock_con = mock.MagicMock()
+        mock_cursor = mock_con.cursor.return_value
+        mock_cursor.fetchall.return_value = [[1]]
+        mock_cursor.description = (psycopg2.extensions.Column(name='count', type_code=20),)
+        postgresConnector = PostgresConnector(None, None, None, None, None, use_cache=True)
+        postgresConnector.conn = mock_con
+
+        first = postgresConnector.run_query('SELECT count(*) FROM public.orders')
+        second = postgresConnector.run_query('SELECT count(*)\nFROM public.orders')
+        self.assertEqual(mock_cursor.execute.call_count, 1)
+        pd_testing.assert_frame_equal(first, second)
+
+        mock_fingerprint.return_value = (('public', 'orders', '2'),)
+        postgresConnector.run_query('SELECT count(*) FROM public.orders')
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+
+    @mock.patch('src.database.logics.PostgresConnector.get_tables_fingerprint')
+    def test_run_query_not_cacheable(self, mock_fingerprint):
+        mock_fingerprint.return_value = None
+        mock_con = mock.MagicMock()
+        mock_cursor = mock_con.cursor.return_value
+        mock_cursor.fetchall.return_value = [[1]]
+        mock_cursor.description = (psycopg2.extensions.Column(name='count', type_code=20),)
+        postgresConnector = PostgresConnector(None, None, None, None, None, use_cache=True)
+        postgresConnector.conn = mock_con
+
+        postgresConnector.run_query('SELECT count(*) FROM public.orders_view')
+        postgresConnector.run_query('SELECT count(*) FROM public.orders_view')
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+        self.assertEqual(query_cache.get_stats()['entries'], 0)
+
+class TestRunQueryChunks(unittest.TestCase):
+    """
+    Class used for testing the PostgresConnector.run_query_chunks() method from src/database/logics.py
+    """
+    def setUp(self):
+        self.mock_con = mock.MagicMock()
+        self.mock_con.autocommit = True
+        self.mock_cursor = self.mock_con.cursor.return_value
+        self.mock_cursor.description = (psycopg2.extensions.Column(name='id', type_code=23),)
+        self.postgresConnector = PostgresConnector(None, None, None, None, None)
+        self.postgresConnector.conn = self.mock_con
+
+    # test the rows are yielded as dataframes of at most chunksize rows using a named cursor
+    def test_run_query_chunks(self):
+        self.mock_cursor.__iter__.return_value = iter([[1], [2], [3], [4], [5]])
+        chunks = list(self.postgresConnector.run_query_chunks('SELECT id FROM public.orders', chunksize=2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        pd_testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), pd.DataFrame([[1], [2], [3], [4], [5]], columns=['id']))
+        self.assertIsNotNone(self.mock_con.cursor.call_args.kwargs['name'])
+        self.assertEqual(self.mock_cursor.itersize, 2)
+        self.mock_cursor.close.assert_called()
+        self.assertTrue(self.mock_con.autocommit)
+
+    # test an empty result still yields a dataframe with the column names
+    def test_run_query_chunks_empty_result(self):
+        self.mock_cursor.__iter__.return_value = iter([])
+        chunks = list(self.postgresConnector.run_query_chunks('SELECT id FROM public.orders', chunksize=2))
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(list(chunks[0].columns), ['id'])
+        self.assertTrue(chunks[0].empty)
+
+class TestRunCopyQuery(unittest.TestCase):
+    """
+    Class used for testing the PostgresConnector.run_copy_query() method from src/database/logics.py
+    """
+    def setUp(self):
+        self.mock_con = mock.MagicMock()
+        self.mock_cursor = self.mock_con.cursor.return_value
+        self.postgresConnector = PostgresConnector(None, None, None, None, None)
+        self.postgresConnector.conn = self.mock_con
+
+    # test the CSV exported by COPY is parsed into typed columns
+    def test_run_copy_query(self):
+        csv_content = b'id,price,name,active,created\n1,2.5,tea,t,2022-01-01\n\\N,NaN,"",f,\\N\n'
+        self.mock_cursor.description = (
+            psycopg2.extensions.Column(name='id', type_code=23),
+            psycopg2.extensions.Column(name='price', type_code=701),
+            psycopg2.extensions.Column(name='name', type_code=25),
+            psycopg2.extensions.Column(name='active', type_code=16),
+            psycopg2.extensions.Column(name='created', type_code=1082)
+        )
+        self.mock_cursor.copy_expert.side_effect = lambda sql, buffer: buffer.write(csv_content)
+        result = self.postgresConnector.run_copy_query('SELECT * FROM public.products')
+
+        self.mock_cursor.execute.assert_called_with('SELECT * FROM (SELECT * FROM public.products) AS result_types LIMIT 0')
+        self.assertEqual(self.mock_cursor.copy_expert.call_args.args[0], "COPY (SELECT * FROM public.products) TO STDOUT WITH (FORMAT csv, HEADER true, NULL '\\N')")
+        self.assertEqual(list(result.dtypes.astype(str)), ['float64', 'float64', 'object', 'boolean', 'object'])
+        self.assertTrue(pd.isna(result.loc[1, 'id']))
+        self.assertTrue(pd.isna(result.loc[1, 'price']))
+        self.assertEqual(result.loc[1, 'name'], '')
+        self.assertEqual(result.loc[0, 'name'], 'tea')
+        self.assertFalse(result.loc[1, 'active'])
+        self.assertEqual(result.loc[0, 'created'], datetime.date(2022, 1, 1))
+        self.assertTrue(pd.isna(result.loc[1, 'created']))
+        self.mock_cursor.close.assert_called()
+
+    # test timestamps are parsed like psycopg2 does, and values that cannot be parsed raise an error
+    def test_run_copy_query_timestamps(self):
+        csv_content = b'created,created_tz,expires\n2022-01-01 10:30:00,2022-01-01 10:30:00+02,3000-01-01 00:00:00\n\\N,\\N,infinity\n'
+        self.mock_cursor.description = (
+            psycopg2.extensions.Column(name='created', type_code=1114),
+            psycopg2.extensions.Column(name='created_tz', type_code=1184),
+            psycopg2.extensions.Column(name='expires', type_code=1114)
+        )
+        self.mock_cursor.copy_expert.side_effect = lambda sql, buffer: buffer.write(csv_content)
+        result = self.postgresConnector.run_copy_query('SELECT * FROM public.products')
+        self.assertEqual(list(result.dtypes.astype(str)), ['datetime64[ns]', 'datetime64[ns, UTC]', 'object'])
+        self.assertEqual(result.loc[0, 'created_tz'], pd.Timestamp('2022-01-01 08:30:00', tz='UTC'))
+        self.assertTrue(pd.isna(result.loc[1, 'created']))
+        self.assertEqual(list(result['expires']), [datetime.datetime(3000, 1, 1), datetime.datetime.max])
+
+        csv_content = b'created\n01/02/2022\n'
+        self.mock_cursor.description = (psycopg2.extensions.Column(name='created', type_code=1082),)
+        with self.assertRaises(ValueError):
+            self.postgresConnector.run_copy_query('SELECT * FROM public.products')
+
+    # test run_copy_query when query execution failed
+    def test_run_copy_query_execution_failed(self):
+        self.mock_cursor.execute.side_effect = psycopg2.OperationalError("Invalid query")
+        self.assertTrue(self.postgresConnector.run_copy_query("select from").empty)
+        self.mock_cursor.close.assert_called()
+
 class TestLoadTable(unittest.TestCase):
     """
     Class used for testing the PostgresConnector.load_table() method from src/database/logics.py
@@ -185,67 +605,238 @@ class TestLoadTable(unittest.TestCase):
 
         mock_run_query.assert_called_with(f'SELECT * FROM {schema_name}.{table_name}')
 
+    @mock.patch('src.database.logics.PostgresConnector.run_query_chunks')
+    def test_load_table_chunks(self, mock_run_query_chunks):
+        schema_name = 'public'
+        table_name = 'categories'
+        postgresConnector = PostgresConnector(None, None, None, None, None)
+        result = postgresConnector.load_table(schema_name, table_name, chunksize=1000)
+
+        mock_run_query_chunks.assert_called_with(f'SELECT * FROM {schema_name}.{table_name}', 1000)
+        self.assertEqual(result, mock_run_query_chunks.return_value)
+
+    @mock.patch('src.database.logics.PostgresConnector.run_copy_query')
+    def test_load_table_copy(self, mock_run_copy_query):
+        postgresConnector = PostgresConnector(None, None, None, None, None, 'copy')
+        postgresConnector.load_table('public', 'categories')
+
+        mock_run_copy_query.assert_called_with('SELECT * FROM public.categories')
+
+    @mock.patch('src.database.logics.PostgresConnector.run_query_chunks')
+    def test_load_table_stream(self, mock_run_query_chunks):
+        mock_run_query_chunks.return_value = iter([pd.DataFrame([[1]], columns=['id']), pd.DataFrame([[2]], columns=['id'])])
+        postgresConnector = PostgresConnector(None, None, None, None, None, 'stream')
+        result = postgresConnector.load_table('public', 'categories')
+
+        pd_testing.assert_frame_equal(result, pd.DataFrame([[1], [2]], columns=['id']))
+
+class TestBenchmarkLoaders(unittest.TestCase):
+    """
+    Class used for testing the PostgresConnector.benchmark_loaders() method from src/database/logics.py
+    """
+    @mock.patch('src.database.logics.PostgresConnector.load_table')
+    def test_benchmark_loaders(self, mock_load_table):
+        mock_load_table.return_value = pd.DataFrame([[1, 2]], columns=['a', 'b'])
+        postgresConnector = PostgresConnector(None, None, None, None, None)
+        result = postgresConnector.benchmark_loaders('public', 'categories', loaders=('query', 'copy'), repeat=2)
+
+        self.assertEqual(mock_load_table.call_count, 4)
+        self.assertEqual(sorted(result['loader']), ['copy', 'query'])
+        self.assertEqual(list(result.columns), ['loader', 'n_rows', 'n_cols', 'best_seconds', 'mean_seconds'])
+        self.assertEqual(postgresConnector.loader, 'query')
+
+class TestCatalogStats(unittest.TestCase):
+    """
+    Class used for testing the PostgresConnector.get_table_stats(), get_column_stats() and analyze_table() methods from src/database/logics.py
+    """
+    def setUp(self):
+        self.postgresConnector = PostgresConnector(None, None, None, None, None)
+
+    @mock.patch('src.database.logics.PostgresConnector.run_query')
+    def test_get_table_stats(self, mock_run_query):
+        mock_run_query.return_value = pd.DataFrame([[1000.0, 1000, 300, pd.Timestamp('2022-10-01')]], columns=['reltuples', 'n_live_tup', 'n_mod_since_analyze', 'last_analyze'])
+        result = self.postgresConnector.get_table_stats('public', 'categories')
+        self.assertEqual(result['n_rows'], 1000)
+        self.assertEqual(result['n_mod_since_analyze'], 300)
+        self.assertTrue(result['is_stale'])
+
+    @mock.patch('src.database.logics.PostgresConnector.run_query')
+    def test_get_table_stats_never_analyzed(self, mock_run_query):
+        mock_run_query.return_value = pd.DataFrame([[-1.0, 42, 42, None]], columns=['reltuples', 'n_live_tup', 'n_mod_since_analyze', 'last_analyze'])
+        result = self.postgresConnector.get_table_stats('public', 'categories')
+        self.assertEqual(result['n_rows'], 42)
+        self.assertIsNone(result['last_analyze'])
+        self.assertTrue(result['is_stale'])
+
+    @mock.patch('src.database.logics.PostgresConnector.run_query')
+    def test_get_column_stats(self, mock_run_query):
+        mock_run_query.return_value = pd.DataFrame([
+            ['id', 0.0, -1.0, None, None, ['1', '50', '100']],
+            ['category', 0.1, 3.0, ['a', 'b'], [0.5, 0.2], None],
+            ['comment', None, None, None, None, None]],
+            columns=['column_name', 'null_frac', 'n_distinct', 'top_values', 'top_freqs', 'histogram_bounds'])
+        result = self.postgresConnector.get_column_stats('public', 'categories', 100)
+        self.assertEqual(list(result.columns), ['column_name', 'missing_ratio', 'n_unique', 'top_values', 'top_freqs', 'histogram_bounds'])
+        self.assertEqual(result.loc[0, 'n_unique'], 100)
+        self.assertEqual(result.loc[1, 'n_unique'], 3)
+        self.assertEqual(result.loc[0, 'top_values'], [])
+        self.assertEqual(result.loc[2, 'histogram_bounds'], [])
+
+    @mock.patch('src.database.logics.PostgresConnector.get_connection')
+    def test_analyze_table(self, mock_get_connection):
+        cursor = mock_get_connection.return_value.__enter__.return_value.cursor.return_value
+        result = self.postgresConnector.analyze_table('public', 'categories')
+        cursor.execute.assert_called_once_with('ANALYZE public.categories')
+        self.assertTrue(result['status'])
+
+    @mock.patch('src.database.logics.PostgresConnector.get_connection')
+    def test_analyze_table_failed(self, mock_get_connection):
+        cursor = mock_get_connection.return_value.__enter__.return_value.cursor.return_value
+        cursor.execute.side_effect = psycopg2.ProgrammingError('permission denied')
+        result = self.postgresConnector.analyze_table('public', 'categories')
+        self.assertFalse(result['status'])
+        cursor.close.assert_called_once()
+
 class TestGetTableSchema(unittest.TestCase):
     """
     Class used for testing the PostgresConnector.get_table_schema() method from src/database/logics.py
     """
+    catalog_columns = ['table_schema', 'table_name', 'table_kind', 'n_rows_estimate', 'size_estimate', 'ordinal_position', 'column_name', 'data_type', 'type_category', 'is_nullable', 'character_maximum_length', 'numeric_precision', 'datetime_precision', 'primary_key', 'primary_key_position']
 
     # test get_table_schema() when schema name and table name exist in the database -> there is schema information of the table
     @mock.patch("src.database.logics.PostgresConnector.run_query")
     def test_get_table_schema_not_empty(self, mock_run_query):
         schema_name = 'public'
         table_name = 'categories'
-        sample_cols_info = pd.DataFrame(
+        sample_catalog = pd.DataFrame(
             [
-                ['public', 'categories', 'category_id', 'smallint', 'NO', nan, '16.000', nan], 
-                ['public', 'categories', 'description', 'text', 'YES', nan, nan, nan]
-            
+                ['public', 'categories', 'r', 8, 8192, 1, 'category_id', 'smallint', 'N', False, nan, 16, nan, True, 1], 
+                ['public', 'categories', 'r', 8, 8192, 2, 'description', 'text', 'S', True, nan, nan, nan, False, nan],
+                ['public', 'categories', 'r', 8, 8192, 3, 'created', 'timestamp with time zone', 'D', True, nan, nan, 6, False, nan],
+                ['public', 'categories', 'r', 8, 8192, 4, 'opening', 'time without time zone', 'D', True, nan, nan, 6, False, nan],
+                ['public', 'orders', 'r', 830, 122880, 1, 'order_id', 'smallint', 'N', False, nan, 16, nan, True, 1]
             ], 
-            columns=['table_schema', 'table_name', 'column_name', 'data_type', 'is_nullable','character_maximum_length', 'numeric_precision', 'datetime_precision']
+            columns=self.catalog_columns
         )
-        sample_primary_cols = pd.DataFrame(['category_id'], columns=['column_name'])
         expected_results = pd.DataFrame(
             [
-                ['categories', 'category_id', 'smallint', False, nan, '16.000', nan, True], 
-                ['categories', 'description', 'text', True, nan, nan, nan, False]
+                ['categories', 'category_id', 'smallint', False, nan, 16, nan, True], 
+                ['categories', 'description', 'text', True, nan, nan, nan, False],
+                ['categories', 'created', 'timestamp with time zone', True, nan, nan, 6, False],
+                ['categories', 'opening', 'time without time zone', True, nan, nan, 6, False]
             
             ], 
             columns=['table_name', 'column_name', 'data_type', 'is_nullable','character_maximum_length', 'numeric_precision', 'datetime_precision', 'primary_key']
         )
-        mock_run_query.side_effect = [sample_cols_info, sample_primary_cols]
+        mock_run_query.return_value = sample_catalog
         postgresConnector = PostgresConnector(None, None, None, None, None)
         actual_results = postgresConnector.get_table_schema(schema_name, table_name)
 
-        mock_run_query.assert_has_calls([
-            mock.call(f"SELECT * FROM information_schema.columns WHERE table_schema = '{schema_name}' and table_name = '{table_name}'"),
-            mock.call(f"select c.column_name from information_schema.table_constraints t left join information_schema.constraint_column_usage c on c.constraint_name = t.constraint_name where t.table_schema = '{schema_name}' and t.constraint_type = 'PRIMARY KEY' and t.table_name = '{table_name}'")
-        ], any_order=True)
-        
+        mock_run_query.assert_called_once_with(get_catalog_metadata_query(schema_name), use_cache=False)
         pd_testing.assert_frame_equal(actual_results, expected_results, check_dtype=False)
 
+        postgresConnector.get_table_schema(schema_name, 'orders')
+        self.assertEqual(postgresConnector.get_table_columns(schema_name, table_name, 'numeric'), ['category_id'])
+        self.assertEqual(postgresConnector.get_table_columns(schema_name, table_name, 'text'), ['description'])
+        self.assertEqual(postgresConnector.get_table_columns(schema_name, table_name, 'date'), ['created'])
+        self.assertEqual(postgresConnector.get_page_keys(schema_name, table_name), ['category_id'])
+        mock_run_query.assert_called_once()
+
     # test get_table_schema() when schema name and table name do not exist in the database -> schema information is empty
     @mock.patch("src.database.logics.PostgresConnector.run_query")
     def test_get_table_schema(self, mock_run_query):
         schema_name = 'public1'
         table_name = 'categories1'
-        sample_cols_info = pd.DataFrame([], 
-            columns=['table_schema', 'table_name', 'column_name', 'data_type', 'is_nullable','character_maximum_length', 'numeric_precision', 'datetime_precision']
-        )
-        sample_primary_cols = pd.DataFrame([], columns=['column_name'])
         expected_results = pd.DataFrame(
             [], 
-            columns=['table_name', 'data_type', 'is_nullable', 'character_maximum_length', 'numeric_precision', 'datetime_precision', 'column_name', 'primary_key']
+            columns=['table_name', 'column_name', 'data_type', 'is_nullable', 'character_maximum_length', 'numeric_precision', 'datetime_precision', 'primary_key']
         )
-        mock_run_query.side_effect = [sample_cols_info, sample_primary_cols]
+        mock_run_query.return_value = pd.DataFrame([], columns=self.catalog_columns)
         postgresConnector = PostgresConnector(None, None, None, None, None)
         actual_results = postgresConnector.get_table_schema(schema_name, table_name)
 
-        mock_run_query.assert_has_calls([
-            mock.call(f"SELECT * FROM information_schema.columns WHERE table_schema = '{schema_name}' and table_name = '{table_name}'"),
-            mock.call(f"select c.column_name from information_schema.table_constraints t left join information_schema.constraint_column_usage c on c.constraint_name = t.constraint_name where t.table_schema = '{schema_name}' and t.constraint_type = 'PRIMARY KEY' and t.table_name = '{table_name}'")
-        ], any_order=True)
-        
-        pd_testing.assert_frame_equal(actual_results, expected_results, check_dtype=False)
+        pd_testing.assert_frame_equal(actual_results, expected_results, check_dtype=False, check_index_type=False)
+        self.assertEqual(postgresConnector.get_table_columns(schema_name, table_name), [])
+
+class TestCatalogMetadata(unittest.TestCase):
+    """
+    Class used for testing the CatalogMetadata class and PostgresConnector.list_tables() from src/database/logics.py
+    """
+    @mock.patch("src.database.logics.PostgresConnector.run_query")
+    def test_list_tables(self, mock_run_query):
+        mock_run_query.return_value = pd.DataFrame(
+            [
+                ['public', 'categories', 'v', 8, 8192, 'category_id', False, None],
+                ['public', 'categories', 'v', 8, 8192, 'description', False, None],
+                ['sales', 'items', 'r', None, 0, None, False, None]
+            ],
+            columns=['table_schema', 'table_name', 'table_kind', 'n_rows_estimate', 'size_estimate', 'column_name', 'primary_key', 'primary_key_position']
+        )
+        postgresConnector = PostgresConnector(None, None, None, None, None)
+        result = postgresConnector.list_tables()
+
+        mock_run_query.assert_called_once_with(get_catalog_metadata_query(), use_cache=False)
+        self.assertEqual(list(zip(result['table_schema'], result['table_name'])), [('public', 'categories'), ('sales', 'items')])
+        self.assertEqual(postgresConnector.get_table_columns('public', 'categories'), ['category_id', 'description'])
+        self.assertEqual(postgresConnector.get_table_columns('sales', 'items'), [])
+        mock_run_query.assert_called_once()
+        self.assertEqual(postgresConnector.get_table_rows_estimate('public', 'categories'), 8)
+        self.assertIsNone(postgresConnector.get_table_rows_estimate('sales', 'items'))
+        mock_run_query.assert_called_once()
+
+        self.assertEqual(postgresConnector.get_page_keys('public', 'categories'), [])
+        postgresConnector.metadata.clear('public')
+        self.assertFalse(postgresConnector.metadata.is_complete)
+        postgresConnector.get_table_columns('public', 'categories')
+        mock_run_query.assert_called_with(get_catalog_metadata_query('public'), use_cache=False)
+
+class TestTableCatalog(unittest.TestCase):
+    """
+    Class used for testing the TableCatalog class and PostgresConnector.get_table_catalog() from src/database/logics.py
+    """
+    def setUp(self):
+        self.tables = pd.DataFrame(
+            [
+                ['sales', 'orders_archive', 100000, 0],
+                ['public', 'orders', 830, 0],
+                ['public', 'customers', 91, 0],
+                ['public', 'order_details', None, 0],
+                ['staging', 'raw_orders', 5, 0]
+            ],
+            columns=['table_schema', 'table_name', 'n_rows_estimate', 'size_estimate']
+        )
+        self.catalog = TableCatalog(self.tables)
+
+    def test_search_all(self):
+        result = self.catalog.search()
+        self.assertEqual(result['name'].tolist(), ['public.customers', 'public.order_details', 'public.orders', 'sales.orders_archive', 'staging.raw_orders'])
+        self.assertEqual(self.catalog.schemas, ['public', 'sales', 'staging'])
+
+    def test_search_ranking(self):
+        result = self.catalog.search('Orders')
+        self.assertEqual(result['name'].tolist(), ['public.orders', 'sales.orders_archive', 'staging.raw_orders', 'public.order_details'])
+        result = self.catalog.search('pbord')
+        self.assertEqual(result['name'].tolist(), ['public.order_details', 'public.orders'])
+        self.assertEqual(self.catalog.search('public.ord', limit=1)['name'].tolist(), ['public.order_details'])
+
+    def test_search_filters(self):
+        self.assertEqual(self.catalog.search('ord', schemas=['sales', 'staging'])['name'].tolist(), ['sales.orders_archive', 'staging.raw_orders'])
+        self.assertEqual(self.catalog.search(min_rows=100, max_rows=1000)['name'].tolist(), ['public.orders'])
+        self.assertEqual(self.catalog.search(max_rows=10)['name'].tolist(), ['public.order_details', 'staging.raw_orders'])
+
+    @mock.patch("src.database.logics.PostgresConnector.run_query")
+    def test_get_table_catalog(self, mock_run_query):
+        mock_run_query.return_value = self.tables.assign(column_name='id')
+        postgresConnector = PostgresConnector(None, None, None, None, None)
+        catalog = postgresConnector.get_table_catalog()
+        self.assertIs(postgresConnector.get_table_catalog(), catalog)
+        mock_run_query.assert_called_once()
+
+        catalog.expires_at = 0
+        self.assertIsNot(postgresConnector.get_table_catalog(), catalog)
+        self.assertEqual(mock_run_query.call_count, 2)
+        postgresConnector.get_table_catalog(refresh=True)
+        self.assertEqual(mock_run_query.call_count, 3)
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -28,6 +28,39 @@ class TestGetTableDataQuery(unittest.TestCase):
         actual_query = get_table_data_query(schema_name, table_name)
         self.assertEqual(expected_query, actual_query)
 
+    def test_get_table_data_query_tablesample(self):
+        sampling = {'method': 'BERNOULLI', 'percent': 5, 'seed': 42, 'limit': 0}
+        expected_query = 'SELECT * FROM public.user TABLESAMPLE BERNOULLI (5) REPEATABLE (42)'
+        actual_query = get_table_data_query('public', 'user', sampling)
+        self.assertEqual(expected_query, actual_query)
+
+    def test_get_table_data_query_row_cap(self):
+        sampling = {'method': None, 'percent': 5, 'seed': None, 'limit': 1000}
+        expected_query = 'SELECT * FROM public.user LIMIT 1000'
+        actual_query = get_table_data_query('public', 'user', sampling)
+        self.assertEqual(expected_query, actual_query)
+
+    def test_get_table_data_query_columns(self):
+        sampling = {'method': 'SYSTEM', 'percent': 5, 'seed': 7, 'limit': 100}
+        expected_query = 'SELECT "id", "amount" FROM public.user TABLESAMPLE SYSTEM (5) REPEATABLE (7) ORDER BY "id" LIMIT 100'
+        actual_query = get_table_data_query('public', 'user', sampling, columns=['id', 'amount'], order_by=['id'])
+        self.assertEqual(expected_query, actual_query)
+
+    def test_get_table_data_query_ctid(self):
+        expected_query = 'SELECT "amount" FROM public.user ORDER BY ctid'
+        actual_query = get_table_data_query('public', 'user', columns=['amount'], order_by=['ctid'])
+        self.assertEqual(expected_query, actual_query)
+
+class TestGetTableCountQuery(unittest.TestCase):
+    """
+    Class used for testing get_table_count_query() from src/database/queries.py
+    """
+
+    def test_get_table_count_query(self):
+        expected_query = 'SELECT count(*) FROM public.user'
+        actual_query = get_table_count_query('public', 'user')
+        self.assertEqual(expected_query, actual_query)
+
 class TestGetTableSchemaQuery(unittest.TestCase):
     """
     Class used for testing get_table_schema_query() from src/database/queries.py
@@ -40,5 +73,72 @@ class TestGetTableSchemaQuery(unittest.TestCase):
         actual_query = get_table_schema_query(schema_name, table_name)
         self.assertEqual(expected_query, actual_query)
 
+class TestGetCopyQuery(unittest.TestCase):
+    """
+    Class used for testing get_copy_query() from src/database/queries.py
+    """
+
+    def test_get_copy_query(self):
+        sql_query = 'SELECT * FROM public.user'
+        expected_query = "COPY (SELECT * FROM public.user) TO STDOUT WITH (FORMAT csv, HEADER true, NULL '\\N')"
+        actual_query = get_copy_query(sql_query)
+        self.assertEqual(expected_query, actual_query)
+
+class TestGetResultTypesQuery(unittest.TestCase):
+    """
+    Class used for testing get_result_types_query() from src/database/queries.py
+    """
+
+    def test_get_result_types_query(self):
+        sql_query = 'SELECT * FROM public.user'
+        expected_query = "SELECT * FROM (SELECT * FROM public.user) AS result_types LIMIT 0"
+        actual_query = get_result_types_query(sql_query)
+        self.assertEqual(expected_query, actual_query)
+
+class TestGetStatsQueries(unittest.TestCase):
+    """
+    Class used for testing get_table_stats_query(), get_column_stats_query() and get_analyze_query() from src/database/queries.py
+    """
+
+    def test_get_table_stats_query(self):
+        actual_query = get_table_stats_query('public', 'user')
+        self.assertIn("FROM pg_class c", actual_query)
+        self.assertIn("greatest(s.last_analyze, s.last_autoanalyze) AS last_analyze", actual_query)
+        self.assertTrue(actual_query.endswith("WHERE n.nspname = 'public' AND c.relname = 'user'"))
+
+    def test_get_column_stats_query(self):
+        actual_query = get_column_stats_query('public', 'user')
+        self.assertIn("s.most_common_vals::text::text[] AS top_values", actual_query)
+        self.assertIn("LEFT JOIN pg_stats s", actual_query)
+        self.assertTrue(actual_query.endswith("ORDER BY a.attnum"))
+
+    def test_get_analyze_query(self):
+        self.assertEqual(get_analyze_query('public', 'user'), 'ANALYZE public.user')
+
+class TestGetTablesFingerprintQuery(unittest.TestCase):
+    """
+    Class used for testing get_tables_fingerprint_query() from src/database/queries.py
+    """
+
+    def test_get_tables_fingerprint_query(self):
+        actual_query = get_tables_fingerprint_query([('public', 'orders'), ('sales', 'items')])
+        self.assertIn("c.relfilenode, s.n_tup_ins, s.n_tup_upd, s.n_tup_del", actual_query)
+        self.assertIn("WHERE (s.schemaname, s.relname) IN (('public', 'orders'), ('sales', 'items'))", actual_query)
+
+class TestGetCatalogMetadataQuery(unittest.TestCase):
+    """
+    Class used for testing get_catalog_metadata_query() from src/database/queries.py
+    """
+
+    def test_get_catalog_metadata_query(self):
+        actual_query = get_catalog_metadata_query()
+        self.assertIn("coalesce(a.attnum = ANY(i.indkey), false) AS primary_key", actual_query)
+        self.assertIn("information_schema._pg_numeric_precision(a.atttypid, a.atttypmod) AS numeric_precision", actual_query)
+        self.assertNotIn("n.nspname = ", actual_query)
+        self.assertTrue(actual_query.endswith("ORDER BY n.nspname, c.relname, a.attnum"))
+
+    def test_get_catalog_metadata_query_schema(self):
+        self.assertIn("AND n.nspname = 'public' ORDER BY", get_catalog_metadata_query('public'))
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -2,12 +2,17 @@ import os
 from random import seed
 import sys
 import unittest
+import datetime
+from decimal import Decimal
 from numpy import NAN
 import pandas as pd
 from unittest import mock
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
-from src.dataframe.logics import Dataset
+from src.dataframe.logics import Dataset, is_sampling, set_metrics_basis
+from src.serie_numeric.logics import NumericColumn
+from src.serie_text.logics import TextColumn
+from src.serie_date.logics import DateColumn
 
 @mock.patch('src.database.logics.PostgresConnector')
 class TestDatasetInstantiation(unittest.TestCase):
@@ -58,6 +63,32 @@ class TestSetdimensions(unittest.TestCase):
         self.assertEqual(self.dataset.n_rows, 2)
        
 
+class TestSetdimensionsSample(unittest.TestCase):
+    def setUp(self):
+        self.db = mock.MagicMock()
+        self.db.run_query.return_value = pd.DataFrame([100], columns=['count'])
+        self.dataset = Dataset('public', 'orders', self.db, pd.DataFrame([[1,2],[3,4]], columns= ['1','2']), {'method': 'SYSTEM', 'percent': 2, 'seed': None, 'limit': 0})
+    def test_n_dimensions_sample(self):
+        self.dataset.set_dimensions()
+        self.db.run_query.assert_called_with('SELECT count(*) FROM public.orders')
+        self.assertEqual(self.dataset.n_rows, 100)
+        self.assertEqual(self.dataset.n_sample_rows, 2)
+        self.assertEqual(self.dataset.n_cols, 2)
+
+
+class TestSampling(unittest.TestCase):
+    def test_is_sampling(self):
+        self.assertFalse(is_sampling(None))
+        self.assertFalse(is_sampling({'method': None, 'percent': 10, 'seed': None, 'limit': 0}))
+        self.assertTrue(is_sampling({'method': 'BERNOULLI', 'percent': 10, 'seed': None, 'limit': 0}))
+        self.assertTrue(is_sampling({'method': None, 'percent': 10, 'seed': None, 'limit': 10}))
+
+    def test_set_metrics_basis(self):
+        summary_df = pd.DataFrame([['Number of Rows', 1], ['Number of Duplicated Rows', 2]], columns=['Description', 'Value'])
+        result = set_metrics_basis(summary_df, ['Number of Rows'])
+        self.assertEqual(list(result['Basis']), ['Exact', 'Estimated from sample'])
+
+
 class TestSetduplicates(unittest.TestCase):
     def setUp(self):
         self.dataset = Dataset(None, None, None, None)
@@ -81,46 +112,75 @@ class TestSetmissing(unittest.TestCase):
         self.assertEqual(result, 6)
 
 
-@mock.patch('src.database.logics.PostgresConnector')
-@mock.patch('pandas.DataFrame')
 class TestSetnumeric(unittest.TestCase):
     def setUp(self):
-        self.dataset = Dataset(None, None, None, None)
-    def test_numeric_columns(self, postgresconnector,mock_as):
-        self.dataset.db = postgresconnector
-        sample_df = pd.DataFrame([['1'],['2'],['3'],['4']], columns=['1'])
-        postgresconnector.run_query.return_value = sample_df
-        self.dataset.df = pd.DataFrame([[1,2,3,4,5],[6,7,8,9,10]], columns=['1','2','3','4','5'])
+        self.dataset = Dataset('public', 'test', mock.Mock(), None)
+    def test_numeric_columns(self):
+        self.dataset.db.get_table_columns.return_value = ['1', '2']
+        self.dataset.df = pd.DataFrame([[1.0,None,'a'],[6.0,7.0,'b']], columns=['1','2','3'])
         self.dataset.set_numeric_columns()
-        self.assertEqual(self.dataset.num_cols, sample_df)
+        self.dataset.db.get_table_columns.assert_called_with('public', 'test', 'numeric')
+        self.assertEqual(self.dataset.num_cols, ['1', '2'])
+        self.assertTrue(self.dataset.df['2'].isna().iloc[0])
+        self.assertEqual(self.dataset.df['2'].iloc[1], 7.0)
+
+    def test_numeric_kernel_matches_profile(self):
+        self.dataset.db.get_table_columns.return_value = ['price']
+        self.dataset.df = pd.DataFrame({'price': [Decimal('1.5'), None, Decimal('-2.25'), Decimal('0'), Decimal('4')]})
+        self.dataset.set_numeric_columns()
+        serie = NumericColumn('public', 'test', 'price', self.dataset.db, self.dataset.df['price'])
+        serie.set_data()
+        # metrics returned by get_numeric_profile_query() for the same rows
+        profile = {'n_unique': 4, 'n_missing': 1, 'n_zeros': 1, 'n_negatives': 1, 'col_mean': 0.8125, 'col_std': 2.625, 'col_min': -2.25, 'col_max': 4.0, 'col_median': 0.75}
+        self.assertEqual({metric: getattr(serie, metric) for metric in profile}, profile)
+        self.assertEqual(serie.histogram_bins['count'].sum(), 4)
 
 
-@mock.patch('src.database.logics.PostgresConnector')
-@mock.patch('pandas.DataFrame')
 class TestSettext(unittest.TestCase):
     def setUp(self):
-        self.dataset = Dataset(None, None, None, None)
-    def test_text_columns(self, postgresconnector, mock_as ):
-        self.dataset.db = postgresconnector
-        sample_df = pd.DataFrame([['1'],['2'],['3'],['4']], columns=['1'])
-        postgresconnector.run_query.return_value = sample_df
-        self.dataset.df = pd.DataFrame([[1,2,3,4,5],[6,7,8,9,10]], columns=['1','2','3','4','5'])
+        self.dataset = Dataset('public', 'test', mock.Mock(), None)
+    def test_text_columns(self):
+        self.dataset.db.get_table_columns.return_value = ['3']
+        self.dataset.df = pd.DataFrame([[1,2,'a'],[6,7,None]], columns=['1','2','3'])
         self.dataset.set_text_columns()
-        self.assertEqual(self.dataset.text_cols, sample_df)
+        self.dataset.db.get_table_columns.assert_called_with('public', 'test', 'text')
+        self.assertEqual(self.dataset.text_cols, ['3'])
+        self.assertEqual(str(self.dataset.df['3'].dtype), 'string')
+        self.assertTrue(self.dataset.df['3'].isna().iloc[1])
 
+    def test_text_kernel_matches_profile(self):
+        self.dataset.db.get_table_columns.return_value = ['name']
+        self.dataset.df = pd.DataFrame({'name': ['abc', None, '  ', '', 'ABC', '123', 'abc']})
+        self.dataset.set_text_columns()
+        self.dataset.db.run_query.return_value = pd.DataFrame({'count': [1], 'mode': ['abc']})
+        serie = TextColumn('public', 'test', 'name', self.dataset.db, self.dataset.df['name'])
+        serie.set_data()
+        # metrics returned by get_text_profile_query() for the same rows, the missing, mode and alphabetical values are queried
+        profile = {'n_unique': 5, 'n_empty': 1, 'n_space': 1, 'n_lower': 2, 'n_upper': 1, 'n_digit': 1}
+        self.assertEqual({metric: getattr(serie, metric) for metric in profile}, profile)
 
-@mock.patch('src.database.logics.PostgresConnector')
-@mock.patch('pandas.DataFrame')
-class TestSettext(unittest.TestCase):
+
+class TestSetdate(unittest.TestCase):
     def setUp(self):
-        self.dataset = Dataset(None, None, None, None)
-    def test_date_columns(self, postgresconnector, mock_as):
-        self.dataset.db = postgresconnector
-        sample_df = pd.DataFrame([['1'],['2'],['3'],['4']], columns=['1'])
-        postgresconnector.run_query.return_value = sample_df
-        self.dataset.df = pd.DataFrame([[1,2,3,4,5],[6,7,8,9,10]], columns=['1','2','3','4','5'])
+        self.dataset = Dataset('public', 'test', mock.Mock(), None)
+    def test_date_columns(self):
+        self.dataset.db.get_table_columns.return_value = ['2']
+        self.dataset.df = pd.DataFrame([[1,'2022-10-17'],[6,None]], columns=['1','2'])
+        self.dataset.set_date_columns()
+        self.dataset.db.get_table_columns.assert_called_with('public', 'test', 'date')
+        self.assertEqual(self.dataset.date_cols, ['2'])
+        self.assertEqual(self.dataset.df['2'].iloc[0], pd.Timestamp(2022,10,17))
+        self.assertTrue(pd.isna(self.dataset.df['2'].iloc[1]))
+
+    def test_date_kernel_matches_profile(self):
+        self.dataset.db.get_table_columns.return_value = ['order_date']
+        self.dataset.df = pd.DataFrame({'order_date': [datetime.date(2024,6,1), None, datetime.date(1970,1,1), datetime.date(2024,6,3), datetime.date(1900,1,1)]})
         self.dataset.set_date_columns()
-        self.assertEqual(self.dataset.date_cols, sample_df)
+        serie = DateColumn('public', 'test', 'order_date', self.dataset.db, self.dataset.df['order_date'])
+        serie.set_data()
+        # metrics returned by get_date_profile_query() for the same rows
+        profile = {'unique': 4, 'n_missing': 1, 'col_min': pd.Timestamp(1900,1,1), 'col_max': pd.Timestamp(2024,6,3), 'n_weekend': 1, 'n_weekday': 3, 'n_future': 0, 'n_empty_1900': 1, 'n_empty_1970': 1}
+        self.assertEqual({metric: getattr(serie, metric) for metric in profile}, profile)
 
 class TestGet(unittest.TestCase):
     def setUp(self):
@@ -158,6 +218,192 @@ class TestGet(unittest.TestCase):
             columns= ['Description', 'Value'])
         pd.testing.assert_frame_equal(result, expect)
 
+    def test_get_summary_sample(self):
+        self.dataset.is_sample = True
+        self.dataset.table_name = 'orders'
+        self.dataset.n_rows = 100
+        self.dataset.n_sample_rows = 10
+        self.dataset.n_cols = 2
+        self.dataset.n_duplicates = 1
+        self.dataset.n_missing = 0
+        result = self.dataset.get_summary_df()
+        expect = pd.DataFrame([
+            ['Name of Table', 'orders', 'Exact'],
+            ['Number of Rows', 100, 'Exact'],
+            ['Number of Sampled Rows', 10, 'Exact'],
+            ['Number of Columns', 2, 'Exact'],
+            ['Number of Duplicated Rows', 1, 'Estimated from sample'],
+            ['Number of Rows with Missing Values', 0, 'Estimated from sample']],
+            columns= ['Description', 'Value', 'Basis'])
+        pd.testing.assert_frame_equal(result, expect)
+
+class TestPagination(unittest.TestCase):
+    def setUp(self):
+        self.db = mock.Mock()
+        self.db.get_page_keys.return_value = ['order_id']
+        self.pages = {
+            None: pd.DataFrame([[1, 'a'], [2, 'b']], columns=['order_id', 'name']),
+            (2,): pd.DataFrame([[3, 'c'], [4, 'd']], columns=['order_id', 'name']),
+            (4,): pd.DataFrame([], columns=['order_id', 'name']),
+            (3,): pd.DataFrame([[2, 'b'], [1, 'a']], columns=['order_id', 'name'])
+        }
+        self.db.run_query.side_effect = lambda query, params=None: self.pages[params]
+        self.dataset = Dataset('public', 'orders', self.db, None)
+
+    def test_get_head_next_previous(self):
+        result = self.dataset.get_head(2)
+        self.assertEqual(list(result['order_id']), [1, 2])
+        self.assertTrue(self.dataset.get_next_page())
+        self.assertEqual(list(self.dataset.page['order_id']), [3, 4])
+        self.assertEqual(self.dataset.page_number, 2)
+        self.assertFalse(self.dataset.get_next_page())
+        self.assertEqual(list(self.dataset.page['order_id']), [3, 4])
+        self.assertTrue(self.dataset.get_previous_page())
+        self.assertEqual(list(self.dataset.page['order_id']), [1, 2])
+        self.db.run_query.assert_any_call('SELECT * FROM public.orders WHERE ("order_id") < (%s) ORDER BY "order_id" DESC LIMIT 2', params=(3,))
+
+    def test_prefetch(self):
+        self.dataset.get_head(2)
+        self.assertIn(('SELECT * FROM public.orders WHERE ("order_id") > (%s) ORDER BY "order_id" LIMIT 2', (2,)), self.dataset.prefetched)
+        self.dataset.get_next_page()
+        self.assertEqual(list(self.dataset.page['order_id']), [3, 4])
+
+    def test_cancel_prefetch(self):
+        future = mock.Mock()
+        self.dataset.prefetched = {('query', None): future}
+        self.dataset.cancel_prefetch()
+        future.cancel.assert_called_once()
+        self.assertEqual(self.dataset.prefetched, {})
+
+    def test_get_sample(self):
+        self.db.run_query.side_effect = None
+        self.db.run_query.return_value = pd.DataFrame([[1, 'a']], columns=['order_id', 'name'])
+        self.dataset.n_rows = 1000
+        self.dataset.get_sample(1)
+        self.db.run_query.assert_called_once_with('SELECT * FROM public.orders TABLESAMPLE BERNOULLI (0.3) ORDER BY random() LIMIT 1', use_cache=False)
+
+    def test_get_sample_estimate(self):
+        self.db.run_query.side_effect = None
+        self.db.run_query.return_value = pd.DataFrame([[1, 'a']], columns=['order_id', 'name'])
+        self.db.get_table_rows_estimate.return_value = 1000
+        self.dataset.get_sample(1)
+        self.db.get_table_rows_estimate.assert_called_once_with('public', 'orders')
+        self.db.run_query.assert_called_once_with('SELECT * FROM public.orders TABLESAMPLE BERNOULLI (0.3) ORDER BY random() LIMIT 1', use_cache=False)
+        self.assertIsNone(self.dataset.n_rows)
+
+    def test_get_sample_no_estimate(self):
+        self.db.run_query.side_effect = None
+        self.db.run_query.return_value = pd.DataFrame({'count': [1000]})
+        self.db.get_table_rows_estimate.return_value = None
+        self.dataset.get_sample(1)
+        self.assertEqual(self.dataset.n_rows, 1000)
+        self.assertEqual(self.db.run_query.call_count, 2)
+
+class TestLoadColumns(unittest.TestCase):
+    def setUp(self):
+        self.db = mock.Mock()
+        self.db.get_page_keys.return_value = ['order_id']
+        self.db.get_table_columns.return_value = ['order_id', 'name', 'amount']
+        self.table = pd.DataFrame([[1, 'a', 10], [2, 'b', 20]], columns=['order_id', 'name', 'amount'])
+        self.db.load_table.side_effect = lambda schema_name, table_name, sampling=None, columns=None, order_by=None: self.table[columns] if columns else self.table
+        self.dataset = Dataset('public', 'orders', self.db, sampling={'method': 'SYSTEM', 'percent': 10, 'seed': None, 'limit': 0})
+
+    def test_sampling_seed(self):
+        self.assertIsNotNone(self.dataset.sampling['seed'])
+
+    def test_load_columns(self):
+        self.dataset.load_columns(['amount'])
+        self.dataset.load_columns(['name', 'amount'])
+        self.assertEqual(list(self.dataset.df.columns), ['name', 'amount'])
+        self.assertEqual(list(self.dataset.df['name']), ['a', 'b'])
+        self.assertEqual(self.db.load_table.call_count, 2)
+        self.db.load_table.assert_called_with('public', 'orders', sampling=self.dataset.sampling, columns=['name', 'order_id'], order_by=['order_id'])
+
+    def test_load_columns_join_on_keys(self):
+        self.dataset.load_columns(['amount'])
+        self.table = self.table.iloc[::-1]
+        self.dataset.load_columns(['name'])
+        self.assertEqual(list(self.dataset.df['name']), ['a', 'b'])
+        self.assertEqual(list(self.dataset.df['amount']), [10, 20])
+        self.assertEqual(self.db.load_table.call_count, 2)
+
+    def test_load_columns_other_rows(self):
+        self.dataset.load_columns(['amount'])
+        self.table = pd.DataFrame([[1, 'a', 10], [3, 'c', 30]], columns=['order_id', 'name', 'amount'])
+        self.dataset.load_columns(['name'])
+        self.assertEqual(list(self.dataset.df['name']), ['a', 'c'])
+        self.assertEqual(list(self.dataset.df['amount']), [10, 30])
+        self.assertEqual(self.db.load_table.call_count, 3)
+
+    def test_load_columns_loaded(self):
+        self.dataset.load_columns(['amount'])
+        self.dataset.load_columns(['amount'])
+        self.assertEqual(self.db.load_table.call_count, 1)
+
+    def test_load_columns_without_keys(self):
+        self.db.get_page_keys.return_value = []
+        self.dataset.load_columns(['amount'])
+        self.assertEqual(list(self.dataset.df.columns), ['order_id', 'name', 'amount'])
+
+class TestGetMemoised(unittest.TestCase):
+    def test_get_memoised(self):
+        dataset = Dataset('public', 'orders', mock.Mock())
+        func = mock.Mock(return_value=42)
+        self.assertEqual(dataset.get_memoised(('numeric', 'price'), func), 42)
+        self.assertEqual(dataset.get_memoised(('numeric', 'price'), func), 42)
+        func.assert_called_once_with()
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.db = mock.Mock()
+        self.db.get_page_keys.return_value = ['order_id']
+        self.db.get_table_columns.side_effect = lambda schema_name, table_name, kind=None: {None: ['order_id', 'name'], 'numeric': ['order_id'], 'text': ['name'], 'date': []}[kind]
+        self.table = pd.DataFrame([[1, 'a'], [2, None]], columns=['order_id', 'name'])
+        self.db.load_table.side_effect = lambda schema_name, table_name, sampling=None, columns=None, order_by=None: self.table[columns] if columns else self.table
+        self.dataset = Dataset('public', 'orders', self.db)
+
+    def test_set_data_once(self):
+        self.dataset.set_data()
+        self.dataset.set_data()
+        self.dataset.get_metric('set_text_columns')
+        self.assertEqual(self.db.load_table.call_count, 1)
+        self.assertEqual(self.dataset.n_cols, 2)
+        self.assertEqual(self.dataset.df['name'].iloc[0], 'a')
+        self.assertTrue(pd.isna(self.dataset.df['name'].iloc[1]))
+
+    def test_reload_invalidates(self):
+        self.dataset.set_data()
+        self.dataset.metrics.invalidate('df')
+        self.assertTrue(self.dataset.metrics.is_dirty('set_missing'))
+        self.assertTrue(self.dataset.metrics.is_dirty('set_text_columns'))
+
+class TestInstantProfile(unittest.TestCase):
+    def setUp(self):
+        self.db = mock.Mock()
+        self.db.get_table_stats.return_value = {'n_rows': 100, 'last_analyze': None, 'n_mod_since_analyze': 100, 'is_stale': True}
+        self.db.get_column_stats.return_value = pd.DataFrame([
+            ['id', 0.0, 100, [], [], ['1', '50', '100']],
+            ['category', 0.1, 3, ['a', 'b'], [0.5, 0.2], ['c', 'd', 'e']]],
+            columns=['column_name', 'missing_ratio', 'n_unique', 'top_values', 'top_freqs', 'histogram_bounds'])
+        self.dataset = Dataset('public', 'categories', self.db, instant=True)
+        self.dataset.set_instant_profile()
+
+    def test_set_instant_profile(self):
+        self.assertEqual(self.dataset.n_rows, 100)
+        self.assertEqual(self.dataset.n_cols, 2)
+        self.assertTrue(self.dataset.is_stale)
+        self.assertEqual(self.dataset.get_instant_summary_df().iloc[3]['Value'], 'Never')
+
+    def test_get_top_values(self):
+        result = self.dataset.get_top_values('category')
+        self.assertEqual(list(result['occurrence']), [50, 20])
+
+    def test_get_histogram(self):
+        result = self.dataset.get_histogram('category')
+        self.assertEqual(list(result['lower']), ['c', 'd'])
+        self.assertAlmostEqual(result['fraction'].sum(), 0.2)
+        self.assertTrue(self.dataset.get_histogram('id')['fraction'].sum() == 1.0)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
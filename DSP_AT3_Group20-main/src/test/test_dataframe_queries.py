@@ -33,5 +33,28 @@ class TestGetqueries(unittest.TestCase):
 
         self.assertEqual(result, expect)
 
+class TestGetPageQueries(unittest.TestCase):
+    def test_get_page_query(self):
+        result = get_page_query('public', 'order_details', ['order_id', 'product_id'], 10)
+        expect = 'SELECT * FROM public.order_details ORDER BY "order_id", "product_id" LIMIT 10'
+        self.assertEqual(result, expect)
+
+    def test_get_page_query_cursor(self):
+        result = get_page_query('public', 'order_details', ['order_id', 'product_id'], 10, descending=True, has_cursor=True)
+        expect = 'SELECT * FROM public.order_details WHERE ("order_id", "product_id") < (%s, %s) ORDER BY "order_id" DESC, "product_id" DESC LIMIT 10'
+        self.assertEqual(result, expect)
+
+    def test_get_page_query_ctid(self):
+        result = get_page_query('public', 'logs', ['ctid'], 10, has_cursor=True)
+        expect = 'SELECT ctid, * FROM public.logs WHERE (ctid) > (%s::tid) ORDER BY ctid LIMIT 10'
+        self.assertEqual(result, expect)
+
+    def test_get_offset_page_query(self):
+        self.assertEqual(get_offset_page_query('public', 'v_orders', 10, 20), 'SELECT * FROM public.v_orders LIMIT 10 OFFSET 20')
+
+    def test_get_random_rows_query(self):
+        self.assertEqual(get_random_rows_query('public', 'orders', 5), 'SELECT * FROM public.orders ORDER BY random() LIMIT 5')
+        self.assertEqual(get_random_rows_query('public', 'orders', 5, 1.5), 'SELECT * FROM public.orders TABLESAMPLE BERNOULLI (1.5) ORDER BY random() LIMIT 5')
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,205 @@
+import os
+import sys
+import time
+import threading
+import unittest
+import pandas as pd
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from src.profiling.logics import ProfilingExecutor, MetricGraph, FrequencyTable, HyperLogLog, get_distinct_count, format_estimate
+
+class TestGetWorkers(unittest.TestCase):
+    """
+    Class used for testing the ProfilingExecutor.get_workers() method from src/profiling/logics.py
+    """
+    def test_get_workers_no_pool(self):
+        db = mock.Mock(pool=None)
+        self.assertEqual(ProfilingExecutor(db, max_workers=8).get_workers(10), 1)
+
+    def test_get_workers_pool(self):
+        db = mock.Mock()
+        db.pool.maxconn = 3
+        executor = ProfilingExecutor(db, max_workers=8)
+        self.assertEqual(executor.get_workers(10), 3)
+        self.assertEqual(executor.get_workers(2), 2)
+        self.assertEqual(executor.get_workers(0), 1)
+
+class TestMap(unittest.TestCase):
+    """
+    Class used for testing the ProfilingExecutor.map(), map_batches() and map_queries() methods from src/profiling/logics.py
+    """
+    def setUp(self):
+        db = mock.Mock()
+        db.pool.maxconn = 4
+        self.executor = ProfilingExecutor(db, max_workers=4, batch_size=2)
+
+    def test_map_order(self):
+        threads = set()
+        def slow_square(n):
+            threads.add(threading.get_ident())
+            time.sleep(0.05 * (5 - n))
+            return n * n
+        result = self.executor.map(slow_square, range(5))
+        self.assertEqual(result, [0, 1, 4, 9, 16])
+        self.assertGreater(len(threads), 1)
+
+    def test_map_exception(self):
+        def fail(n):
+            if n == 2:
+                raise ValueError('failed')
+            return n
+        with self.assertRaises(ValueError):
+            self.executor.map(fail, range(4))
+
+    def test_map_batches(self):
+        batches = []
+        def profile(batch):
+            batches.append(batch)
+            return {name: name.upper() for name in batch}
+        result = self.executor.map_batches(profile, ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(list(result.items()), [('a', 'A'), ('b', 'B'), ('c', 'C'), ('d', 'D'), ('e', 'E')])
+        self.assertEqual(sorted(batches), [['a', 'b'], ['c', 'd'], ['e']])
+
+    def test_map_queries(self):
+        run_queries = self.executor.db.get_async_connector.return_value.run_queries
+        run_queries.side_effect = lambda queries: [pd.DataFrame({'query': [query]}) for query in queries]
+        result = self.executor.map_queries(lambda batch: ','.join(batch), lambda df, batch: {name: df['query'][0] for name in batch}, ['a', 'b', 'c'])
+        self.assertEqual(result, {'a': 'a,b', 'b': 'a,b', 'c': 'c'})
+        run_queries.assert_called_once_with(['a,b', 'c'])
+        self.executor.db.run_query.assert_not_called()
+
+    def test_run_queries_single(self):
+        self.executor.db.run_query.return_value = pd.DataFrame({'a': [1]})
+        self.assertEqual(len(self.executor.run_queries(['select 1'])), 1)
+        self.executor.db.run_query.assert_called_once_with('select 1')
+        self.executor.db.get_async_connector.assert_not_called()
+
+    def test_profile_columns(self):
+        columns = [mock.Mock(col_name='a'), mock.Mock(col_name='b')]
+        result = self.executor.profile_columns(columns, {'a': {'n_unique': 1}})
+        self.assertEqual(result, columns)
+        columns[0].set_data.assert_called_once_with({'n_unique': 1})
+        columns[1].set_data.assert_called_once_with(None)
+
+class TestMetricGraph(unittest.TestCase):
+    """
+    Class used for testing the MetricGraph class from src/profiling/logics.py
+    """
+    def setUp(self):
+        self.owner = mock.Mock()
+        self.owner.count_values.return_value = 'counts'
+        self.graph = MetricGraph(self.owner, {'set_histogram': ('count_values',), 'count_values': ('serie',)})
+
+    def test_get_once(self):
+        self.assertEqual(self.graph.get('count_values'), 'counts')
+        self.assertEqual(self.graph.get('count_values'), 'counts')
+        self.owner.count_values.assert_called_once_with()
+
+    def test_invalidate(self):
+        self.graph.get('count_values')
+        self.graph.get('set_histogram')
+        self.graph.get('set_unique')
+        self.graph.invalidate('serie')
+        self.assertTrue(self.graph.is_dirty('count_values'))
+        self.assertTrue(self.graph.is_dirty('set_histogram'))
+        self.assertFalse(self.graph.is_dirty('set_unique'))
+
+    def test_add_set(self):
+        func = mock.Mock(return_value=3)
+        self.graph.add(('profile', 'price'), func, ('count_values',))
+        self.assertEqual(self.graph.get(('profile', 'price')), 3)
+        self.graph.set('count_values', 'new counts')
+        self.assertTrue(self.graph.is_dirty(('profile', 'price')))
+        self.assertEqual(self.graph.get('count_values'), 'new counts')
+        self.owner.count_values.assert_not_called()
+class TestFrequencyTable(unittest.TestCase):
+    """
+    Class used for testing the FrequencyTable class from src/profiling/logics.py
+    """
+    def test_from_serie(self):
+        table = FrequencyTable.from_serie(pd.Series(['a', 'b', 'a', None, 'c', 'a'], name='city'))
+        self.assertEqual(table.total, 5)
+        frequent = table.get_frequent(2)
+        self.assertEqual(list(frequent.columns), ['value', 'occurrence', 'percentage'])
+        self.assertEqual(frequent['value'].tolist(), ['a', 'b'])
+        self.assertEqual(frequent['percentage'].tolist(), [0.6, 0.2])
+        self.assertEqual(list(table.get_counts_df(1).columns), ['index', 'city'])
+        self.assertEqual(len(table.get_counts_df()), 3)
+
+    def test_from_query(self):
+        db = mock.Mock()
+        db.run_query.return_value = pd.DataFrame([['a', 6, 10, 3], ['b', 3, 10, 3]], columns=['value', 'occurrence', 'total', 'n_distinct'])
+        table = FrequencyTable.from_query(db, 'public', 'user', 'city', top_k=2)
+        self.assertIn('limit 2', db.run_query.call_args[0][0])
+        self.assertEqual(table.get_frequent()['percentage'].tolist(), [0.6, 0.3])
+        self.assertEqual(table.get_counts_df().values.tolist(), [['a', 6], ['b', 3]])
+        self.assertEqual(table.get_top_k_df(1).values.tolist(), [['a', 6, False], ['Other (2 values)', 4, True]])
+
+    def test_from_query_empty(self):
+        db = mock.Mock()
+        db.run_query.return_value = pd.DataFrame(columns=['value', 'occurrence', 'total', 'n_distinct'])
+        table = FrequencyTable.from_query(db, 'public', 'user', 'city', 20)
+        self.assertEqual(table.total, 0)
+        self.assertTrue(table.get_frequent().empty)
+        self.assertTrue(table.get_top_k_df(5).empty)
+
+    def test_get_top_k_df(self):
+        table = FrequencyTable.from_serie(pd.Series(['a', 'b', 'a', None, 'c', 'a', 'd'], name='city'))
+        df = table.get_top_k_df(2)
+        self.assertEqual(list(df.columns), ['index', 'city', 'is_other'])
+        self.assertEqual(df.values.tolist()[-1], ['Other (2 values)', 2, True])
+        self.assertEqual(df['city'].sum(), table.total)
+        self.assertFalse(table.get_top_k_df(4)['is_other'].any())
+        self.assertEqual(len(table.get_top_k_df(0)), 4)
+class TestHyperLogLog(unittest.TestCase):
+    """
+    Class used for testing the HyperLogLog class, get_distinct_count() and format_estimate() from src/profiling/logics.py
+    """
+    def test_estimate(self):
+        sketch = HyperLogLog().update(pd.Series(range(200000)))
+        self.assertLess(abs(sketch.estimate() - 200000), 3 * sketch.error_bound())
+        self.assertEqual(HyperLogLog().update(pd.Series(['a', 'b', 'a', None])).estimate(), 2)
+        self.assertEqual(HyperLogLog().estimate(), 0)
+
+    def test_merge_chunks(self):
+        values = pd.Series([f'user{i}' for i in range(50000)])
+        merged = HyperLogLog().update(values[:30000]).merge(HyperLogLog().update(values[20000:]))
+        streamed = HyperLogLog.from_chunks([values[:10000], values[10000:], values[:5000]])
+        self.assertTrue((merged.registers == streamed.registers).all())
+        self.assertTrue((merged.registers == HyperLogLog().update(values).registers).all())
+        with self.assertRaises(ValueError):
+            merged.merge(HyperLogLog(10))
+
+    def test_hash_values(self):
+        ints = HyperLogLog().update(pd.Series([1, 2, 3]))
+        floats = HyperLogLog().update(pd.Series([1.0, None, 2.0, 3.0]))
+        self.assertTrue((ints.registers == floats.registers).all())
+        nullable = HyperLogLog().update(pd.Series([1, None, 2, 3], dtype='Int64'))
+        self.assertTrue((ints.registers == nullable.registers).all())
+
+    def test_hash_large_integers(self):
+        values = pd.Series([2 ** 53, 2 ** 53 + 1, 2 ** 53 + 2], dtype='int64')
+        self.assertEqual(len(set(HyperLogLog.hash_values(values))), 3)
+        self.assertEqual(len(set(HyperLogLog.hash_values(pd.Series([0.5, 1.0, 1.5])))), 3)
+
+    def test_serialise(self):
+        sketch = HyperLogLog(10).update(pd.Series(pd.date_range('2022-01-01', periods=1000, freq='H')))
+        data = sketch.to_bytes()
+        self.assertEqual(len(data), 1 + 1024)
+        self.assertEqual(HyperLogLog.from_bytes(data).estimate(), sketch.estimate())
+        with self.assertRaises(ValueError):
+            HyperLogLog.from_bytes(data[:-1])
+
+    def test_get_distinct_count(self):
+        serie = pd.Series(list(range(3000)) * 2)
+        self.assertEqual(get_distinct_count(serie), (3000, 0.0))
+        estimate, error = get_distinct_count(serie, exact=False)
+        self.assertLess(abs(estimate - 3000), 3 * error)
+        with mock.patch('src.profiling.logics.DISTINCT_EXACT_MAX_ROWS', 100):
+            self.assertGreater(get_distinct_count(serie)[1], 0)
+        self.assertEqual(format_estimate(3000, 0.0), 3000)
+        self.assertEqual(format_estimate(2987, 24.2), '2987 ± 24')
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,33 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+from src.profiling.queries import *
+
+class TestQuoteIdentifier(unittest.TestCase):
+    """
+    Class used for testing quote_identifier() from src/profiling/queries.py
+    """
+
+    def test_quote_identifier(self):
+        self.assertEqual(quote_identifier('Order Date'), '"Order Date"')
+        self.assertEqual(quote_identifier('a"b'), '"a""b"')
+
+class TestGetFrequencyQuery(unittest.TestCase):
+    """
+    Class used for testing get_frequency_query() from src/profiling/queries.py
+    """
+
+    def test_get_frequency_query(self):
+        expected_query = 'select "city" as value, count(*) as occurrence, sum(count(*)) over () as total, count(*) over () as n_distinct from public.user where "city" is not null group by 1 order by 2 desc, 1 limit 20'
+        actual_query = get_frequency_query('public', 'user', 'city', 20)
+        self.assertEqual(expected_query, actual_query)
+
+    def test_get_frequency_query_quoted(self):
+        actual_query = get_frequency_query('public', 'user', 'Home "City"', 20)
+        self.assertTrue(actual_query.startswith('select "Home ""City""" as value, '))
+        self.assertIn(' where "Home ""City""" is not null ', actual_query)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -6,7 +6,7 @@ import os
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
-from src.serie_date.logics import DateColumn
+from src.serie_date.logics import DateColumn, get_date_profiles, get_date_stats, get_date_granularity, get_date_buckets, get_date_gaps, truncate_dates
 from src.database.logics import PostgresConnector
 
 @mock.patch('src.database.logics.PostgresConnector')
@@ -107,8 +107,7 @@ class TestSetweekend(unittest.TestCase):
 class TestSetweekday(unittest.TestCase):
     def setUp(self):
         self.serie = DateColumn(None, None, None, None, None)
-        self.serie.serie = pd.Series([1,2,3,4,5,6,7], name='test')
-        self.serie.n_weekend = 2
+        self.serie.serie = pd.Series(pd.date_range('2022-10-10', periods=7), name='test')
 
     def test_set_weekday(self):
         self.serie.set_weekday()
@@ -116,6 +115,25 @@ class TestSetweekday(unittest.TestCase):
         expect = 5
         self.assertEqual(result, expect)
 
+    def test_set_weekday_missing(self):
+        self.serie.serie = pd.Series([datetime.datetime(2022,10,15), pd.NaT, datetime.datetime(2022,10,17)], name='test')
+        self.serie.set_weekday()
+        result = self.serie.n_weekday
+        expect = 1
+        self.assertEqual(result, expect)
+
+class TestSetweekdaySample(unittest.TestCase):
+    def setUp(self):
+        self.serie = DateColumn(None, None, None, None, None, True)
+        self.serie.serie = pd.Series([datetime.datetime(2022,10,14), datetime.datetime(2022,10,15), datetime.datetime(2022,10,17)], name='test')
+        self.serie.n_weekend = 40
+
+    def test_set_weekday_sample(self):
+        self.serie.set_weekday()
+        result = self.serie.n_weekday
+        expect = 2
+        self.assertEqual(result, expect)
+
 class TestSetfuture(unittest.TestCase):
     def setUp(self):
         self.serie = DateColumn(None, None, None, None, None)
@@ -220,6 +238,89 @@ class TestSetdata(unittest.TestCase):
         assert mock_10.called
         assert mock_11.called
 
+@mock.patch('src.serie_date.logics.DateColumn.set_barchart')
+@mock.patch('src.serie_date.logics.DateColumn.set_frequent')
+class TestSetdataProfile(unittest.TestCase):
+    def setUp(self):
+        self.db = mock.Mock()
+        self.db.run_query.return_value = pd.DataFrame([[3, 1, datetime.date(1900,1,1), datetime.date(2022,10,17), 1, 2, 0, 1, 0]],
+            columns=['unique_0', 'n_missing_0', 'col_min_0', 'col_max_0', 'n_weekend_0', 'n_weekday_0', 'n_future_0', 'n_empty_1900_0', 'n_empty_1970_0'])
+        self.serie = DateColumn('public', 'orders', 'order_date', self.db, None, True)
+
+    def test_set_data_profile(self, mock_frequent, mock_barchart):
+        profile = get_date_profiles(self.db, 'public', 'orders', ['order_date'])['order_date']
+        self.serie.set_data(profile)
+        self.db.run_query.assert_called_once()
+        self.assertEqual(self.serie.n_weekday, 2)
+        self.assertEqual(self.serie.col_min, pd.Timestamp(1900,1,1))
+        self.assertTrue((self.serie.get_summary_df()['Basis'] == 'Exact').all())
+
+class TestGetDateStats(unittest.TestCase):
+    """
+    Class used for testing get_date_stats() from src/serie_date/logics.py
+    """
+    def test_get_date_stats(self):
+        serie = pd.Series([datetime.date(1900,1,1), datetime.date(1970,1,1), None, datetime.date(2022,10,15), datetime.date(2040,1,1)])
+        stats = get_date_stats(serie, ['1900-01-01', '1970-01-01'], now=pd.Timestamp(2022,10,17))
+        self.assertEqual(stats['n_rows'], 5)
+        self.assertEqual(stats['n_missing'], 1)
+        self.assertEqual(stats['dow_counts'], [1, 1, 0, 0, 1, 0, 1])
+        self.assertEqual((stats['n_weekend'], stats['n_weekday']), (2, 2))
+        self.assertEqual(stats['sentinels'], {'1900-01-01': 1, '1970-01-01': 1})
+        self.assertEqual(stats['n_future'], 1)
+        self.assertEqual((stats['col_min'], stats['col_max']), (pd.Timestamp(1900,1,1), pd.Timestamp(2040,1,1)))
+
+    def test_get_date_stats_timezone(self):
+        serie = pd.Series(pd.to_datetime(['1970-01-01 23:30', '2022-10-16 01:00']).tz_localize('Australia/Sydney'))
+        stats = get_date_stats(serie, ['1970-01-01'], now=pd.Timestamp('2022-10-15 15:30', tz='UTC'))
+        self.assertEqual(stats['sentinels'], {'1970-01-01': 1})
+        self.assertEqual(stats['dow_counts'], [1, 0, 0, 0, 1, 0, 0])
+        self.assertEqual(stats['n_future'], 0)
+        self.assertEqual(stats['col_max'], pd.Timestamp('2022-10-16 01:00', tz='Australia/Sydney'))
+
+    def test_get_date_stats_empty(self):
+        stats = get_date_stats(pd.Series([None, None], dtype='datetime64[ns]'), ['1900-01-01'])
+        self.assertEqual((stats['n_missing'], stats['col_min'], stats['col_max']), (2, None, None))
+        self.assertEqual(stats['sentinels'], {'1900-01-01': 0})
+
+class TestDateBuckets(unittest.TestCase):
+    """
+    Class used for testing truncate_dates(), get_date_granularity(), get_date_buckets(), get_date_gaps() and DateColumn.set_barchart() from src/serie_date/logics.py
+    """
+    def test_truncate_dates(self):
+        serie = pd.Series(pd.to_datetime(['2022-10-15 13:45', '2019-05-31 01:00']))
+        self.assertEqual(truncate_dates(serie, 'hour').tolist(), [pd.Timestamp(2022,10,15,13), pd.Timestamp(2019,5,31,1)])
+        self.assertEqual(truncate_dates(serie, 'week').tolist(), [pd.Timestamp(2022,10,10), pd.Timestamp(2019,5,27)])
+        self.assertEqual(truncate_dates(serie, 'quarter').tolist(), [pd.Timestamp(2022,10,1), pd.Timestamp(2019,4,1)])
+        self.assertEqual(truncate_dates(serie, 'decade').tolist(), [pd.Timestamp(2020,1,1), pd.Timestamp(2010,1,1)])
+
+    def test_get_date_granularity(self):
+        self.assertEqual(get_date_granularity(pd.Timestamp(2022,1,1), pd.Timestamp(2022,1,3,12)), 'hour')
+        self.assertEqual(get_date_granularity(pd.Timestamp(2022,1,1), pd.Timestamp(2022,3,1)), 'day')
+        self.assertEqual(get_date_granularity(pd.Timestamp(2000,1,1), pd.Timestamp(2022,3,1)), 'quarter')
+        self.assertEqual(get_date_granularity(pd.Timestamp(2000,1,1), pd.Timestamp(2022,3,1), max_buckets=10), 'decade')
+        self.assertIsNone(get_date_granularity(None, None))
+
+    def test_get_date_buckets_gaps(self):
+        serie = pd.Series([datetime.date(2022,1,5), datetime.date(2022,1,20), None, datetime.date(2022,4,2), datetime.date(2022,6,30)])
+        buckets = get_date_buckets(serie, 'month')
+        self.assertEqual(buckets['period'].tolist(), list(pd.date_range('2022-01-01', '2022-06-01', freq='MS')))
+        self.assertEqual(buckets['count'].tolist(), [2, 0, 0, 1, 0, 1])
+        gaps = get_date_gaps(buckets)
+        self.assertEqual(gaps.values.tolist(), [[pd.Timestamp(2022,2,1), pd.Timestamp(2022,3,1), 2], [pd.Timestamp(2022,5,1), pd.Timestamp(2022,5,1), 1]])
+
+    def test_set_barchart_sample(self):
+        db = mock.Mock()
+        db.run_query.return_value = pd.DataFrame([[datetime.datetime(2020,1,1), 4], [datetime.datetime(2022,1,1), 1]], columns=['period', 'count'])
+        serie = DateColumn('public', 'orders', 'order_date', db, pd.Series([datetime.date(2020,3,1)]), True)
+        serie.col_min, serie.col_max = pd.Timestamp(2020,3,1), pd.Timestamp(2022,6,1)
+        serie.metrics.set('set_min')
+        serie.metrics.set('set_max')
+        serie.set_barchart(max_buckets=5)
+        self.assertEqual(serie.granularity, 'year')
+        self.assertEqual(db.run_query.call_args[0][0], 'select date_trunc(\'year\', "order_date")::timestamp as period, count(*) as count from public.orders where "order_date" is not null group by 1 order by 1')
+        self.assertEqual(serie.date_buckets['count'].tolist(), [4, 0, 1])
+        self.assertEqual(len(serie.date_gaps), 1)
 
 
 if __name__ == '__main__':
@@ -23,5 +23,22 @@ class Tsetqueries(unittest.TestCase):
         expect = "select count(*) from (select date(test) as date from test.test) as temp where date = '1900-01-01'"
 
         self.assertEqual(result, expect)
+
+    def test_get_date_profile(self):
+        result = get_date_profile_query('test', 'test', ['a', 'b'])
+        self.assertIn('min("a") as col_min_0', result)
+        self.assertIn('count(*) filter (where extract(dow from "b") in (0,6)) as n_weekend_1', result)
+        self.assertIn("""count(*) filter (where date("b") = '1970-01-01') as n_empty_1970_1""", result)
+        self.assertTrue(result.endswith(" from test.test"))
+
+    def test_get_date_buckets_query(self):
+        result = get_date_buckets_query('test', 'test', 'test', 'month')
+        expect = """select date_trunc('month', "test")::timestamp as period, count(*) as count from test.test where "test" is not null group by 1 order by 1"""
+        self.assertEqual(result, expect)
+        result = get_date_buckets_query('test', 'test', 'Order "Date"', 'day')
+        self.assertIn(' where "Order ""Date""" is not null ', result)
+        with self.assertRaises(ValueError):
+            get_date_buckets_query('test', 'test', 'test', "day', now()) --")
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
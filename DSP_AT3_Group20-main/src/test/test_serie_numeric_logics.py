@@ -7,8 +7,9 @@ import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 
-from src.serie_numeric.logics import NumericColumn
+from src.serie_numeric.logics import NumericColumn, get_numeric_profiles, get_numeric_stats, get_histogram_bins
 from src.database.logics import PostgresConnector
+from src.profiling.logics import FrequencyTable, FREQUENCY_TOP_K
 
 
 
@@ -119,7 +120,136 @@ class TestSetmedian(unittest.TestCase):
         self.assertEqual(result, expect)
 
 
-                    
-
-
-        
\ No newline at end of file
+class TestNumericProfile(unittest.TestCase):
+    def setUp(self):
+        self.db = mock.Mock()
+        self.db.run_query.return_value = pd.DataFrame([[3, 0, 1, 2, 0.5, 1.5, -2, 4, 0.0, 5, 1, 0, 0, 7.25, 2.0, 1, 9, 6.5]],
+            columns=[f'{metric}_{i}' for i in range(2) for metric in ['n_unique', 'n_missing', 'n_zeros', 'n_negatives', 'col_mean', 'col_std', 'col_min', 'col_max', 'col_median']])
+
+    def test_get_numeric_profiles(self):
+        result = get_numeric_profiles(self.db, 'public', 'orders', ['qty', 'price'])
+        self.db.run_query.assert_called_once()
+        self.assertEqual(result['qty']['n_negatives'], 2)
+        self.assertEqual(result['price']['col_max'], 9)
+
+    def test_get_numeric_profiles_no_column(self):
+        result = get_numeric_profiles(self.db, 'public', 'orders', [])
+        self.assertEqual(result, {})
+        self.db.run_query.assert_not_called()
+
+    def test_set_data_profile(self):
+        profile = get_numeric_profiles(self.db, 'public', 'orders', ['qty', 'price'])['price']
+        serie = NumericColumn('public', 'orders', 'price', self.db, pd.Series([1, 9, 9], name='price'), True)
+        profile_df = self.db.run_query.return_value
+        frequency_df = pd.DataFrame([[9, 6, 8, 2], [1, 2, 8, 2]], columns=['value', 'occurrence', 'total', 'n_distinct'])
+        self.db.run_query.side_effect = lambda query, *args, **kwargs: frequency_df if ' as value,' in query else profile_df
+        serie.set_data(profile)
+        # only the most frequent values of the sampled column are counted beyond the fused profile
+        self.assertEqual(self.db.run_query.call_count, 2)
+        self.assertIn(f'limit {FREQUENCY_TOP_K}', self.db.run_query.call_args[0][0])
+        self.assertEqual(serie.frequent['percentage'].tolist(), [0.75, 0.25])
+        self.assertEqual(serie.n_unique, 5)
+        self.assertEqual(serie.col_mean, 7.25)
+        summary = serie.get_summary_df()
+        self.assertTrue((summary['Basis'] == 'Exact').all())
+
+    def test_set_data_profile_sketch(self):
+        profile = get_numeric_profiles(self.db, 'public', 'orders', ['qty', 'price'], exact_distinct=False)['price']
+        self.assertNotIn('count(distinct', self.db.run_query.call_args[0][0])
+        self.assertNotIn('n_unique', profile)
+        serie = NumericColumn('public', 'orders', 'price', self.db, pd.Series([1, 9, 9], name='price'), True, exact_distinct=False)
+        self.db.run_query.reset_mock()
+        with mock.patch.object(NumericColumn, 'set_frequent'):
+            serie.set_data(profile)
+        # the distinct values of the sampled column are estimated from the loaded sample, without any query
+        self.db.run_query.assert_not_called()
+        self.assertEqual(serie.n_unique, 2)
+        summary = serie.get_summary_df().set_index('Description')
+        self.assertEqual(summary.loc['Number of Unique Values', 'Basis'], 'Estimated from sample')
+        self.assertEqual(summary.loc['Average Value', 'Basis'], 'Exact')
+
+    def test_set_unique_failure(self):
+        serie = NumericColumn('public', 'orders', 'price', self.db, pd.Series([1, 9, 9], name='price'), True, exact_distinct=False)
+        with mock.patch('src.serie_numeric.logics.get_distinct_count', side_effect=TypeError('unhashable type')):
+            serie.set_unique()
+        self.assertIsNone(serie.n_unique)
+        self.assertIsNone(serie.unique_error)
+        self.assertIn('unhashable type', serie.unique_msg)
+        self.db.run_query.assert_not_called()
+
+    def test_set_data_metrics_once(self):
+        profile = get_numeric_profiles(self.db, 'public', 'orders', ['qty', 'price'])['price']
+        serie = NumericColumn('public', 'orders', 'price', self.db, pd.Series([1, 9, 9], name='price'), True)
+        with mock.patch.object(NumericColumn, 'frequency_table', return_value=FrequencyTable(pd.Series([2, 1], index=[9, 1], name='price'))) as frequency_table:
+            serie.set_data(profile)
+            serie.set_data(profile)
+        frequency_table.assert_called_once_with()
+        self.assertEqual(serie.frequent['percentage'].tolist(), [2/3, 1/3])
+        self.assertFalse(serie.metrics.is_dirty('set_frequent'))
+        serie.metrics.invalidate('serie')
+        self.assertTrue(serie.metrics.is_dirty('set_histogram'))
+
+
+class TestNumericStats(unittest.TestCase):
+    def test_get_numeric_stats(self):
+        serie = pd.Series([1, 2, 3, 8, 5, 5, 4, 6, 0, -1], name='test')
+        result = get_numeric_stats(serie, chunksize=3)
+        self.assertEqual(result['n_zeros'], 1)
+        self.assertEqual(result['n_negatives'], 1)
+        self.assertEqual(result['col_sum'], 33)
+        self.assertEqual((result['col_min'], result['col_max']), (-1, 8))
+        self.assertAlmostEqual(result['col_mean'], serie.mean())
+        self.assertAlmostEqual(result['col_std'], serie.std())
+        self.assertEqual(result['col_median'], serie.median())
+        self.assertEqual(result['quantiles'][0.75], serie.quantile(0.75))
+
+    def test_get_numeric_stats_missing(self):
+        result = get_numeric_stats(pd.Series([None, 2.5, None, 0.5], name='test'))
+        self.assertEqual(result['n_missing'], 2)
+        self.assertEqual(result['col_mean'], 1.5)
+        result = get_numeric_stats(pd.Series([None, None], name='test', dtype='float'))
+        self.assertEqual(result['n_missing'], 2)
+        self.assertIsNone(result['col_mean'])
+
+    def test_set_data_kernel(self):
+        serie = NumericColumn('public', 'orders', 'price', mock.Mock(), pd.Series([1, -2, 0, 9], name='price'))
+        with mock.patch.object(NumericColumn, 'set_unique'), mock.patch.object(NumericColumn, 'set_histogram'), mock.patch.object(NumericColumn, 'set_frequent'):
+            serie.set_data()
+        serie.db.run_query.assert_not_called()
+        self.assertEqual(serie.n_negatives, 1)
+        self.assertEqual(serie.col_median, 0.5)
+
+
+class TestHistogram(unittest.TestCase):
+    def test_get_histogram_bins_equal_width(self):
+        result = get_histogram_bins(pd.Series([0, 1, 2, 3, 4, 10, None]), bins=5)
+        self.assertEqual(result['lower'].tolist(), [0, 2, 4, 6, 8])
+        self.assertEqual(result['upper'].tolist(), [2, 4, 6, 8, 10])
+        self.assertEqual(result['count'].tolist(), [2, 2, 1, 0, 1])
+
+    def test_get_histogram_bins_equal_depth(self):
+        result = get_histogram_bins(pd.Series([0, 0, 0, 0, 1, 2]), bins=4, method='equal_depth')
+        self.assertEqual(result.values.tolist(), [[0, 0.75, 4], [0.75, 2, 2]])
+        with self.assertRaises(ValueError):
+            get_histogram_bins(pd.Series([1, 2]), method='equal_height')
+
+    def test_set_histogram(self):
+        serie = NumericColumn('public', 'orders', 'price', mock.Mock(), pd.Series([1, 2, 3, 4], name='price'))
+        serie.metrics.get('set_histogram')
+        self.assertEqual(len(serie.histogram_bins), 50)
+        self.assertEqual(serie.histogram_edges[0], 1)
+        self.assertEqual(serie.histogram_edges[-1], 4)
+        serie.set_histogram_method('equal_depth')
+        self.assertTrue(serie.metrics.is_dirty('set_histogram'))
+        serie.metrics.get('set_histogram')
+        self.assertEqual(serie.histogram_bins['count'].sum(), 4)
+        serie.db.run_query.assert_not_called()
+
+    def test_set_histogram_query(self):
+        db = mock.Mock()
+        db.run_query.return_value = pd.DataFrame([[1, 0.0, 5.0, 3], [2, 5.0, 10.0, 1]], columns=['bucket', 'lower', 'upper', 'count'])
+        serie = NumericColumn('public', 'orders', 'price', db, None)
+        serie.set_histogram(bins=2)
+        self.assertIn('width_bucket("price"::float8, edges.edges), 2)', db.run_query.call_args[0][0])
+        self.assertEqual(serie.histogram_edges, [0.0, 5.0, 10.0])
+        self.assertEqual(serie.histogram_bins['count'].tolist(), [3, 1])
@@ -23,6 +23,22 @@ class Tsetqueries(unittest.TestCase):
         expect = "select count(distinct(test)) from test.test"
 
         self.assertEqual(result, expect)
+    def test_get_numeric_profile_query(self):
+        result = get_numeric_profile_query('test', 'test', ['a', 'b'])
+        self.assertTrue(result.startswith('select count(distinct "a") as n_unique_0, '))
+        self.assertIn('count(*) filter (where "b" < 0) as n_negatives_1', result)
+        self.assertIn('percentile_cont(0.5) within group (order by "b") as col_median_1', result)
+        self.assertTrue(result.endswith(' from test.test'))
+        self.assertEqual(result.count(' as '), 2 * len(NUMERIC_PROFILE_METRICS))
+        result = get_numeric_profile_query('test', 'test', ['a'], {'n_missing': NUMERIC_PROFILE_METRICS['n_missing']})
+        self.assertEqual(result, 'select count(*) - count("a") as n_missing_0 from test.test')
+    def test_get_histogram_query(self):
+        result = get_histogram_query('test', 'test', 'a', 10)
+        self.assertTrue(result.startswith('with edges as (select array_agg(lo + (hi - lo) * i / 10 order by i) as edges'))
+        self.assertIn('least(width_bucket("a"::float8, edges.edges), 10) as bucket', result)
+        self.assertTrue(result.endswith('from edges, generate_series(1, 10) as b(bucket) left join counts on counts.bucket = b.bucket order by b.bucket'))
+        result = get_histogram_query('test', 'test', 'a', 4, 'equal_depth')
+        self.assertIn('percentile_cont(array(select i::float8 / 4 from generate_series(0, 4) as i)) within group (order by "a"::float8) as edges from test.test', result)
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
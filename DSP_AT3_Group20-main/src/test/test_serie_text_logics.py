@@ -6,7 +6,7 @@ from unittest.mock import patch
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
-from src.serie_text.logics import TextColumn
+from src.serie_text.logics import TextColumn, get_text_profiles, get_text_stats
 from src.database.logics import PostgresConnector
 
 # instantiate TextColumn 
@@ -62,6 +62,13 @@ class TestSetunique(unittest.TestCase):
         expect = 8
         self.assertEqual(result, expect)
 
+    def test_set_unique_sketch(self, fake):
+        self.serie.set_unique(exact=False)
+        self.assertEqual(self.serie.n_unique, 8)
+        self.assertGreater(self.serie.unique_error, 0)
+        summary = self.serie.get_summary_df()
+        self.assertTrue(summary['Value'].str.startswith('8 ± ').any())
+
 ##### Missing values
 
 @mock.patch('src.database.logics.PostgresConnector.run_query')
@@ -81,12 +88,12 @@ class TestSetmissing(unittest.TestCase):
 class TestSetEmpty(unittest.TestCase):
     def setUp(self):
         self.serie = TextColumn(None, None, None, None, None)
-        self.serie.serie = pd.Series([None, 3, 2, 1, 12], name= 'count')
+        self.serie.serie = pd.Series(['', '', 'a', None], name= 'count')
 
     def test_set_empty(self):
         self.serie.set_empty()
         result = self.serie.n_empty
-        expect = 1
+        expect = 2
         self.assertEqual(result, expect)
 
 
@@ -178,6 +185,32 @@ class TestSetFrequent(unittest.TestCase):
                                [5,2,0.2]], columns=['value','occurrence','percentage'])
         pd.testing.assert_frame_equal(result, expect)
 
+    def test_set_frequent_top_k(self):
+        db = mock.Mock()
+        db.run_query.return_value = pd.DataFrame([['b', 6, 8, 2], ['a', 2, 8, 2]], columns=['value', 'occurrence', 'total', 'n_distinct'])
+        serie = TextColumn('public', 'orders', 'city', db, pd.Series(['a', 'b'], name='city'), True)
+        with mock.patch('src.serie_text.logics.FREQUENCY_TOP_K', 2):
+            serie.set_frequent()
+        self.assertIn('limit 2', db.run_query.call_args[0][0])
+        self.assertEqual(serie.frequent['percentage'].tolist(), [0.75, 0.25])
+
+    def test_set_frequent_large_serie(self):
+        db = mock.Mock()
+        db.run_query.return_value = pd.DataFrame([['b', 6, 8, 2], ['a', 2, 8, 2]], columns=['value', 'occurrence', 'total', 'n_distinct'])
+        serie = TextColumn('public', 'orders', 'city', db, pd.Series(['a', 'b', 'b'], name='city'))
+        with mock.patch('src.serie_text.logics.TEXT_FREQUENCY_QUERY_MIN_ROWS', 2):
+            serie.set_frequent()
+        db.run_query.assert_called_once()
+        self.assertEqual(serie.frequent['percentage'].tolist(), [0.75, 0.25])
+
+    def test_set_barchart_top_k(self):
+        serie = TextColumn('public', 'orders', 'city', None, pd.Series(['a', 'a', 'a', 'b', 'b', 'c', 'd', None], name='city'))
+        with mock.patch('src.serie_text.logics.TEXT_BARCHART_TOP_K', 2):
+            serie.set_barchart()
+        data = serie.barchart.data
+        self.assertEqual(data['index'].tolist(), ['a', 'b', 'Other (2 values)'])
+        self.assertEqual(data['city'].tolist(), [3, 2, 2])
+
 
 ### Test get summary
 class TestGetSummaryDF(unittest.TestCase):
@@ -235,8 +268,47 @@ class TestSetdata(unittest.TestCase):
         assert fake_10.called
         assert fake_11.called
 
-
-
+@mock.patch('src.serie_text.logics.TextColumn.set_unique')
+@mock.patch('src.serie_text.logics.TextColumn.set_barchart')
+@mock.patch('src.serie_text.logics.TextColumn.set_frequent')
+class TestSetdataProfile(unittest.TestCase):
+    def setUp(self):
+        self.db = mock.Mock()
+        self.db.run_query.return_value = pd.DataFrame([[7, 1, 1, 1, 3, 1, 4, 1, 'abc']],
+            columns=['n_unique_0', 'n_missing_0', 'n_empty_0', 'n_space_0', 'n_lower_0', 'n_upper_0', 'n_alpha_0', 'n_digit_0', 'n_mode_0'])
+        self.serie = TextColumn('public', 'categories', 'description', self.db, None, True)
+
+    def test_set_data_profile(self, fake_frequent, fake_barchart, fake_unique):
+        profile = get_text_profiles(self.db, 'public', 'categories', ['description'])['description']
+        self.serie.set_data(profile)
+        self.db.run_query.assert_called_once()
+        assert not fake_unique.called
+        assert fake_barchart.called
+        self.assertEqual(self.serie.n_alpha, 4)
+        self.assertEqual(self.serie.n_mode, 'abc')
+        self.assertTrue((self.serie.get_summary_df()['Basis'] == 'Exact').all())
+
+
+### vectorised text classification
+
+class TestGetTextStats(unittest.TestCase):
+    def test_get_text_stats(self):
+        serie = pd.Series(['as', ' ', 'WE', '34', None, '', 'ab1', 'Tech', '12'], name='count')
+        result = get_text_stats(serie)
+        self.assertEqual(result['n_missing'], 1)
+        self.assertEqual(result['n_empty'], 1)
+        self.assertEqual(result['n_space'], 1)
+        self.assertEqual(result['n_lower'], 2)
+        self.assertEqual(result['n_upper'], 1)
+        self.assertEqual(result['n_alpha'], 3)
+        self.assertEqual(result['n_digit'], 2)
+        self.assertEqual((result['len_min'], result['len_max']), (0, 4))
+
+    def test_set_digit_missing(self):
+        serie = TextColumn(None, None, None, None, None)
+        serie.serie = pd.Series([None, '34', 'as', '13'], name='count')
+        serie.set_digit()
+        self.assertEqual(serie.n_digit, 2)
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -32,6 +32,12 @@ class TestTextQueries(unittest.TestCase):
         expectation = "select count(description) from public.categories where description ~* '[A-Z]'"
 
         self.assertEqual(output, expectation)
+    def test_get_text_profile_query(self):
+        output = get_text_profile_query(self.schema_name, self.table_name, [self.col_name, 'name'])
+        self.assertIn("""count(*) filter (where "description" = '') as n_empty_0""", output)
+        self.assertIn("""count(*) filter (where "name" ~ '^[[:digit:]]+$') as n_digit_1""", output)
+        self.assertIn('mode() within group (order by "name") as n_mode_1', output)
+        self.assertTrue(output.endswith(" from public.categories"))
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file